@@ -0,0 +1,299 @@
+"""
+Benchmarks of the engine hot paths, with JSON baselines and regression checks.
+
+Usage, from the repository root:
+
+    python -m benchmarks.engine run --output benchmarks/baselines/<name>.json
+    python -m benchmarks.engine compare benchmarks/baselines/<name>.json current.json --threshold 0.1
+
+'run' measures every benchmark and saves the results; 'compare' exits with status 1 when a benchmark of the second
+file regressed past the threshold against the first one. Every benchmark reports its throughput and the p50/p99
+latency of a single operation; game benchmarks also report tricks/sec and the peak memory of a game, as traced by
+'tracemalloc'. Python keeps no count of the allocations made, so the memory cost of a game is reported as that peak.
+Solves under a time limit also report the share of deals solved exactly within it.
+The baseline of the reference machine is benchmarks/baselines/reference.json.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from src.whist import Deck, Game, Player
+from src.whist.batch import BatchGame
+from src.whist.schedule import round_schedule
+from src.whist.solver import DoubleDummySolver
+from src.whist.utils import determine_trick_winner, determine_hand_size, has_suit, calculate_score
+
+# For every metric, True if higher is better.
+METRICS = {
+    'ops_per_sec': True,
+    'tricks_per_sec': True,
+    'games_per_sec': True,
+    'p50_us': False,
+    'p99_us': False,
+    'peak_traced_bytes_per_game': False,
+    'exact_rate': True,
+}
+
+
+class ScriptedPlayer(Player):
+    """
+    A deterministic player for benchmarks: bids the lowest legal bid and plays the first legal card of its hand.
+    """
+
+    def make_bid(self, is_last, total_bid):
+        return 1 if is_last and total_bid == len(self.cards) else 0
+
+    def play_card(self, is_first, lead_suit, trump):
+        if not is_first:
+            for suit in (lead_suit, trump):
+                for i, card in enumerate(self.cards):
+                    if card.suit == suit:
+                        return self.cards.pop(i)
+        return self.cards.pop(0)
+
+
+def measure(operation, repeat, inner=1):
+    """
+    Times an operation.
+
+    Parameters:
+        operation (callable): The operation, called without arguments.
+        repeat (int): The number of timed samples.
+        inner (int): The number of calls per sample, to time operations shorter than the timer resolution.
+
+    Returns:
+        dict: The 'ops_per_sec' throughput and the 'p50_us' and 'p99_us' latencies of a single call.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(inner):
+            operation()
+        samples.append((time.perf_counter() - start) / inner)
+    samples.sort()
+    return {
+        'ops_per_sec': len(samples) / sum(samples),
+        'p50_us': samples[len(samples) // 2] * 1e6,
+        'p99_us': samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+    }
+
+
+def new_game(num_players, rng):
+    players = [ScriptedPlayer(f"Player {i + 1}") for i in range(num_players)]
+    return Game(players, verbose=False, rng=rng)
+
+
+def bench_deck(repeat):
+    rng = random.Random(0)
+    return measure(lambda: Deck(6, verbose=False, rng=rng), repeat, inner=20)
+
+
+def bench_deal_cards(repeat):
+    game = new_game(6, random.Random(0))
+
+    def deal():
+        for player in game.players:
+            player.cards.clear()
+        game.deal_cards(8)
+
+    return measure(deal, repeat, inner=20)
+
+
+def bench_trick_winner(repeat):
+    rng = random.Random(0)
+    tricks = []
+    for _ in range(100):
+        cards = rng.sample(Deck(6, verbose=False, rng=rng).cards, 6)
+        tricks.append((list(enumerate(cards)), rng.choice([None, 0, 1, 2, 3])))
+    return measure(lambda: [determine_trick_winner(moves, trump) for moves, trump in tricks], repeat)
+
+
+def bench_has_suit(repeat):
+    game = new_game(4, random.Random(0))
+    game.deal_cards(8)
+    player = game.players[0]
+    return measure(lambda: [has_suit(player, suit) for suit in range(4)], repeat, inner=100)
+
+
+def bench_hand_size(repeat):
+    return measure(lambda: [determine_hand_size(4, round_number) for round_number in range(1, 25)], repeat,
+                   inner=10)
+
+
+def bench_calculate_score(repeat):
+    return measure(lambda: [calculate_score(bid, won) for bid in range(9) for won in range(9)], repeat, inner=10)
+
+
+def bench_play_round(repeat):
+    rng = random.Random(0)
+    game = new_game(4, rng)
+    # Round 11 of a 4 player game is played with 8 cards.
+    results = measure(lambda: game.play_round(11), repeat)
+    results['tricks_per_sec'] = results['ops_per_sec'] * 8
+    return results
+
+
+def bench_batch_round(repeat):
+    # The round of 'play_round_4p_8cards' in 1024 games at once, every player taking its first legal bid and card as
+    # 'ScriptedPlayer' does.
+    game = BatchGame(4, 1024, rng=0)
+
+    def first_legal(game, seats, legal):
+        return legal.argmax(axis=1)
+
+    results = measure(lambda: game.play_round(11, first_legal, first_legal), repeat)
+    results['tricks_per_sec'] = results['ops_per_sec'] * 8 * game.num_games
+    return results
+
+
+def bench_game(num_players, repeat):
+    rng = random.Random(0)
+    tricks = round_schedule(num_players).total_tricks
+
+    def play():
+        new_game(num_players, rng).play_game()
+
+    results = measure(play, repeat)
+    results['games_per_sec'] = results['ops_per_sec']
+    results['tricks_per_sec'] = results['ops_per_sec'] * tricks
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    play()
+    results['peak_traced_bytes_per_game'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return results
+
+
+def bench_solve(repeat, time_limit=None):
+    # Rounds of 8 cards are played without trump. Every sample solves another deal with a new solver, so that no
+    # transposition table is reused.
+    rng = random.Random(0)
+    deals = []
+    for _ in range(repeat):
+        cards = Deck(6, verbose=False, rng=rng).cards
+        deals.append(([cards[i * 8:(i + 1) * 8] for i in range(6)], rng.randrange(6)))
+    deals = iter(deals)
+    exact = []
+
+    def solve():
+        hands, leader = next(deals)
+        solver = DoubleDummySolver(hands, None, leader, time_limit=time_limit)
+        solver.solve()
+        exact.append(solver.exact)
+
+    results = measure(solve, repeat)
+    if time_limit is not None:
+        results['exact_rate'] = sum(exact) / len(exact)
+    return results
+
+
+BENCHMARKS = {
+    'deck_init_shuffle': bench_deck,
+    'deal_cards': bench_deal_cards,
+    'determine_trick_winner_x100': bench_trick_winner,
+    'has_suit_x4': bench_has_suit,
+    'determine_hand_size_x24': bench_hand_size,
+    'calculate_score_x81': bench_calculate_score,
+    'play_round_4p_8cards': bench_play_round,
+    'batch_play_round_4p_8cards': lambda repeat: bench_batch_round(max(1, repeat // 20)),
+    'solve_6p_8cards': lambda repeat: bench_solve(max(1, repeat // 20)),
+    'solve_6p_8cards_500ms': lambda repeat: bench_solve(max(1, repeat // 20), time_limit=0.5),
+}
+for _num_players in range(3, 7):
+    BENCHMARKS[f'game_{_num_players}p'] = (lambda n: lambda repeat: bench_game(n, max(1, repeat // 20)))(_num_players)
+
+
+def run(names=None, repeat=200):
+    """
+    Runs benchmarks.
+
+    Parameters:
+        names (list of str): The benchmarks to run. Defaults to all of them.
+        repeat (int): The number of timed samples per benchmark; full games, batches and solves use 20
+                      times fewer.
+
+    Returns:
+        dict: The results, with the 'meta' data of the run and the metrics of every benchmark under 'results'.
+    """
+    results = {name: BENCHMARKS[name](repeat) for name in (names or BENCHMARKS)}
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compares benchmark results against a baseline.
+
+    Parameters:
+        baseline (dict): The baseline results, as returned by 'run'.
+        current (dict): The results to check.
+        threshold (float): The relative change of a metric, in the worse direction, counted as a regression.
+
+    Returns:
+        list of str: A description of every regression; empty if there are none.
+    """
+    regressions = []
+    for name, base_metrics in baseline['results'].items():
+        metrics = current['results'].get(name)
+        if metrics is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in base_metrics or metric not in metrics or not base_metrics[metric]:
+                continue
+            change = metrics[metric] / base_metrics[metric] - 1
+            if (change < -threshold) if higher_is_better else (change > threshold):
+                regressions.append(f"{name}.{metric}: {base_metrics[metric]:.4g} -> {metrics[metric]:.4g} "
+                                   f"({change:+.1%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the Whist engine hot paths")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="run the benchmarks and save the results as JSON")
+    run_parser.add_argument('--output', help="the JSON file to write; printed if omitted")
+    run_parser.add_argument('--repeat', type=int, default=200, help="timed samples per benchmark")
+    run_parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="benchmarks to run")
+    compare_parser = commands.add_parser('compare', help="fail if the current results regressed")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help="relative regression threshold")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(args.only, args.repeat)
+        for name, metrics in results['results'].items():
+            print(f"{name:30} " + "  ".join(f"{metric}={value:.4g}" for metric, value in metrics.items()))
+        if args.output:
+            os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regression")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
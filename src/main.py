@@ -1,15 +1,12 @@
 from whist import *
+from whist.ismcts import ISMCTSPlayer
 
 
-def print_hi(name):
-    # Use a breakpoint in the code line below to debug your script.
-    print(f'Hi, {name}')  # Press Ctrl+F8 to toggle the breakpoint.
-
-
-# Press the green button in the gutter to run the script.
+# Plays a full game on the console against two search bots.
 if __name__ == '__main__':
-    print_hi('PyCharm')
-    player = HumanPlayer("Mike")
-    player.cards = [1,2,3]
-    player.make_bid(False, 5)
-    player.make_bid(True, 3)
+    players = [HumanPlayer("Mike"), ISMCTSPlayer("Bot 1", iterations=None, budget_ms=200),
+               ISMCTSPlayer("Bot 2", iterations=None, budget_ms=200)]
+    game = Game(players)
+    final_scores = game.play_game()
+    for player, score in zip(players, final_scores):
+        print(f"{player.name}: {score}")
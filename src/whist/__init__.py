@@ -1,5 +1,5 @@
 from .card import Card
 from .deck import Deck
 from .game import Game
-from .scoreboard import Scoreboard
+from .scoreboard import Scoreboard, ColumnarScoreboard
 from .player import *
\ No newline at end of file
@@ -0,0 +1,336 @@
+import numpy as np
+
+from .masks import NUM_CARDS, NUM_RANKS, NUM_SUITS, CARD_SUITS, CARD_VALUES
+from .schedule import round_schedule
+
+CARD_SUIT_ARRAY = np.array(CARD_SUITS, dtype=np.int64)
+CARD_RANK_ARRAY = np.arange(NUM_CARDS, dtype=np.int64) % NUM_RANKS
+CARD_VALUE_ARRAY = np.array(CARD_VALUES, dtype=np.int64)
+SUIT_ARRAY = np.arange(NUM_SUITS)
+# Counting the cards of every suit with a product is much faster than 'any' over the short rank axis.
+RANK_ONES = np.ones(NUM_RANKS, dtype=np.uint8)
+
+
+def deck_indices(num_players):
+    """
+    Returns the indices of the cards that make up the deck for a given number of players, matching the cards built
+    by 'Deck.__init__'.
+
+    Parameters:
+        num_players (int): The number of players playing the game.
+
+    Returns:
+        numpy.ndarray: The sorted card indices of the deck.
+
+    Raises:
+        ValueError: If the number of players is not between 3 and 6 (inclusive).
+    """
+    if num_players < 3 or num_players > 6:
+        raise ValueError("Invalid number of players")
+    return np.flatnonzero(CARD_VALUE_ARRAY >= 3 + (6 - num_players) * 2)
+
+
+def random_bid_policy(game, seats, legal_bids):
+    """
+    Bid policy that picks a uniformly random legal bid in every game.
+
+    Parameters:
+        game (BatchGame): The batch of games being played.
+        seats (numpy.ndarray): The position of the bidding player in every game, of shape (N,).
+        legal_bids (numpy.ndarray): Boolean array of shape (N, hand_size + 1) marking the legal bids.
+
+    Returns:
+        numpy.ndarray: The chosen bid for every game, of shape (N,).
+    """
+    return np.argmax(game.rng.random(legal_bids.shape) * legal_bids, axis=1)
+
+
+def random_card_policy(game, seats, legal_cards):
+    """
+    Card policy that plays a uniformly random legal card in every game.
+
+    Parameters:
+        game (BatchGame): The batch of games being played.
+        seats (numpy.ndarray): The position of the player to move in every game, of shape (N,).
+        legal_cards (numpy.ndarray): Boolean array of shape (N, 52) marking the cards that can be played.
+
+    Returns:
+        numpy.ndarray: The index of the chosen card for every game, of shape (N,).
+    """
+    return np.argmax(game.rng.random(legal_cards.shape) * legal_cards, axis=1)
+
+
+def greedy_card_policy(game, seats, legal_cards):
+    """
+    Card policy that leads its highest card and, when following, takes the trick as cheaply as it can or otherwise
+    discards its lowest card, keeping its trumps. Only the order of the ranks matters to it.
+
+    Parameters:
+        game (BatchGame): The batch of games being played.
+        seats (numpy.ndarray): The position of the player to move in every game, of shape (N,).
+        legal_cards (numpy.ndarray): Boolean array of shape (N, 52) marking the cards that can be played.
+
+    Returns:
+        numpy.ndarray: The index of the chosen card for every game, of shape (N,).
+    """
+    n = game.num_players
+    step = (seats - game.lead_player_pos) % n
+    # Stale cards of the previous trick are masked out below, so -1 entries index a card harmlessly.
+    positions = (game.lead_player_pos[:, None] + np.arange(n)[None, :]) % n
+    trick = game.trick_cards[game.games[:, None], positions]
+    lead_suit = np.where(step > 0, CARD_SUIT_ARRAY[trick[:, 0]], -1)
+    strength = np.where(CARD_SUIT_ARRAY[None, :] == lead_suit[:, None], CARD_RANK_ARRAY[None, :] + 1, 0)
+    strength = np.where(CARD_SUIT_ARRAY[None, :] == game.trump[:, None], CARD_RANK_ARRAY[None, :] + 1 + NUM_RANKS,
+                        strength)
+    played = np.arange(n)[None, :] < step[:, None]
+    best = np.where(played, strength[game.games[:, None], trick], 0).max(axis=1)
+
+    never = 4 * NUM_RANKS
+    winning = legal_cards & (strength > best[:, None])
+    cheapest_win = np.argmin(np.where(winning, strength, never), axis=1)
+    discard_cost = CARD_RANK_ARRAY[None, :] + NUM_RANKS * (CARD_SUIT_ARRAY[None, :] == game.trump[:, None])
+    discard = np.argmin(np.where(legal_cards, discard_cost, never), axis=1)
+    lead = np.argmax(np.where(legal_cards, CARD_RANK_ARRAY[None, :], -1), axis=1)
+    return np.where(step == 0, lead, np.where(winning.any(axis=1), cheapest_win, discard))
+
+
+class BatchGame:
+    """
+    Plays N Whist games with the same number of players in lockstep, keeping the state of every game in NumPy arrays.
+    Dealing, legal-move masking, trick resolution and scoring each run as a single array operation across all games.
+
+    Policies are callables taking the batch game, the position of the acting player in each game and a boolean
+    legality mask, and returning one action per game (see 'random_bid_policy' and 'random_card_policy').
+
+    Attributes:
+        num_players (int): The number of players in every game.
+        num_games (int): The number of games played in lockstep.
+        rng (numpy.random.Generator): The random generator used for dealing and by the random policies.
+        hands (numpy.ndarray): Boolean array of shape (N, num_players, 52) with the cards held by each player.
+        bids (numpy.ndarray): The bids of the current round, of shape (N, num_players).
+        won_tricks (numpy.ndarray): The tricks won in the current round, of shape (N, num_players).
+        lead_player_pos (numpy.ndarray): The position of the player leading the next trick, of shape (N,).
+        trump (numpy.ndarray): The trump suit of every game, or -1 if there's no trump, of shape (N,).
+        trick_cards (numpy.ndarray): The card played by every player in the current trick, or -1, of shape
+                                     (N, num_players).
+        scores (numpy.ndarray): The cumulative scores of every player, of shape (N, num_players).
+    """
+
+    def __init__(self, num_players, num_games, rng=None):
+        """
+        Initializes the batch with empty hands and zero scores.
+
+        Parameters:
+            num_players (int): The number of players in every game.
+            num_games (int): The number of games to play in lockstep.
+            rng (numpy.random.Generator or int): A random generator, or a seed to create one. A fresh unseeded
+                                                 generator is used if None.
+
+        Raises:
+            ValueError: If the number of players is not between 3 and 6 (inclusive).
+        """
+        self.deck = deck_indices(num_players)
+        self.num_players = num_players
+        self.num_games = num_games
+        self.rng = np.random.default_rng(rng)
+        self.games = np.arange(num_games)
+        self.hand_size = 0
+        self.hands = np.zeros((num_games, num_players, NUM_CARDS), dtype=bool)
+        self.bids = np.zeros((num_games, num_players), dtype=np.int64)
+        self.won_tricks = np.zeros((num_games, num_players), dtype=np.int64)
+        self.lead_player_pos = np.zeros(num_games, dtype=np.int64)
+        self.trump = np.full(num_games, -1, dtype=np.int64)
+        self.trick_cards = np.full((num_games, num_players), -1, dtype=np.int64)
+        self.scores = np.zeros((num_games, num_players), dtype=np.int64)
+
+    def seats(self, step):
+        """
+        Computes the position of the player acting at a given step of a bidding or trick turn.
+
+        Parameters:
+            step (int): The number of players that already acted in the turn.
+
+        Returns:
+            numpy.ndarray: The position of the acting player in every game, of shape (N,).
+        """
+        return (self.lead_player_pos + step) % self.num_players
+
+    def deal_cards(self, hand_size):
+        """
+        Shuffles a fresh deck for every game and deals hand_size cards to every player. The trump is drawn from the
+        remaining cards when the hand size is smaller than 8, as in 'Game.play_round'.
+
+        Parameters:
+            hand_size (int): The number of cards dealt to each player.
+        """
+        num_dealt = hand_size * self.num_players
+        order = np.argsort(self.rng.random((self.num_games, len(self.deck))), axis=1)
+        shuffled = self.deck[order]
+
+        self.hand_size = hand_size
+        self.hands[:] = False
+        dealt = shuffled[:, :num_dealt].reshape(self.num_games, self.num_players, hand_size)
+        seats = (self.lead_player_pos[:, None] + np.arange(self.num_players)[None, :]) % self.num_players
+        self.hands[self.games[:, None, None], seats[:, :, None], dealt] = True
+
+        if hand_size < 8:
+            self.trump = CARD_SUIT_ARRAY[shuffled[:, num_dealt]]
+        else:
+            self.trump = np.full(self.num_games, -1, dtype=np.int64)
+
+    def legal_bids(self, step, total_bid):
+        """
+        Computes the legal bids for the player bidding at a given step. The last player cannot make a bid that would
+        make the total bids equal to the hand size.
+
+        Parameters:
+            step (int): The number of players that already made a bid.
+            total_bid (numpy.ndarray): The total bid made so far in every game, of shape (N,).
+
+        Returns:
+            numpy.ndarray: Boolean array of shape (N, hand_size + 1) marking the legal bids.
+        """
+        legal = np.ones((self.num_games, self.hand_size + 1), dtype=bool)
+        if step == self.num_players - 1:
+            forbidden = self.hand_size - total_bid
+            valid = forbidden >= 0
+            legal[self.games[valid], forbidden[valid]] = False
+        return legal
+
+    def make_bids(self, bid_policy):
+        """
+        Asks every player for a bid, starting with the lead player.
+
+        Parameters:
+            bid_policy (callable): The policy choosing the bids.
+
+        Raises:
+            ValueError: If the policy returns an illegal bid in any game.
+        """
+        total_bid = np.zeros(self.num_games, dtype=np.int64)
+        for step in range(self.num_players):
+            seats = self.seats(step)
+            legal = self.legal_bids(step, total_bid)
+            bids = np.asarray(bid_policy(self, seats, legal), dtype=np.int64)
+            if np.any(bids < 0) or np.any(bids > self.hand_size) or not legal[self.games, bids].all():
+                raise ValueError("Illegal bid")
+            self.bids[self.games, seats] = bids
+            total_bid += bids
+
+    def legal_cards(self, seats, lead_suit):
+        """
+        Computes the cards that can legally be played, following the rules of 'HumanPlayer.play_card'.
+
+        Parameters:
+            seats (numpy.ndarray): The position of the player to move in every game, of shape (N,).
+            lead_suit (numpy.ndarray): The lead suit of the current trick in every game, or -1 for the lead player,
+                                       of shape (N,).
+
+        Returns:
+            numpy.ndarray: Boolean array of shape (N, 52) marking the cards that can be played.
+        """
+        hand = self.hands[self.games, seats].reshape(self.num_games, NUM_SUITS, NUM_RANKS)
+        # Rules are decided per suit: the cards of the allowed suits are legal.
+        held = (hand.view(np.uint8) @ RANK_ONES) > 0
+        leading = lead_suit < 0
+        follows = ~leading & held[self.games, lead_suit]
+        ruffs = ~leading & ~follows & (self.trump >= 0) & held[self.games, self.trump]
+        allowed = np.where(follows[:, None], SUIT_ARRAY[None, :] == lead_suit[:, None],
+                           ~ruffs[:, None] | (SUIT_ARRAY[None, :] == self.trump[:, None]))
+        return (hand & allowed[:, :, None]).reshape(self.num_games, NUM_CARDS)
+
+    def play_trick(self, card_policy):
+        """
+        Plays a single trick in every game and gives it to its winner, who leads the next trick.
+
+        Parameters:
+            card_policy (callable): The policy choosing the cards.
+
+        Returns:
+            numpy.ndarray: The position of the winner of the trick in every game, of shape (N,).
+
+        Raises:
+            ValueError: If the policy returns an illegal card in any game.
+        """
+        lead_suit = np.full(self.num_games, -1, dtype=np.int64)
+        for step in range(self.num_players):
+            seats = self.seats(step)
+            legal = self.legal_cards(seats, lead_suit)
+            cards = np.asarray(card_policy(self, seats, legal), dtype=np.int64)
+            if not legal[self.games, cards].all():
+                raise ValueError("Illegal card")
+            self.hands[self.games, seats, cards] = False
+            self.trick_cards[self.games, seats] = cards
+            if step == 0:
+                lead_suit = CARD_SUIT_ARRAY[cards]
+
+        winners = self.determine_trick_winners(self.trick_cards, lead_suit)
+        self.won_tricks[self.games, winners] += 1
+        self.lead_player_pos = winners
+        return winners
+
+    def determine_trick_winners(self, trick_cards, lead_suit):
+        """
+        Vectorized equivalent of 'determine_trick_winner': the highest trump wins, otherwise the highest card of the
+        lead suit.
+
+        Parameters:
+            trick_cards (numpy.ndarray): The card played by every player, of shape (N, num_players).
+            lead_suit (numpy.ndarray): The lead suit of every game, of shape (N,).
+
+        Returns:
+            numpy.ndarray: The position of the winning player in every game, of shape (N,).
+        """
+        suits = CARD_SUIT_ARRAY[trick_cards]
+        ranks = CARD_RANK_ARRAY[trick_cards]
+        strength = np.where(suits == lead_suit[:, None], ranks + 1, 0)
+        strength = np.where(suits == self.trump[:, None], ranks + 1 + NUM_RANKS, strength)
+        return np.argmax(strength, axis=1)
+
+    def calculate_scores(self):
+        """
+        Vectorized equivalent of 'calculate_score' for the current round.
+
+        Returns:
+            numpy.ndarray: The round score of every player, of shape (N, num_players).
+        """
+        return np.where(self.bids == self.won_tricks, 5 + self.bids, -np.abs(self.bids - self.won_tricks))
+
+    def play_round(self, round_number, bid_policy, card_policy):
+        """
+        Plays a full round in every game: dealing, bidding, all the tricks and scoring.
+
+        Parameters:
+            round_number (int): The current round number, used to determine the hand size.
+            bid_policy (callable): The policy choosing the bids.
+            card_policy (callable): The policy choosing the cards.
+
+        Returns:
+            numpy.ndarray: The round score of every player, of shape (N, num_players).
+        """
+        self.bids[:] = 0
+        self.won_tricks[:] = 0
+        hand_size = round_schedule(self.num_players).hand_size(round_number)
+        self.deal_cards(hand_size)
+        self.make_bids(bid_policy)
+        for i in range(hand_size):
+            self.play_trick(card_policy)
+
+        round_scores = self.calculate_scores()
+        self.scores += round_scores
+        return round_scores
+
+    def play_game(self, bid_policy, card_policy):
+        """
+        Plays every round of the game in every game of the batch.
+
+        Parameters:
+            bid_policy (callable): The policy choosing the bids.
+            card_policy (callable): The policy choosing the cards.
+
+        Returns:
+            numpy.ndarray: The final scores of every player, of shape (N, num_players).
+        """
+        for round_number in round_schedule(self.num_players).rounds():
+            self.play_round(round_number, bid_policy, card_policy)
+        return self.scores
@@ -0,0 +1,254 @@
+"""
+Bid estimation from the distribution of the tricks a hand takes.
+
+'simulate_tricks' deals the unseen cards at random to the other players of a 'BatchGame' thousands of times and plays
+every deal out with 'greedy_card_policy', all in lockstep, to estimate how many tricks a hand takes from a bidding
+seat. 'best_bid' then maximizes the expected 'calculate_score' over that distribution.
+
+Estimates only depend on the canonical form of a hand ('whist.canonical.bidding_key'), so 'BidEstimator' caches them
+per canonical hand and saves them in the cache directory of 'whist.bidtables', where later games and other processes
+find them:
+
+    estimator = BidEstimator(4)
+    bid = estimator.make_bid(player, is_last, total_bid)
+    estimator.save()
+
+'BidEstimatorMixin' plugs an estimator into 'Player.make_bid' for any player class. The cache file names carry the
+version of the estimates. The estimates ignore the bids made before the player, like the single-card tables.
+"""
+import os
+
+import numpy as np
+
+from .batch import BatchGame, deck_indices, greedy_card_policy
+from .bidtables import CACHE_DIR, load_tables, table_index
+from .canonical import bidding_key
+from .masks import iter_indices, CARD_SUITS
+from .utils import calculate_score
+
+# The version of the estimates, part of the cache file names: it changes whenever the estimates or the way they are
+# computed change, so that the files cached by older code are never read.
+VERSION = 1
+
+
+def simulate_tricks(hand, trump_card, step, num_players, num_samples, rng=None):
+    """
+    Estimates the distribution of the tricks a hand takes by playing out random deals of the unseen cards.
+
+    Parameters:
+        hand (int): The hand mask of the player.
+        trump_card (int): The index of the trump card, or None if there's no trump.
+        step (int): The number of players who bid before the player; the player at step 0 leads the first trick.
+        num_players (int): The number of players in the game.
+        num_samples (int): The number of deals played out.
+        rng (numpy.random.Generator or int): A random generator, or a seed to create one.
+
+    Returns:
+        numpy.ndarray: The probability of taking every number of tricks from 0 to the hand size.
+    """
+    cards = np.fromiter(iter_indices(hand), dtype=np.int64)
+    hand_size = len(cards)
+    game = BatchGame(num_players, num_samples, rng)
+    unseen = game.deck[~np.isin(game.deck, cards) & (game.deck != (-1 if trump_card is None else trump_card))]
+    order = np.argsort(game.rng.random((num_samples, len(unseen))), axis=1)[:, :(num_players - 1) * hand_size]
+    dealt = unseen[order].reshape(num_samples, num_players - 1, hand_size)
+    others = (step + 1 + np.arange(num_players - 1)) % num_players
+
+    game.hand_size = hand_size
+    game.hands[:, step, cards] = True
+    game.hands[game.games[:, None, None], others[None, :, None], dealt] = True
+    game.trump[:] = -1 if trump_card is None else CARD_SUITS[trump_card]
+    for _ in range(hand_size):
+        game.play_trick(greedy_card_policy)
+    return np.bincount(game.won_tricks[:, step], minlength=hand_size + 1) / num_samples
+
+
+def best_bid(distribution, is_last, total_bid):
+    """
+    Chooses the bid maximizing the expected 'calculate_score' over a distribution of tricks. The last player never
+    bids the number that would make the total bids equal to the hand size.
+
+    Parameters:
+        distribution (numpy.ndarray): The probability of taking every number of tricks from 0 to the hand size.
+        is_last (bool): True if the player is the last one to make a bid, False otherwise.
+        total_bid (int): The current total bid made by all players in this round.
+
+    Returns:
+        int: The bid.
+    """
+    hand_size = len(distribution) - 1
+    bids = [bid for bid in range(hand_size + 1) if not (is_last and bid == hand_size - total_bid)]
+    return max(bids, key=lambda bid: sum(p * calculate_score(bid, tricks) for tricks, p in enumerate(distribution)))
+
+
+class BidEstimator:
+    """
+    Estimates trick distributions for one number of players, caching them per canonical position in memory and in a
+    '.npz' file of the cache directory.
+
+    Attributes:
+        num_players (int): The number of players in the game.
+        num_samples (int): The number of deals played out per estimate.
+        seed (int): The seed of the estimates. The deals of a position are seeded by its key, so that an estimate
+                    does not depend on the order of the queries.
+        cache_dir (str): The cache directory, also holding the single-card tables.
+        path (str): The cache file, or None for an in-memory cache.
+        distributions (dict): The estimated distribution of every canonical key.
+        misses (int): The number of estimates computed rather than found in the cache.
+    """
+
+    def __init__(self, num_players, num_samples=4096, seed=0, cache_dir=None, persistent=True):
+        """
+        Initializes the estimator, loading the estimates saved by earlier runs.
+
+        Parameters:
+            num_players (int): The number of players in the game.
+            num_samples (int): The number of deals played out per estimate.
+            seed (int): The seed of the estimates.
+            cache_dir (str): The cache directory. Defaults to CACHE_DIR, set by the WHIST_CACHE_DIR environment
+                             variable.
+            persistent (bool): Whether to load and save the estimates.
+
+        Raises:
+            ValueError: If the number of players is not between 3 and 6 (inclusive).
+        """
+        deck_indices(num_players)
+        self.num_players = num_players
+        self.num_samples = num_samples
+        self.seed = seed
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.path = None
+        if persistent:
+            self.path = os.path.join(self.cache_dir, f"bidding_{num_players}_{num_samples}_{seed}_v{VERSION}.npz")
+        self.distributions = {}
+        self.misses = 0
+        self._unsaved = 0
+        self.distributions.update(self._read())
+
+    def _read(self):
+        if self.path is None or not os.path.exists(self.path):
+            return {}
+        with np.load(self.path) as data:
+            return {tuple(int(x) for x in name.split("_")): data[name] for name in data.files}
+
+    def distribution(self, hand, trump_card, step):
+        """
+        Returns the distribution of the tricks of a hand, from the cache if an equivalent hand was estimated before.
+        Single-card rounds are read from the exact tables of 'whist.bidtables'.
+
+        Parameters:
+            hand (int): The hand mask of the player.
+            trump_card (int): The index of the trump card, or None if there's no trump.
+            step (int): The number of players who bid before the player.
+
+        Returns:
+            numpy.ndarray: The probability of taking every number of tricks from 0 to the hand size.
+        """
+        if trump_card is not None and hand & (hand - 1) == 0:
+            card = hand.bit_length() - 1
+            index = table_index(card, trump_card)
+            p = float(load_tables(self.num_players, self.cache_dir)[0][(*index, 1 if step else 0)])
+            return np.array([1 - p, p])
+
+        key = bidding_key(hand, trump_card, step, self.num_players)
+        distribution = self.distributions.get(key)
+        if distribution is None:
+            rng = np.random.default_rng([self.seed, *(x + 1 for x in key)])
+            distribution = simulate_tricks(hand, trump_card, step, self.num_players, self.num_samples, rng)
+            self.distributions[key] = distribution
+            self.misses += 1
+            self._unsaved += 1
+        return distribution
+
+    def bid(self, hand, trump_card, step, is_last, total_bid):
+        """
+        Chooses the bid maximizing the expected score of a hand; see 'best_bid'.
+
+        Parameters:
+            hand (int): The hand mask of the player.
+            trump_card (int): The index of the trump card, or None if there's no trump.
+            step (int): The number of players who bid before the player.
+            is_last (bool): True if the player is the last one to make a bid, False otherwise.
+            total_bid (int): The current total bid made by all players in this round.
+
+        Returns:
+            int: The bid.
+        """
+        return best_bid(self.distribution(hand, trump_card, step), is_last, total_bid)
+
+    def make_bid(self, player, is_last, total_bid):
+        """
+        Chooses the bid of a player seated in a 'Game', for use in 'Player.make_bid'.
+
+        Parameters:
+            player (Player): The player, whose game gives the trump card and the bidding order.
+            is_last (bool): True if the player is the last one to make a bid, False otherwise.
+            total_bid (int): The current total bid made by all players in this round.
+
+        Returns:
+            int: The bid.
+        """
+        info = player.game.info
+        step = (player.position - info.leader) % info.num_players
+        return self.bid(player.game.hands[player.position], info.trump_card, step, is_last, total_bid)
+
+    def save(self):
+        """
+        Saves the estimates to the cache file, merged with those saved by other processes in the meantime. Does
+        nothing for an in-memory cache or when there is nothing new.
+        """
+        if self.path is None or not self._unsaved:
+            return
+        distributions = self._read()
+        distributions.update(self.distributions)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write under a temporary name first, so that concurrent processes never read a partial file.
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, **{"_".join(str(x) for x in key): value for key, value in distributions.items()})
+        os.replace(temp_path, self.path)
+        self.distributions = distributions
+        self._unsaved = 0
+
+
+class BidEstimatorMixin:
+    """
+    Mixin answering 'Player.make_bid' with a 'BidEstimator'. It goes before the player class in the bases of a bot,
+    which keeps choosing its cards:
+
+        class Bot(BidEstimatorMixin, SomePlayer):
+            pass
+
+        bot = Bot("Bot", estimator=BidEstimator(4))
+
+    Attributes:
+        estimator (BidEstimator): The estimator of the bids. Without one, an estimator with the default settings is
+                                  created for the game on the first bid.
+    """
+
+    def __init__(self, name, *args, estimator=None, **kwargs):
+        """
+        Initializes the player.
+
+        Parameters:
+            name (string): The name of the player.
+            estimator (BidEstimator): The estimator of the bids, shared between players to share its cache.
+            *args, **kwargs: The other arguments of the player class.
+        """
+        super().__init__(name, *args, **kwargs)
+        self.estimator = estimator
+
+    def make_bid(self, is_last, total_bid):
+        """
+        Implements make_bid with the bid of the estimator maximizing the expected score.
+
+        Parameters:
+            is_last (bool): True if the player is the last one to make a bid, False otherwise.
+            total_bid (int): The current total bid made by all players in this round.
+
+        Returns:
+            int: The bid made by the player.
+        """
+        if self.estimator is None:
+            self.estimator = BidEstimator(self.game.info.num_players)
+        return self.estimator.make_bid(self, is_last, total_bid)
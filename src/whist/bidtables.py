@@ -0,0 +1,170 @@
+"""
+Exact bid tables for the single-card rounds, played in the first and last rounds of a game (see
+'determine_hand_size').
+
+With one card each, the play is forced, so the chance of taking the trick only depends on the player's card, the
+trump card and whether the player leads, and the best bid also depends on the bidding seat and the running total bid.
+The other cards are assumed to be uniformly distributed over the cards not seen, which ignores what the bids of the
+earlier players could reveal.
+
+The tables are computed once per number of players, saved as '.npy' files in a cache directory and memory-mapped on
+first use, so that bots answer those rounds with a lookup. The file names carry the version of the tables. Entries
+are indexed by 'table_index': only the ranks of the card and the trump card and whether the card is a trump matter,
+the plain suits being alike, which makes the tables 8 times smaller than tables indexed by both cards.
+"""
+import os
+from math import comb
+
+import numpy as np
+
+from .batch import deck_indices
+from .masks import NUM_RANKS, CARD_SUITS, CARD_RANKS
+
+# The version of the tables, part of their file names: it changes whenever the tables or the way they are computed
+# change, so that the files cached by older code are never read.
+VERSION = 2
+CACHE_DIR = os.environ.get("WHIST_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "whist"))
+
+_tables = {}
+
+
+def win_probability(card, trump_card, leading, num_players):
+    """
+    Computes the exact probability that a single card takes the trick in a single-card round.
+
+    Parameters:
+        card (int): The index of the player's card.
+        trump_card (int): The index of the trump card.
+        leading (bool): True if the player leads the trick, False otherwise.
+        num_players (int): The number of players in the game.
+
+    Returns:
+        float: The probability of taking the trick, when the cards of the other players are uniformly distributed
+               over the cards not seen.
+
+    Raises:
+        ValueError: If the card and the trump card are the same card.
+    """
+    if card == trump_card:
+        raise ValueError("The card cannot be the trump card")
+    trump = CARD_SUITS[trump_card]
+    suit = CARD_SUITS[card]
+    rank = CARD_RANKS[card]
+    remaining = [c for c in deck_indices(num_players) if c != card and c != trump_card]
+    higher = sum(1 for c in remaining if CARD_SUITS[c] == suit and CARD_RANKS[c] > rank)
+    others = num_players - 1
+    if suit == trump:
+        # Only a higher trump beats a trump, whoever leads.
+        return comb(len(remaining) - higher, others) / comb(len(remaining), others)
+
+    # A plain card loses to any trump and to any higher card of its suit.
+    beaten_by = higher + sum(1 for c in remaining if CARD_SUITS[c] == trump)
+    if leading:
+        return comb(len(remaining) - beaten_by, others) / comb(len(remaining), others)
+
+    # When following, the plain card only wins if the leader played a lower card of the same suit.
+    lower = sum(1 for c in remaining if CARD_SUITS[c] == suit and CARD_RANKS[c] < rank)
+    return lower / len(remaining) * comb(len(remaining) - 1 - beaten_by, others - 1) / comb(len(remaining) - 1,
+                                                                                          others - 1)
+
+
+def table_index(card, trump_card):
+    """
+    Maps a card and the trump card to the index of their entries in the single-card tables.
+
+    Parameters:
+        card (int): The index of the player's card.
+        trump_card (int): The index of the trump card.
+
+    Returns:
+        tuple of int: The rank of the trump card, 1 if the card is a trump and 0 otherwise, and the rank of the card.
+    """
+    return CARD_RANKS[trump_card], int(CARD_SUITS[card] == CARD_SUITS[trump_card]), CARD_RANKS[card]
+
+
+def compute_tables(num_players):
+    """
+    Computes the single-card tables for a number of players.
+
+    Parameters:
+        num_players (int): The number of players in the game.
+
+    Returns:
+        tuple: (probabilities, bids), where probabilities has shape (13, 2, 13, 2) and holds the probability of
+               taking the trick by 'table_index' and following (0 when leading, 1 otherwise), and bids has shape
+               (13, 2, 13, num_players, num_players) and holds the best bid by 'table_index', bidding step and total
+               bid. Entries of cards outside the deck, or equal to the trump card, are NaN and -1.
+
+    Raises:
+        ValueError: If the number of players is not between 3 and 6 (inclusive).
+    """
+    # 'whist.bidding' loads these tables, so its general 'best_bid' is imported here rather than at the top.
+    from .bidding import best_bid
+
+    deck = set(deck_indices(num_players).tolist())
+    probabilities = np.full((NUM_RANKS, 2, NUM_RANKS, 2), np.nan)
+    bids = np.full((NUM_RANKS, 2, NUM_RANKS, num_players, num_players), -1, dtype=np.int8)
+    for trump_rank in range(NUM_RANKS):
+        # The trump suit is suit 0, and a plain card stands for its rank in every plain suit.
+        trump_card = trump_rank
+        for trump in (0, 1):
+            for rank in range(NUM_RANKS):
+                card = (1 - trump) * NUM_RANKS + rank
+                if card == trump_card or card not in deck or trump_card not in deck:
+                    continue
+                index = (trump_rank, trump, rank)
+                probabilities[index] = [win_probability(card, trump_card, not following, num_players)
+                                        for following in (0, 1)]
+                for step in range(num_players):
+                    probability = probabilities[(*index, 1 if step else 0)]
+                    for total_bid in range(num_players):
+                        bids[(*index, step, total_bid)] = best_bid((1 - probability, probability),
+                                                                   step == num_players - 1, total_bid)
+    return probabilities, bids
+
+
+def load_tables(num_players, cache_dir=None):
+    """
+    Returns the single-card tables for a number of players, memory-mapped from the cache directory. Missing tables
+    are computed and saved first.
+
+    Parameters:
+        num_players (int): The number of players in the game.
+        cache_dir (str): The cache directory. Defaults to CACHE_DIR, set by the WHIST_CACHE_DIR environment variable.
+
+    Returns:
+        tuple: (probabilities, bids) read-only arrays, as returned by 'compute_tables'.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    key = (num_players, cache_dir)
+    if key not in _tables:
+        paths = [os.path.join(cache_dir, f"single_card_{name}_{num_players}_v{VERSION}.npy")
+                 for name in ("probabilities", "bids")]
+        if not all(os.path.exists(path) for path in paths):
+            os.makedirs(cache_dir, exist_ok=True)
+            for path, table in zip(paths, compute_tables(num_players)):
+                # Write under a temporary name first, so that concurrent processes never read a partial table.
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    np.save(f, table)
+                os.replace(temp_path, path)
+        _tables[key] = tuple(np.load(path, mmap_mode="r") for path in paths)
+    return _tables[key]
+
+
+def single_card_bid(num_players, card, trump_card, step, total_bid, cache_dir=None):
+    """
+    Looks up the best bid of a single-card round.
+
+    Parameters:
+        num_players (int): The number of players in the game.
+        card (int): The index of the player's card.
+        trump_card (int): The index of the trump card.
+        step (int): The number of players who bid before the player; 0 for the player leading the trick.
+        total_bid (int): The current total bid made by all players in this round.
+        cache_dir (str): The cache directory. Defaults to CACHE_DIR.
+
+    Returns:
+        int: Either 0 or 1.
+    """
+    return int(load_tables(num_players, cache_dir)[1][(*table_index(card, trump_card), step, total_bid)])
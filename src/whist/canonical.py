@@ -0,0 +1,278 @@
+"""
+Canonical forms of hands and positions, shared by the caches and lookup tables.
+
+Two kinds of symmetry make many Whist positions equivalent:
+
+- Suit isomorphism: the suits other than the trump suit play the same role, so permuting them gives an equivalent
+  position. Without trump all four suits can be permuted: up to 24 positions share one canonical form, and up to 6
+  with a trump.
+- Rank equivalence: only the order of the cards still in play matters. The decks of fewer than 6 players start above
+  the 2 (at 3 + (6 - num_players) * 2, see 'Deck'), and cards that were played or turned up as the trump card leave
+  gaps, so ranks are renumbered over the live ranks of every suit.
+
+A suit permutation 'perm' is a tuple of 4 suits, where canonical suit i is the original suit perm[i]. The trump suit,
+if any, becomes suit 0 and the other suits follow from the strongest holding. Masks and cards map to the canonical
+suits with 'permute_mask' and 'canonical_card', and back with 'restore_mask' and 'original_card', so that a move cached
+for a canonical position can be played in any equivalent one. Renumbered ranks map back with 'expand_ranks'.
+"""
+from functools import lru_cache
+
+from .masks import CARD_RANKS, CARD_SUITS, FULL_SUIT, NUM_RANKS, NUM_SUITS, RANK_VALUES
+
+
+def holdings(mask):
+    """
+    Splits a card mask into its suits.
+
+    Parameters:
+        mask (int): The card mask.
+
+    Returns:
+        list of int: The holding of every suit, as a mask of NUM_RANKS bits.
+    """
+    return [(mask >> (suit * NUM_RANKS)) & FULL_SUIT for suit in range(NUM_SUITS)]
+
+
+def suit_order(keys, trump):
+    """
+    Orders the suits canonically: the trump suit first, then the other suits by decreasing key, ties broken by suit.
+
+    Parameters:
+        keys (list): A comparable key for every suit, which must be equal for suits that play the same role.
+        trump (int): The trump suit, or None if there's no trump.
+
+    Returns:
+        tuple of int: The suit permutation.
+    """
+    plain = sorted((suit for suit in range(NUM_SUITS) if suit != trump), key=lambda suit: keys[suit], reverse=True)
+    return tuple(plain) if trump is None else (trump, *plain)
+
+
+def permute_mask(mask, perm):
+    """
+    Moves the cards of a mask to the canonical suits.
+
+    Parameters:
+        mask (int): The card mask.
+        perm (tuple of int): The suit permutation.
+
+    Returns:
+        int: The canonical mask.
+    """
+    result = 0
+    for suit, original in enumerate(perm):
+        result |= ((mask >> (original * NUM_RANKS)) & FULL_SUIT) << (suit * NUM_RANKS)
+    return result
+
+
+def restore_mask(mask, perm):
+    """
+    Moves the cards of a canonical mask back to the original suits; the inverse of 'permute_mask'.
+
+    Parameters:
+        mask (int): The canonical mask.
+        perm (tuple of int): The suit permutation.
+
+    Returns:
+        int: The original mask.
+    """
+    result = 0
+    for suit, original in enumerate(perm):
+        result |= ((mask >> (suit * NUM_RANKS)) & FULL_SUIT) << (original * NUM_RANKS)
+    return result
+
+
+def canonical_card(card, perm):
+    """
+    Parameters:
+        card (int): The index of a card.
+        perm (tuple of int): The suit permutation.
+
+    Returns:
+        int: The index of the card in the canonical suits.
+    """
+    return perm.index(CARD_SUITS[card]) * NUM_RANKS + CARD_RANKS[card]
+
+
+def original_card(card, perm):
+    """
+    Parameters:
+        card (int): The index of a card in the canonical suits.
+        perm (tuple of int): The suit permutation.
+
+    Returns:
+        int: The index of the card in the original suits.
+    """
+    return perm[CARD_SUITS[card]] * NUM_RANKS + CARD_RANKS[card]
+
+
+def canonical_hand(hand, trump):
+    """
+    Maps a hand to its canonical suits. Hands that only differ by a permutation of the plain suits get the same mask.
+
+    Parameters:
+        hand (int): The hand mask.
+        trump (int): The trump suit, or None if there's no trump.
+
+    Returns:
+        tuple: (mask, perm), the canonical mask and the suit permutation that maps it back.
+    """
+    perm = suit_order(holdings(hand), trump)
+    return permute_mask(hand, perm), perm
+
+
+def canonical_hands(hands, trump):
+    """
+    Maps every hand of a deal, or of a game state, to the same canonical suits. A suit is ordered by which player
+    holds each of its cards, so that deals that only differ by a permutation of the plain suits get the same masks.
+
+    Parameters:
+        hands (list of int): The hand mask of every player, indexed by position.
+        trump (int): The trump suit, or None if there's no trump.
+
+    Returns:
+        tuple: (masks, perm), the tuple of the canonical hand masks and the suit permutation that maps them back.
+    """
+    keys = list(zip(*(holdings(hand) for hand in hands)))
+    perm = suit_order(keys, trump)
+    return tuple(permute_mask(hand, perm) for hand in hands), perm
+
+
+@lru_cache(maxsize=1 << 16)
+def compress_ranks(holding, live):
+    """
+    Renumbers the cards of a suit holding by their order among the live ranks of the suit.
+
+    Parameters:
+        holding (int): The holding, as a mask of NUM_RANKS bits.
+        live (int): The ranks still in play, as a mask of NUM_RANKS bits.
+
+    Returns:
+        int: The renumbered holding, where bit i stands for the i-th lowest live rank.
+    """
+    result = shift = 0
+    while live:
+        low = live & -live
+        if holding & low:
+            result |= 1 << shift
+        shift += 1
+        live ^= low
+    return result
+
+
+def expand_ranks(holding, live):
+    """
+    Maps a renumbered holding back to the ranks of the suit; the inverse of 'compress_ranks'.
+
+    Parameters:
+        holding (int): The renumbered holding.
+        live (int): The ranks still in play, as a mask of NUM_RANKS bits.
+
+    Returns:
+        int: The holding, as a mask of NUM_RANKS bits.
+    """
+    result = 0
+    while holding:
+        low = live & -live
+        if holding & 1:
+            result |= low
+        holding >>= 1
+        live ^= low
+    return result
+
+
+@lru_cache(maxsize=None)
+def deck_ranks(num_players):
+    """
+    Parameters:
+        num_players (int): The number of players in the game.
+
+    Returns:
+        int: The ranks of a suit that are in the deck, as a mask of NUM_RANKS bits.
+    """
+    lowest = 3 + (6 - num_players) * 2
+    return sum(1 << rank for rank, value in enumerate(RANK_VALUES) if value >= lowest)
+
+
+def bidding_key(hand, trump_card, step, num_players):
+    """
+    Computes the canonical form of a bidding position: the plain suits are sorted and every holding is renumbered
+    over the ranks of the deck, leaving out the trump card. Two positions with the same key have the same
+    distribution of tricks when the unseen cards are dealt at random.
+
+    Parameters:
+        hand (int): The hand mask of the player.
+        trump_card (int): The index of the trump card, or None if there's no trump.
+        step (int): The number of players who bid before the player.
+        num_players (int): The number of players in the game.
+
+    Returns:
+        tuple of int: The bidding step, the renumbered trump holding (-1 without trump) and the renumbered plain
+                      holdings, from the strongest.
+    """
+    live = deck_ranks(num_players)
+    trump = CARD_SUITS[trump_card] if trump_card is not None else None
+    trump_holding = -1
+    plain = []
+    for suit, holding in enumerate(holdings(hand)):
+        if suit == trump:
+            trump_holding = compress_ranks(holding, live & ~(1 << CARD_RANKS[trump_card]))
+        else:
+            plain.append(compress_ranks(holding, live))
+    plain.sort(reverse=True)
+    return (step, trump_holding, *plain)
+
+
+def position_key(hands, trump, leader):
+    """
+    Computes the canonical form of a position at the start of a trick, as used by transposition tables. Every suit is
+    described by the players holding its cards still in play, from the lowest card up, which only keeps the order of
+    the live ranks; the descriptions of the plain suits are sorted.
+
+    Parameters:
+        hands (list of int): The hand mask of every player, indexed by position.
+        trump (int): The trump suit, or None if there's no trump.
+        leader (int): The position of the player leading the trick.
+
+    Returns:
+        tuple of int: The leader, the description of the trump suit (0 without trump) and those of the plain suits.
+    """
+    return canonical_position(hands, trump, leader)[0]
+
+
+def canonical_position(hands, trump, leader):
+    """
+    Computes the canonical form of a position at the start of a trick, see 'position_key', along with the suit
+    permutation that maps it back. A card of the position is stored canonically as its canonical suit and its order
+    among the cards of that suit still in play, which designate a card of the same player in every equivalent position.
+
+    Parameters:
+        hands (list of int): The hand mask of every player, indexed by position.
+        trump (int): The trump suit, or None if there's no trump.
+        leader (int): The position of the player leading the trick.
+
+    Returns:
+        tuple: (key, perm), the key of 'position_key' and the suit permutation.
+    """
+    n = len(hands)
+    codes = []
+    for suit in range(NUM_SUITS):
+        shift = suit * NUM_RANKS
+        suit_hands = [(hand >> shift) & FULL_SUIT for hand in hands]
+        cards = 0
+        for holding in suit_hands:
+            cards |= holding
+        # A leading 1 keeps descriptions of different lengths apart.
+        code = 1
+        while cards:
+            low = cards & -cards
+            seat = 0
+            while not suit_hands[seat] & low:
+                seat += 1
+            code = code * n + seat
+            cards ^= low
+        codes.append(code)
+    perm = suit_order(codes, trump)
+    if trump is None:
+        return (leader, 0, *(codes[suit] for suit in perm)), perm
+    return (leader, *(codes[suit] for suit in perm)), perm
@@ -1,11 +1,22 @@
+# Card values in increasing order, used to compute the index of a card (see 'whist.masks'). The value 11 is not used.
+RANK_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 12, 13, 14, 15)
+
+
 class Card:
     """
     Represents a card in a deck for the Whist game, with suit and value attributes.
 
+    Cards are immutable and interned: the 52 cards are created once, in the module-level table CARDS, and 'Card(v, s)'
+    returns the card of the table instead of creating a new object. Every card knows its index in the table, computed
+    as 'suit * 13 + rank' where 'rank' is the position of the value among the card values (see 'whist.masks').
+
     Attributes:
         suits (list of str): Class variable that defines the suit names.
         values (list of str) Class variable that defines the card values, with 'None' placeholders for indices 0, 1 and
         11 to align the card values with their indices.
+        value (int): The value of the card.
+        suit (int): The suit of the card.
+        index (int): The index of the card in CARDS, between 0 and 51.
 
     Parameters:
         v (int): The value index of the card. Must be between 2 and 14, excluding 11, which is not used in the game.
@@ -14,16 +25,29 @@ class Card:
     Raises:
         ValueError: If 'v' is not in the allowed range or if 's' is not between 0 and 3 (inclusive).
     """
+    __slots__ = ('value', 'suit', 'index')
+
     suits = ["Hearts", "Spades", "Diamonds", "Clubs"]
     values = ["None", "None", "2", "3", "4", "5", "6", "7", "8", "9", "10", "None", "Jack", "Queen", "King", "Ace"]
 
-    def __init__(self, v, s):
+    def __new__(cls, v, s):
+        try:
+            return _LOOKUP[v, s]
+        except (KeyError, TypeError):
+            pass
         if v < 2 or v > 15 or v == 11:
             raise ValueError("Invalid card value")
-        if s < 0 or s > 3:
-            raise ValueError("Invalid suit index")
-        self.value = v
-        self.suit = s
+        raise ValueError("Invalid suit index")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Cards are immutable")
+
+    def __reduce__(self):
+        # Unpickled cards are interned as well.
+        return Card, (self.value, self.suit)
+
+    def __hash__(self):
+        return self.index
 
     def __lt__(self, c2):
         """
@@ -75,3 +99,16 @@ class Card:
             str: A string in the form 'Value of Suit', representing the card.
         """
         return f"{self.values[self.value]} of {self.suits[self.suit]}"
+
+
+def _make_card(value, suit):
+    card = object.__new__(Card)
+    object.__setattr__(card, 'value', value)
+    object.__setattr__(card, 'suit', suit)
+    object.__setattr__(card, 'index', suit * len(RANK_VALUES) + RANK_VALUES.index(value))
+    return card
+
+
+# The table of the 52 cards, indexed by card index.
+CARDS = tuple(_make_card(value, suit) for suit in range(4) for value in RANK_VALUES)
+_LOOKUP = {(card.value, card.suit): card for card in CARDS}
@@ -0,0 +1,110 @@
+"""
+Reproducible deal generation and the binary deal file format.
+
+A deal is the order of the cards of a shuffled deck, as the card indices of 'Deck.indices': the last index is the top
+of the deck, dealt first. Deals are generated in bulk from an explicit 'numpy.random.Generator', and saved to deal
+files so that every bot of an evaluation plays the same cards (see the 'deals' parameter of 'Game'). A game dealing
+from a deal source starts every round with the seat '(round_number - 1) % num_players', so the hand of every seat
+depends only on the deal and the round.
+
+A deal file starts with a fixed 32-byte little-endian header:
+
+    magic (8 bytes, b'WHSTDEAL'), version (uint32), number of players (uint32), deck size (uint32),
+    padding (uint32), number of deals (uint64)
+
+followed by the deals, one fixed-width record of 'deck size' uint8 card indices each, so that the records can be
+memory-mapped without parsing.
+"""
+import struct
+
+import numpy as np
+
+from .deck import BASE_DECKS
+
+MAGIC = b'WHSTDEAL'
+VERSION = 1
+_HEADER = struct.Struct('<8sIIIIQ')
+
+
+def base_deck(num_players):
+    """
+    Returns the cards of the deck for a number of players, in the order of 'Deck.__init__' before shuffling.
+
+    Parameters:
+        num_players (int): The number of players.
+
+    Returns:
+        numpy.ndarray: The card indices of the deck, as uint8.
+
+    Raises:
+        ValueError: If the number of players is not between 3 and 6 (inclusive).
+    """
+    if num_players not in BASE_DECKS:
+        raise ValueError("Invalid number of players")
+    return np.array(BASE_DECKS[num_players], dtype=np.uint8)
+
+
+def generate_deals(num_players, count, rng):
+    """
+    Shuffles count decks in a single vectorized call.
+
+    Parameters:
+        num_players (int): The number of players.
+        count (int): The number of deals.
+        rng (numpy.random.Generator or int): The random generator, or a seed to create one. The same seed always
+                                             gives the same deals.
+
+    Returns:
+        numpy.ndarray: The deals, as a uint8 array of shape (count, deck size).
+    """
+    rng = np.random.default_rng(rng)
+    deals = np.broadcast_to(base_deck(num_players), (count, len(BASE_DECKS[num_players])))
+    return rng.permuted(deals, axis=1)
+
+
+def write_deals(path, deals, num_players):
+    """
+    Writes deals to a deal file.
+
+    Parameters:
+        path (str): The path of the file.
+        deals (numpy.ndarray): The deals, of shape (count, deck size), as returned by 'generate_deals'.
+        num_players (int): The number of players the deals are for.
+
+    Raises:
+        ValueError: If the size of the deals does not match the deck for the number of players.
+    """
+    deals = np.ascontiguousarray(deals, dtype=np.uint8)
+    deck_size = len(base_deck(num_players))
+    if deals.ndim != 2 or deals.shape[1] != deck_size:
+        raise ValueError("The deals do not match the deck size")
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, num_players, deck_size, 0, len(deals)))
+        f.write(deals.tobytes())
+
+
+def read_deals(path):
+    """
+    Memory-maps the deals of a deal file.
+
+    Parameters:
+        path (str): The path of the file.
+
+    Returns:
+        tuple: (num_players, deals), where deals is a read-only uint8 array of shape (count, deck size).
+
+    Raises:
+        ValueError: If the file is not a deal file of a supported version.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+    if len(header) != _HEADER.size:
+        raise ValueError("Not a deal file")
+    magic, version, num_players, deck_size, _, count = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a deal file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported deal file version {version}")
+    if count == 0:
+        return num_players, np.zeros((0, deck_size), dtype=np.uint8)
+    return num_players, np.memmap(path, dtype=np.uint8, mode='r', offset=_HEADER.size, shape=(count, deck_size))
@@ -1,34 +1,75 @@
-from .card import Card
+from .card import CARDS, Card
 from random import shuffle
 
+# For every number of players, the indices of the cards in the deck, in the order cards were historically created:
+# by value, then by suit. Shuffling a copy with a given random generator state always gives the same deal.
+BASE_DECKS = {num_players: tuple(Card(i, j).index for i in range(3 + (6 - num_players) * 2, 16) if i != 11
+                                  for j in range(4))
+               for num_players in range(3, 7)}
+
 
 class Deck:
     """
     Represents a deck of playing cards for the Whist game. The deck is adjusted based on the number of players and
     is capable of setting a trump suit and allowing cards to be drawn.
 
+    The deck is stored as a permutation of card indices over a precomputed base deck, so building, shuffling and
+    drawing from it never creates Card objects; the interned cards of CARDS are returned when drawing.
+
     Attributes:
         trump (int): The suit of the trump card, initially None.
         trump_card (Card): The card is chosen as the trump, initially None.
-        cards (list of Card): The list of cards in the deck.
+        cards (tuple of Card): The cards in the deck, a read-only tuple built on access from the card indices.
+        indices (list of int): The indices of the cards in the deck; the last one is the top of the deck.
+        verbose (bool): Whether the trump card is announced on the console when it is set.
+        info (InformationState): The information state told about the trump card, or None.
     """
 
-    def __init__(self, num_players):
+    def __init__(self, num_players, verbose=True, rng=None, info=None, indices=None):
         """
         Initializes the deck with cards appropriate for the number of players.
 
         Parameters:
             num_players (int): The number of players playing the game.
+            verbose (bool): Whether the trump card is announced on the console. Simulations should pass False.
+            rng (random.Random): The random generator used to shuffle the deck. Defaults to the global generator of
+                                 the 'random' module.
+            info (InformationState): The information state to tell about the trump card, if any.
+            indices (sequence of int): A deal to use instead of shuffling: the card indices in deck order, the last
+                                       one being the top of the deck, e.g. a record from 'whist.deals'.
 
         Raises:
-            ValueError: If the number of players is not between 3 and 6 (inclusive).
+            ValueError: If the number of players is not between 3 and 6 (inclusive), or if the given deal is not a
+                        permutation of the deck.
         """
         self.trump = None
         self.trump_card = None
+        self.verbose = verbose
+        self.info = info
         if num_players < 3 or num_players > 6:
             raise ValueError("Invalid number of players")
-        self.cards = [Card(i, j) for i in range(3 + (6 - num_players) * 2, 16) if i != 11 for j in range(4)]
-        shuffle(self.cards)
+        if indices is not None:
+            self.indices = [int(i) for i in indices]
+            if sorted(self.indices) != sorted(BASE_DECKS[num_players]):
+                raise ValueError("The deal is not a permutation of the deck")
+            return
+        self.indices = list(BASE_DECKS[num_players])
+        if rng is None:
+            shuffle(self.indices)
+        else:
+            rng.shuffle(self.indices)
+
+    @property
+    def cards(self):
+        """
+        tuple of Card: The cards of the deck, the top of the deck last. A read-only copy of 'self.indices': change the
+        deck through 'self.indices', or assign the whole list of cards.
+        """
+        return tuple(CARDS[i] for i in self.indices)
+
+    @cards.setter
+    def cards(self, cards):
+        self.indices = [card.index for card in cards]
 
     def set_trump(self):
         """
@@ -38,11 +79,14 @@ class Deck:
         Raises:
             RuntimeError: If the deck is empty when attempting to set the trump.
         """
-        if len(self.cards) == 0:
+        if not self.indices:
             raise RuntimeError("Cannot set trump from an empty deck")
-        self.trump_card = self.cards.pop()
+        self.trump_card = CARDS[self.indices.pop()]
         self.trump = self.trump_card.suit
-        print("The trump card is " + str(self.trump_card))
+        if self.info is not None:
+            self.info.set_trump(self.trump_card)
+        if self.verbose:
+            print("The trump card is " + str(self.trump_card))
 
     def draw(self):
         """
@@ -54,6 +98,6 @@ class Deck:
         Raises:
             RuntimeError: If the deck is empty when attempting to draw a card.
         """
-        if len(self.cards) == 0:
+        if not self.indices:
             raise RuntimeError("Cannot draw from an empty deck")
-        return self.cards.pop()
+        return CARDS[self.indices.pop()]
@@ -0,0 +1,295 @@
+from .game import Game
+from .player import Player
+from .schedule import round_schedule
+from .card import CARDS
+from .masks import iter_indices, legal_moves, NUM_CARDS
+
+BID = "bid"
+PLAY = "play"
+
+MAX_PLAYERS = 6
+MAX_HAND_SIZE = 8
+
+# Flat action space shared by both phases: card indices first, then the bids.
+NUM_ACTIONS = NUM_CARDS + MAX_HAND_SIZE + 1
+
+# Flat observation layout: hand, cards of the current trick, trump (4 suits + no trump), lead suit (4 suits + none),
+# bidding phase flag, hand size, then the bids and won tricks of every seat relative to the observing player.
+OBSERVATION_SIZE = 2 * NUM_CARDS + 5 + 5 + 2 + 2 * MAX_PLAYERS
+
+
+def action_index(phase, action):
+    """
+    Maps an environment action to its index in the flat action space of size NUM_ACTIONS.
+
+    Parameters:
+        phase (str): Either BID or PLAY.
+        action (int): The bid, or the index of the card.
+
+    Returns:
+        int: The index of the action in the flat action space.
+    """
+    return NUM_CARDS + action if phase == BID else action
+
+
+def encode_observation(observation, out=None):
+    """
+    Encodes an observation returned by 'WhistEnv' as a flat vector of OBSERVATION_SIZE numbers. Seats are rotated so
+    that the observing player is always the first one. Bids not made yet are encoded as -1.
+
+    Parameters:
+        observation (dict): The observation to encode.
+        out (list or numpy.ndarray): Optional zeroed buffer of length OBSERVATION_SIZE to write into.
+
+    Returns:
+        list or numpy.ndarray: The encoded observation.
+    """
+    if out is None:
+        out = [0] * OBSERVATION_SIZE
+    for i in iter_indices(observation['hand']):
+        out[i] = 1
+    for _, i in observation['trick']:
+        out[NUM_CARDS + i] = 1
+
+    offset = 2 * NUM_CARDS
+    trump = observation['trump']
+    out[offset + (4 if trump is None else trump)] = 1
+    lead_suit = observation['lead_suit']
+    out[offset + 5 + (4 if lead_suit is None else lead_suit)] = 1
+    out[offset + 10] = 1 if observation['phase'] == BID else 0
+    out[offset + 11] = observation['hand_size']
+
+    offset += 12
+    bids = observation['bids']
+    won_tricks = observation['won_tricks']
+    num_players = len(bids)
+    for i in range(num_players):
+        pos = (observation['player'] + i) % num_players
+        out[offset + i] = -1 if bids[pos] is None else bids[pos]
+        out[offset + MAX_PLAYERS + i] = won_tricks[pos]
+    return out
+
+
+def encode_legal_mask(observation, out=None):
+    """
+    Encodes the legal actions of an observation as a mask over the flat action space.
+
+    Parameters:
+        observation (dict): The observation to encode.
+        out (list or numpy.ndarray): Optional zeroed buffer of length NUM_ACTIONS to write into.
+
+    Returns:
+        list or numpy.ndarray: The mask, with 1 for every legal action.
+    """
+    if out is None:
+        out = [0] * NUM_ACTIONS
+    for action in observation['legal_actions']:
+        out[action_index(observation['phase'], action)] = 1
+    return out
+
+
+class WhistEnv:
+    """
+    A headless, gym-style environment for the Whist game. Instead of calling blocking 'Player' methods, the
+    environment exposes the decision of the player to act through 'reset()' and 'step(action)', so that bots can drive
+    every seat of the game without stdin or console output.
+
+    The environment is built on a quiet 'Game', which owns the deck, the players' hands, the bids, the won tricks and
+    the scoreboard. An episode is a full game, or the given subset of rounds.
+
+    Actions are integers: the bid during the bidding phase, and the index of the card to play (see 'whist.masks')
+    during the playing phase.
+
+    Attributes:
+        num_players (int): The number of players in the game.
+        game (Game): The game being played, recreated on every reset.
+        phase (str): Either BID or PLAY.
+        round_number (int): The current round number.
+        hand_size (int): The hand size of the current round.
+        done (bool): True if the episode is over.
+    """
+
+    def __init__(self, num_players, rounds=None, verbose=False, rng=None, sink=None):
+        """
+        Initializes the environment. 'reset()' must be called before the first step.
+
+        Parameters:
+            num_players (int): The number of players in the game.
+            rounds (list of int): The round numbers played in every episode. Defaults to every round of a game.
+            verbose (bool): Whether the engine may print to the console. Defaults to the quiet mode.
+            rng (random.Random): The random generator used to shuffle the decks. Defaults to the global generator.
+            sink (EventSink): Optional sink receiving the events of every episode (see 'whist.gamelog').
+
+        Raises:
+            ValueError: If the number of players is not between 3 and 6 (inclusive).
+        """
+        if num_players < 3 or num_players > 6:
+            raise ValueError("Invalid number of players")
+        self.num_players = num_players
+        self.rounds = list(rounds) if rounds is not None else list(round_schedule(num_players).rounds())
+        self.verbose = verbose
+        self.rng = rng
+        self.sink = sink
+        self.game = None
+        self.phase = None
+        self.round_index = 0
+        self.round_number = None
+        self.hand_size = 0
+        self.step_in_turn = 0
+        self.total_bid = 0
+        self.done = True
+
+    def reset(self):
+        """
+        Starts a new game and deals the first round.
+
+        Returns:
+            dict: The observation of the first player to act.
+        """
+        players = [Player(f"Player {i + 1}") for i in range(self.num_players)]
+        self.game = Game(players, verbose=self.verbose, rng=self.rng, sink=self.sink)
+        self.round_index = 0
+        self.done = False
+        self._start_round()
+        return self.observation()
+
+    def _start_round(self):
+        self.round_number = self.rounds[self.round_index]
+        self.hand_size = self.game.start_round(self.round_number)
+        self.phase = BID
+        self.step_in_turn = 0
+        self.total_bid = 0
+
+    @property
+    def current_player(self):
+        """
+        int: The position of the player who has to act next.
+        """
+        return (self.game.lead_player_pos + self.step_in_turn) % self.num_players
+
+    @property
+    def lead_suit(self):
+        """
+        int: The suit led in the current trick, or None if no card has been played yet.
+        """
+        if self.phase != PLAY or not self.game.player_moves:
+            return None
+        return self.game.player_moves[0][1].suit
+
+    def legal_actions(self):
+        """
+        Lists the legal actions of the player to act.
+
+        Returns:
+            list of int: The legal bids during the bidding phase, or the indices of the playable cards otherwise.
+        """
+        if self.done:
+            return []
+        if self.phase == BID:
+            bids = list(range(self.hand_size + 1))
+            if self.step_in_turn == self.num_players - 1 and self.hand_size - self.total_bid in bids:
+                bids.remove(self.hand_size - self.total_bid)
+            return bids
+
+        return list(legal_moves(self.game.hands[self.current_player], self.lead_suit, self.game.deck.trump))
+
+    def observation(self):
+        """
+        Builds the observation of the player to act. Only information visible to that player is included.
+
+        Returns:
+            dict: The observation, with the keys 'player', 'phase', 'round_number', 'hand_size', 'hand' (card mask),
+                  'trump', 'lead_suit', 'trick' (list of (position, card index) tuples), 'bids', 'won_tricks',
+                  'total_bid' and 'legal_actions'.
+        """
+        if self.done:
+            return None
+        player_pos = self.current_player
+        return {
+            'player': player_pos,
+            'phase': self.phase,
+            'round_number': self.round_number,
+            'hand_size': self.hand_size,
+            'hand': self.game.hands[player_pos],
+            'trump': self.game.deck.trump,
+            'lead_suit': self.lead_suit,
+            'trick': [(pos, card.index) for pos, card in self.game.player_moves],
+            'bids': self._visible_bids(),
+            'won_tricks': list(self.game.current_won_tricks),
+            'total_bid': self.total_bid,
+            'legal_actions': self.legal_actions(),
+        }
+
+    def _visible_bids(self):
+        if self.phase == PLAY:
+            return list(self.game.current_bids)
+        lead = self.game.lead_player_pos
+        return [self.game.current_bids[pos] if (pos - lead) % self.num_players < self.step_in_turn else None
+                for pos in range(self.num_players)]
+
+    def step(self, action):
+        """
+        Applies the action of the player to act.
+
+        Parameters:
+            action (int): The bid, or the index of the card to play.
+
+        Returns:
+            tuple: (observation, rewards, done, info), where rewards is the list of round scores of every player when
+                   the action ends a round and a list of zeros otherwise, and info holds the 'trick_winner' when the
+                   action completes a trick and the 'round_scores' when it ends a round. The observation is None once
+                   the episode is over.
+
+        Raises:
+            RuntimeError: If the episode is over.
+            ValueError: If the action is not legal.
+        """
+        if self.done:
+            raise RuntimeError("The episode is over; call reset()")
+        if action not in self.legal_actions():
+            raise ValueError(f"Illegal action {action}")
+
+        rewards = [0] * self.num_players
+        info = {}
+        player_pos = self.current_player
+        if self.phase == BID:
+            self.game.record_bid(player_pos, action)
+            self.total_bid += action
+            self.step_in_turn += 1
+            if self.step_in_turn == self.num_players:
+                self.phase = PLAY
+                self.step_in_turn = 0
+            return self.observation(), rewards, self.done, info
+
+        card = CARDS[action]
+        self.game.check_move(player_pos, card, self.lead_suit, self.game.deck.trump)
+        self.game.players[player_pos].cards.remove(card)
+        self.game.record_move(player_pos, card)
+        self.step_in_turn += 1
+
+        if self.step_in_turn == self.num_players:
+            trick_winner_pos = self.game.finish_trick(self.game.deck.trump)
+            self.game.current_won_tricks[trick_winner_pos] += 1
+            self.game.player_moves.clear()
+            self.step_in_turn = 0
+            info['trick_winner'] = trick_winner_pos
+
+            if sum(self.game.current_won_tricks) == self.hand_size:
+                rewards = self.game.score_round(self.round_number)
+                info['round_scores'] = rewards
+                self.round_index += 1
+                if self.round_index == len(self.rounds):
+                    self.done = True
+                else:
+                    self._start_round()
+
+        return self.observation(), rewards, self.done, info
+
+    def scores(self):
+        """
+        Returns the total scores of the players.
+
+        Returns:
+            list of int: The total score of every player, indexed by position.
+        """
+        return [self.game.scoreboard.get_score(player) for player in self.game.players]
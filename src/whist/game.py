@@ -1,90 +1,432 @@
-from .utils import determine_trick_winner, determine_hand_size, calculate_score
+from time import perf_counter_ns
+
+from .utils import determine_trick_winner, calculate_score
+from .schedule import round_schedule
 from .deck import Deck
 from .scoreboard import Scoreboard
+from .infostate import InformationState
+from .masks import hand_mask, legal_mask, CARD_BITS
 
 
 class Game:
 
-    def __init__(self, players):
+    def __init__(self, players, verbose=True, rng=None, deals=None, scoreboard=None, sink=None, profiler=None):
         self.players = players
+        self.verbose = verbose
+        self.rng = rng
+        self.deals = iter(deals) if deals is not None else None
         self.num_players = len(players)
+        self.schedule = round_schedule(self.num_players)
         self.lead_player_pos = 0
         self.player_moves = []
         self.discard_deck = []
-        self.deck = Deck(self.num_players)
-        self.scoreboard = Scoreboard()
+        self.tricks = []
+        # Hand mask of every player (see 'whist.masks'), kept in sync with the played cards. None until dealt.
+        self.hands = None
+        # Mask of the cards played in the current trick, reset when the trick is finished.
+        self.trick_mask = 0
+        self.info = InformationState(self.num_players)
+        self.deck = Deck(self.num_players, verbose=verbose, rng=rng)
+        self.scoreboard = scoreboard if scoreboard is not None else Scoreboard()
         self.current_bids = [0] * self.num_players
         self.current_won_tricks = [0] * self.num_players
-        for player in players:
+        for position, player in enumerate(players):
+            player.game = self
+            player.position = position
             self.scoreboard.add_player(player)
+        # Optional EventSink (see 'whist.gamelog') receiving every event of the game.
+        self.sink = sink
+        if sink is not None:
+            sink.on_game_start(self.num_players)
+        # Optional GameProfiler (see 'whist.profiling') timing the phases of 'play_round' and the player decisions.
+        self.profiler = profiler
+        # The number of the round in progress, or None before the first one.
+        self.round_number = None
+
+    def play_game(self, resume=False):
+        """
+        Plays every round of the game: 3 * num_players + 12 rounds, from the one card rounds to the eight card rounds
+        and back.
+
+        Parameters:
+            resume (bool): Whether to continue from the round in progress, e.g. of a game restored from a snapshot
+                           (see 'whist.snapshot'), instead of starting from the first round. A round whose tricks are
+                           all played is taken as scored.
+
+        Returns:
+            list of int: The final score of every player, indexed by position.
+        """
+        for round_number, resume_round in self._rounds(resume):
+            self.play_round(round_number, resume_round)
+        return [self.scoreboard.get_score(player) for player in self.players]
+
+    async def play_game_async(self, resume=False):
+        """
+        Same as 'play_game', awaiting the decisions of the players.
+
+        Parameters:
+            resume (bool): Whether to continue from the round in progress instead of starting from the first round.
+
+        Returns:
+            list of int: The final score of every player, indexed by position.
+        """
+        for round_number, resume_round in self._rounds(resume):
+            await self.play_round_async(round_number, resume_round)
+        return [self.scoreboard.get_score(player) for player in self.players]
+
+    def _rounds(self, resume):
+        # The rounds left to play, each with whether it is the round in progress.
+        if not resume or self.round_number is None:
+            return [(round_number, False) for round_number in self.schedule.rounds()]
+        rounds = [(round_number, False) for round_number in self.schedule.rounds() if round_number > self.round_number]
+        if len(self.tricks) < self.schedule.hand_size(self.round_number):
+            rounds.insert(0, (self.round_number, True))
+        return rounds
+
+    def play_round(self, round_number, resume=False):
+        """
+        Plays a round: deals the cards, collects the bids, plays every trick and scores the round.
+
+        Parameters:
+            round_number (int): The current round number.
+            resume (bool): Whether to continue the round in progress from the next bid or card instead of dealing it.
+        """
+        timed = self.profiler is not None
+        start = perf_counter_ns() if timed else 0
+        if resume:
+            hand_size = self.schedule.hand_size(round_number)
+        else:
+            hand_size = self.start_round(round_number)
+            if timed:
+                start = self._lap('deal', start)
+        if not resume or None in self.info.bids:
+            self.make_bids(hand_size, resume)
+            if timed:
+                start = self._lap('bid', start)
+        for i in range(len(self.tricks) if resume else 0, hand_size):
+            trick_winner_pos = self.play_trick(self.deck.trump, resume)
+            self.current_won_tricks[trick_winner_pos] = self.current_won_tricks[trick_winner_pos] + 1
+            if timed:
+                start = self._lap('trick', start)
+
+        self.score_round(round_number)
+        if timed:
+            self._lap('score', start)
+
+    async def play_round_async(self, round_number, resume=False):
+        """
+        Same as 'play_round', awaiting the decisions of the players. Many games can play concurrently on one event
+        loop, e.g. with 'asyncio.gather'.
+
+        Parameters:
+            round_number (int): The current round number.
+            resume (bool): Whether to continue the round in progress from the next bid or card instead of dealing it.
+        """
+        timed = self.profiler is not None
+        start = perf_counter_ns() if timed else 0
+        if resume:
+            hand_size = self.schedule.hand_size(round_number)
+        else:
+            hand_size = self.start_round(round_number)
+            if timed:
+                start = self._lap('deal', start)
+        if not resume or None in self.info.bids:
+            await self.make_bids_async(hand_size, resume)
+            if timed:
+                start = self._lap('bid', start)
+        for i in range(len(self.tricks) if resume else 0, hand_size):
+            trick_winner_pos = await self.play_trick_async(self.deck.trump, resume)
+            self.current_won_tricks[trick_winner_pos] = self.current_won_tricks[trick_winner_pos] + 1
+            if timed:
+                start = self._lap('trick', start)
+
+        self.score_round(round_number)
+        if timed:
+            self._lap('score', start)
+
+    def _lap(self, phase, start):
+        # Records a phase that started at 'start' and returns the start of the next one.
+        now = perf_counter_ns()
+        self.profiler.record_phase(phase, now - start)
+        return now
+
+    def _decide(self, player_pos, decision, *args, **kwargs):
+        # Calls a decision method of a player. With a profiler, only the call itself is timed as the latency of the
+        # decision, so the engine work around it counts as engine time.
+        if self.profiler is None:
+            return decision(*args, **kwargs)
+        start = perf_counter_ns()
+        result = decision(*args, **kwargs)
+        self.profiler.record_decision(player_pos, perf_counter_ns() - start)
+        return result
+
+    async def _decide_async(self, player_pos, decision, *args, **kwargs):
+        # Same as '_decide', awaiting the decision.
+        if self.profiler is None:
+            return await decision(*args, **kwargs)
+        start = perf_counter_ns()
+        result = await decision(*args, **kwargs)
+        self.profiler.record_decision(player_pos, perf_counter_ns() - start)
+        return result
+
+    def start_round(self, round_number):
+        """
+        Resets the bids, won tricks and played cards, deals the cards for the round and sets the trump if the hand size
+        is smaller than 8.
+
+        Parameters:
+            round_number (int): The current round number.
 
-    def play_round(self, round_number):
+        Returns:
+            int: The hand size for the round.
+        """
+        self.round_number = round_number
         self.current_bids = [0] * self.num_players
         self.current_won_tricks = [0] * self.num_players
+        self.player_moves.clear()
+        self.trick_mask = 0
+        self.discard_deck.clear()
+        self.tricks.clear()
+        self.info.start_round(self.lead_player_pos)
 
-        hand_size = determine_hand_size(self.num_players, round_number)
+        hand_size = self.schedule.hand_size(round_number)
         self.deal_cards(hand_size)
-        if hand_size < 8:
+        if self.sink is not None:
+            self.sink.on_deal(round_number, self.lead_player_pos, list(self.hands))
+        if self.schedule.has_trump[round_number]:
             self.deck.set_trump()
+            if self.sink is not None:
+                self.sink.on_trump(self.deck.trump_card)
+        return hand_size
 
-        self.make_bids(hand_size)
-        for i in range(hand_size):
-            trick_winner_pos = self.play_trick(self.deck.trump)
-            self.current_won_tricks[trick_winner_pos] = self.current_won_tricks[trick_winner_pos] + 1
+    def score_round(self, round_number):
+        """
+        Scores the current round for every player and records the results on the scoreboard.
+
+        Parameters:
+            round_number (int): The current round number.
 
+        Returns:
+            list of int: The round score of every player, indexed by position.
+        """
+        round_scores = []
         for i in range(self.num_players):
             player = self.players[i]
             bid = self.current_bids[i]
             won_tricks = self.current_won_tricks[i]
             score = calculate_score(bid, won_tricks)
             self.scoreboard.update_score(player, round_number, bid, won_tricks, score)
+            round_scores.append(score)
+        if self.sink is not None:
+            self.sink.on_round_end(round_number, round_scores)
+        return round_scores
 
-    def make_bids(self, hand_size):
-        total_bid = 0
-        for i in range(0, self.num_players - 1):
+    def make_bids(self, hand_size, resume=False):
+        """
+        Asks every player for their bid in turn, starting with the lead player.
+
+        Parameters:
+            hand_size (int): The hand size for the round.
+            resume (bool): Whether to continue with the players who have not bid yet, e.g. in a restored game.
+        """
+        first = self.num_players - self.info.bids.count(None) if resume else 0
+        total_bid = sum(self.current_bids) if resume else 0
+        for i in range(first, self.num_players - 1):
+            player_pos = (self.lead_player_pos + i) % self.num_players
+            player = self.players[player_pos]
+            self.record_bid(player_pos, self._decide(player_pos, player.make_bid, False, total_bid))
+            total_bid += self.current_bids[player_pos]
+        last_player_pos = (self.lead_player_pos - 1) % self.num_players
+        self.record_bid(last_player_pos,
+                        self._decide(last_player_pos, self.players[last_player_pos].make_bid, True, total_bid))
+
+    async def make_bids_async(self, hand_size, resume=False):
+        """
+        Same as 'make_bids', awaiting 'Player.make_bid_async' for every bid.
+
+        Parameters:
+            hand_size (int): The hand size for the round.
+            resume (bool): Whether to continue with the players who have not bid yet.
+        """
+        first = self.num_players - self.info.bids.count(None) if resume else 0
+        total_bid = sum(self.current_bids) if resume else 0
+        for i in range(first, self.num_players - 1):
             player_pos = (self.lead_player_pos + i) % self.num_players
             player = self.players[player_pos]
-            self.current_bids[player_pos] = player.make_bid(False, total_bid)
-        last_player = self.players[self.lead_player_pos - 1]
-        self.current_bids[self.lead_player_pos - 1] = last_player.make_bid(True, total_bid)
+            self.record_bid(player_pos, await self._decide_async(player_pos, player.make_bid_async, False, total_bid))
+            total_bid += self.current_bids[player_pos]
+        last_player_pos = (self.lead_player_pos - 1) % self.num_players
+        self.record_bid(last_player_pos, await self._decide_async(last_player_pos,
+                                                                  self.players[last_player_pos].make_bid_async, True,
+                                                                  total_bid))
+
+    def record_bid(self, player_pos, bid):
+        """
+        Records the bid of a player in 'self.current_bids', 'self.info' and the sink.
+
+        Parameters:
+            player_pos (int): The position of the player.
+            bid (int): The bid.
+        """
+        self.current_bids[player_pos] = bid
+        self.info.set_bid(player_pos, bid)
+        if self.sink is not None:
+            self.sink.on_bid(player_pos, bid)
 
     def deal_cards(self, hand_size):
-        self.deck = Deck(self.num_players)
+        # With deals, e.g. from a deal file, every round uses the next deal instead of a shuffled deck. The deal is then
+        # dealt from a seat that depends only on the round, not on the lead player, so that the same deal gives every
+        # seat the same hand whoever won the last trick of the previous round.
+        indices = None
+        first_pos = self.lead_player_pos
+        if self.deals is not None:
+            try:
+                indices = next(self.deals)
+            except StopIteration:
+                raise ValueError("The deal source has run out of deals")
+            if self.round_number is not None:
+                first_pos = (self.round_number - 1) % self.num_players
+        self.deck = Deck(self.num_players, verbose=self.verbose, rng=self.rng, info=self.info, indices=indices)
+        self.hands = [hand_mask(player.cards) for player in self.players]
         for i in range(hand_size):
             for j in range(0, self.num_players):
-                player_pos = (self.lead_player_pos + j) % self.num_players
-                player = self.players[player_pos]
-                player.cards.append(self.deck.draw())
+                player_pos = (first_pos + j) % self.num_players
+                card = self.deck.draw()
+                self.players[player_pos].cards.append(card)
+                self.hands[player_pos] |= CARD_BITS[card.index]
 
-    def play_trick(self, trump):
+    def play_trick(self, trump, resume=False):
         """
         Executes a single trick in the game, where each player plays a card in turn.
 
         The function starts with the lead player, identified by 'self.lead_player_pos', playing the first card.
-        Subsequent players play their cards based on the lead suit and trump suit rules. The function determines
-        the winner of the trick using the 'determine_trick_winner' utility function, updates the lead player
-        for the next trick, and moves all played cards to the discard deck.
+        Subsequent players play their cards based on the lead suit and trump suit rules, checked on the hand masks of
+        'self.hands'. The function determines the winner of the trick using the 'determine_trick_winner' utility
+        function on 'self.trick_mask', the mask of the played cards kept by 'record_move', updates the lead player for
+        the next trick, and moves all played cards to the discard deck.
 
         Parameters:
             trump (int): The suit that acts as the trump for the current round. Can be 'None' if there's no trump.
+            resume (bool): Whether to continue the trick started in 'self.player_moves', e.g. in a restored game,
+                           from the next player.
 
         Returns:
             int: The position of the player who won the trick. This player will lead the next trick.
+
+        Raises:
+            ValueError: If a player plays a card they don't hold or that breaks the rules; see 'check_move'.
         """
-        self.player_moves.clear()
-        lead_card = self.players[self.lead_player_pos].play_card(is_first=True, lead_suit=None, trump=trump)
-        self.player_moves.append((self.lead_player_pos, lead_card))
-        lead_suit = lead_card.suit
+        # Once finished, 'self.player_moves' still holds the last trick.
+        if not resume or len(self.player_moves) == self.num_players:
+            self.player_moves.clear()
+            self.trick_mask = 0
+        if self.hands is None:
+            self.hands = [hand_mask(player.cards) for player in self.players]
+        if not self.player_moves:
+            lead_card = self._decide(self.lead_player_pos, self.players[self.lead_player_pos].play_card,
+                                     is_first=True, lead_suit=None, trump=trump)
+            self.check_move(self.lead_player_pos, lead_card, None, trump)
+            self.record_move(self.lead_player_pos, lead_card)
+        lead_suit = self.player_moves[0][1].suit
 
-        for i in range(1, self.num_players):
+        for i in range(len(self.player_moves), self.num_players):
             player_pos = (self.lead_player_pos + i) % self.num_players
             player = self.players[player_pos]
-            self.player_moves.append((player_pos, player.play_card(is_first=False, lead_suit=lead_suit, trump=trump)))
+            card = self._decide(player_pos, player.play_card, is_first=False, lead_suit=lead_suit, trump=trump)
+            self.check_move(player_pos, card, lead_suit, trump)
+            self.record_move(player_pos, card)
+
+        return self.finish_trick(trump)
 
-        trick_winner_pos = determine_trick_winner(self.player_moves, trump)
+    async def play_trick_async(self, trump, resume=False):
+        """
+        Same as 'play_trick', awaiting 'Player.play_card_async' for every card, so that players can wait for batched
+        inference (see 'whist.inference') or remote input while other games run.
+
+        Parameters:
+            trump (int): The suit that acts as the trump for the current round. Can be 'None' if there's no trump.
+            resume (bool): Whether to continue the trick started in 'self.player_moves' from the next player.
+
+        Returns:
+            int: The position of the player who won the trick.
+        """
+        if not resume or len(self.player_moves) == self.num_players:
+            self.player_moves.clear()
+            self.trick_mask = 0
+        if self.hands is None:
+            self.hands = [hand_mask(player.cards) for player in self.players]
+        if not self.player_moves:
+            lead_card = await self._decide_async(self.lead_player_pos,
+                                                 self.players[self.lead_player_pos].play_card_async, is_first=True,
+                                                 lead_suit=None, trump=trump)
+            self.check_move(self.lead_player_pos, lead_card, None, trump)
+            self.record_move(self.lead_player_pos, lead_card)
+        lead_suit = self.player_moves[0][1].suit
+
+        for i in range(len(self.player_moves), self.num_players):
+            player_pos = (self.lead_player_pos + i) % self.num_players
+            player = self.players[player_pos]
+            card = await self._decide_async(player_pos, player.play_card_async, is_first=False, lead_suit=lead_suit,
+                                            trump=trump)
+            self.check_move(player_pos, card, lead_suit, trump)
+            self.record_move(player_pos, card)
+
+        return self.finish_trick(trump)
+
+    def check_move(self, player_pos, card, lead_suit, trump):
+        """
+        Checks that a player holds the card they play and that it follows the rules: the lead suit must be followed
+        if possible, otherwise a trump must be played if the player holds one. The check is a few bit operations on
+        the hand masks of 'self.hands'.
+
+        Parameters:
+            player_pos (int): The position of the player.
+            card (Card): The card played.
+            lead_suit (int): The suit led in the current trick, or None if the player leads it.
+            trump (int): The trump suit for the current round. Can be 'None' if there's no trump.
+
+        Raises:
+            ValueError: If the card cannot be played.
+        """
+        if not legal_mask(self.hands[player_pos], lead_suit, trump) & CARD_BITS[card.index]:
+            raise ValueError(f"{self.players[player_pos].name} cannot play the {card}")
+
+    def record_move(self, player_pos, card):
+        """
+        Records a card played in the current trick in 'self.player_moves', 'self.trick_mask', 'self.hands',
+        'self.info' and the sink.
+
+        Parameters:
+            player_pos (int): The position of the player.
+            card (Card): The card played.
+        """
+        self.player_moves.append((player_pos, card))
+        self.trick_mask |= CARD_BITS[card.index]
+        if self.hands is not None:
+            self.hands[player_pos] &= ~CARD_BITS[card.index]
+        self.info.play_card(player_pos, card)
+        if self.sink is not None:
+            self.sink.on_move(player_pos, card)
+
+    def finish_trick(self, trump):
+        """
+        Resolves the trick held in 'self.player_moves' and 'self.trick_mask': determines its winner, makes them the
+        lead player for the next trick, moves all played cards to the discard deck and records the trick in
+        'self.tricks' and 'self.info'.
+
+        Parameters:
+            trump (int): The trump suit for the current round. Can be 'None' if there's no trump.
+
+        Returns:
+            int: The position of the player who won the trick.
+        """
+        trick_winner_pos = determine_trick_winner(self.player_moves, trump, self.trick_mask)
         self.lead_player_pos = trick_winner_pos
+        self.trick_mask = 0
 
         for move in self.player_moves:
             self.discard_deck.append(move[1])
+        self.tricks.append(list(self.player_moves))
+        self.info.finish_trick(trick_winner_pos)
 
         return trick_winner_pos
@@ -0,0 +1,224 @@
+"""
+Streaming game logs in a compact binary format.
+
+'Game' reports every event of a game to an optional sink (see 'EventSink'). 'GameLogWriter' is a sink writing the
+events to a log file in buffered batches, and 'read_events' streams them back without loading the whole file.
+
+A log file starts with the 8-byte magic b'WHSTLOG1'. Every event follows as a length-prefixed record: the payload
+length (uint8), the event kind (uint8), then the little-endian payload:
+
+    game_start  number of players (uint8)
+    deal        round number (uint8), leader (uint8), then the hand mask of every player (uint64 each)
+    trump       trump card index (uint8)
+    bid         position (uint8), bid (uint8)
+    move        position (uint8), card index (uint8)
+    round_end   round number (uint8), then the round score of every player (int16 each)
+
+A card play takes 4 bytes. Readers skip the kinds they don't know using the length prefix.
+"""
+import struct
+
+MAGIC = b'WHSTLOG1'
+
+GAME_START = 1
+DEAL = 2
+TRUMP = 3
+BID = 4
+MOVE = 5
+ROUND_END = 6
+
+EVENT_NAMES = {
+    GAME_START: 'game_start',
+    DEAL: 'deal',
+    TRUMP: 'trump',
+    BID: 'bid',
+    MOVE: 'move',
+    ROUND_END: 'round_end',
+}
+
+_PAIR = struct.Struct('<BB')
+
+
+class EventSink:
+    """
+    Receives the events of a game from 'Game'. Every method does nothing by default, so sinks only override the
+    events they need.
+    """
+
+    def on_game_start(self, num_players):
+        """
+        Called when the game is created.
+
+        Parameters:
+            num_players (int): The number of players.
+        """
+
+    def on_deal(self, round_number, leader, hands):
+        """
+        Called when the cards of a round are dealt.
+
+        Parameters:
+            round_number (int): The round number.
+            leader (int): The position of the player who bids first and leads the first trick.
+            hands (list of int): The hand mask of every player.
+        """
+
+    def on_trump(self, card):
+        """
+        Called when the trump card is revealed by 'Deck.set_trump'.
+
+        Parameters:
+            card (Card): The trump card.
+        """
+
+    def on_bid(self, player_pos, bid):
+        """
+        Called for every bid of 'Game.make_bids'.
+
+        Parameters:
+            player_pos (int): The position of the player.
+            bid (int): The bid.
+        """
+
+    def on_move(self, player_pos, card):
+        """
+        Called for every card played in 'Game.play_trick'.
+
+        Parameters:
+            player_pos (int): The position of the player.
+            card (Card): The card played.
+        """
+
+    def on_round_end(self, round_number, scores):
+        """
+        Called when a round is scored.
+
+        Parameters:
+            round_number (int): The round number.
+            scores (list of int): The round score of every player.
+        """
+
+
+class GameLogWriter(EventSink):
+    """
+    An event sink writing the events to a binary log file, in batches of at least buffer_size bytes.
+
+    Attributes:
+        file (file object): The binary file written to.
+        buffer_size (int): The number of buffered bytes above which the buffer is written to the file.
+    """
+
+    def __init__(self, file, buffer_size=1 << 16):
+        """
+        Opens a log for writing and writes its header.
+
+        Parameters:
+            file (str or file object): The path of the log, truncated if it exists, or a binary file object.
+            buffer_size (int): The number of buffered bytes above which the buffer is written to the file.
+        """
+        self.owns_file = isinstance(file, str)
+        self.file = open(file, 'wb') if self.owns_file else file
+        self.buffer_size = buffer_size
+        self.buffer = bytearray(MAGIC)
+
+    def _write(self, kind, payload):
+        self.buffer += _PAIR.pack(len(payload), kind)
+        self.buffer += payload
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def on_game_start(self, num_players):
+        self._write(GAME_START, bytes((num_players,)))
+
+    def on_deal(self, round_number, leader, hands):
+        self._write(DEAL, struct.pack(f'<BB{len(hands)}Q', round_number, leader, *hands))
+
+    def on_trump(self, card):
+        self._write(TRUMP, bytes((card.index,)))
+
+    def on_bid(self, player_pos, bid):
+        self._write(BID, _PAIR.pack(player_pos, bid))
+
+    def on_move(self, player_pos, card):
+        self._write(MOVE, _PAIR.pack(player_pos, card.index))
+
+    def on_round_end(self, round_number, scores):
+        self._write(ROUND_END, struct.pack(f'<B{len(scores)}h', round_number, *scores))
+
+    def flush(self):
+        """
+        Writes the buffered events to the file.
+        """
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        """
+        Flushes the buffered events and closes the file if the writer opened it.
+        """
+        self.flush()
+        if self.owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _decode(kind, payload):
+    if kind == GAME_START or kind == TRUMP:
+        return payload[0],
+    if kind == DEAL:
+        return (payload[0], payload[1]) + struct.unpack(f'<{(len(payload) - 2) // 8}Q', payload[2:])
+    if kind == BID or kind == MOVE:
+        return _PAIR.unpack(payload)
+    if kind == ROUND_END:
+        return (payload[0],) + struct.unpack(f'<{(len(payload) - 1) // 2}h', payload[1:])
+    return payload,
+
+
+def read_events(file, chunk_size=1 << 16):
+    """
+    Streams the events of a log file, reading it in chunks.
+
+    Parameters:
+        file (str or file object): The path of the log, or a binary file object positioned at its start.
+        chunk_size (int): The number of bytes read at once.
+
+    Yields:
+        tuple: (name, values) for every event, where name is one of the EVENT_NAMES and values is the tuple of the
+               fields of the payload, in the order of the format: e.g. ('move', (position, card index)) or
+               ('deal', (round number, leader, hand mask, ...)). Unknown kinds are named by their number, with the
+               raw payload.
+
+    Raises:
+        ValueError: If the file is not a game log, or if it ends in the middle of an event.
+    """
+    f = open(file, 'rb') if isinstance(file, str) else file
+    try:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a game log")
+        data = b''
+        pos = 0
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            data = data[pos:] + chunk
+            pos = 0
+            end = len(data)
+            while pos + 2 <= end:
+                length, kind = data[pos], data[pos + 1]
+                if pos + 2 + length > end:
+                    break
+                payload = data[pos + 2:pos + 2 + length]
+                pos += 2 + length
+                yield EVENT_NAMES.get(kind, kind), _decode(kind, payload)
+        if pos != len(data):
+            raise ValueError("Truncated game log")
+    finally:
+        if f is not file:
+            f.close()
@@ -0,0 +1,278 @@
+"""
+Batched policy inference shared by many concurrent games.
+
+Evaluating a model on one observation at a time is dominated by the per-call overhead. 'InferenceBroker' collects the
+pending decisions of every game running on an asyncio event loop, and evaluates them in a single forward pass once
+'max_batch_size' decisions are waiting or 'max_delay_ms' has elapsed since the first one, whichever comes first.
+
+'PolicyPlayer' is a bot asking a broker for its bids and cards; its games are played with 'Game.play_round_async':
+
+    broker = InferenceBroker(MLPPolicy.random(seed=0))
+    games = [Game([PolicyPlayer(f"Bot {i}", broker) for i in range(4)], verbose=False) for _ in range(64)]
+    await asyncio.gather(*(game.play_round_async(1) for game in games))
+
+The model is any callable mapping a float32 array of encoded observations, of shape (batch, OBSERVATION_SIZE), to an
+array of action logits of shape (batch, NUM_ACTIONS), e.g. 'MLPPolicy' or a wrapper around an ONNX runtime session.
+"""
+import asyncio
+
+import numpy as np
+
+from .env import BID, PLAY, NUM_ACTIONS, OBSERVATION_SIZE, encode_observation, encode_legal_mask
+from .masks import NUM_CARDS, legal_moves
+from .player import Player
+
+
+class MLPPolicy:
+    """
+    A multi-layer perceptron with ReLU activations, evaluated with NumPy.
+
+    Attributes:
+        weights (list of numpy.ndarray): The weight matrix of every layer, of shape (inputs, outputs).
+        biases (list of numpy.ndarray): The bias vector of every layer.
+    """
+
+    def __init__(self, weights, biases):
+        """
+        Initializes the policy with its parameters.
+
+        Parameters:
+            weights (list of numpy.ndarray): The weight matrix of every layer. The first layer takes OBSERVATION_SIZE
+                                             inputs and the last one returns NUM_ACTIONS outputs.
+            biases (list of numpy.ndarray): The bias vector of every layer.
+
+        Raises:
+            ValueError: If the shapes of the layers don't chain from OBSERVATION_SIZE to NUM_ACTIONS.
+        """
+        sizes = [OBSERVATION_SIZE] + [w.shape[1] for w in weights]
+        if (len(weights) != len(biases) or sizes[-1] != NUM_ACTIONS
+                or any(w.shape[0] != size or b.shape != (w.shape[1],)
+                       for w, b, size in zip(weights, biases, sizes))):
+            raise ValueError("Invalid layer shapes")
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def random(cls, hidden_sizes=(128,), seed=None):
+        """
+        Creates a policy with randomly initialized parameters.
+
+        Parameters:
+            hidden_sizes (tuple of int): The size of every hidden layer.
+            seed (int): The seed of the initialization.
+
+        Returns:
+            MLPPolicy: The policy.
+        """
+        rng = np.random.default_rng(seed)
+        sizes = (OBSERVATION_SIZE,) + tuple(hidden_sizes) + (NUM_ACTIONS,)
+        weights = [rng.normal(0, np.sqrt(2 / m), (m, n)) for m, n in zip(sizes, sizes[1:])]
+        return cls(weights, [np.zeros(n) for n in sizes[1:]])
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a policy saved with 'save'.
+
+        Parameters:
+            path (str): The path of the .npz file.
+
+        Returns:
+            MLPPolicy: The policy.
+        """
+        with np.load(path) as data:
+            count = len(data.files) // 2
+            return cls([data[f'w{i}'] for i in range(count)], [data[f'b{i}'] for i in range(count)])
+
+    def save(self, path):
+        """
+        Saves the parameters of the policy to a .npz file.
+
+        Parameters:
+            path (str): The path of the file.
+        """
+        arrays = {f'w{i}': w for i, w in enumerate(self.weights)}
+        arrays.update({f'b{i}': b for i, b in enumerate(self.biases)})
+        np.savez(path, **arrays)
+
+    def __call__(self, observations):
+        x = observations
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = np.maximum(x @ w + b, 0)
+        return x @ self.weights[-1] + self.biases[-1]
+
+
+def masked_argmax(logits, legal_masks):
+    """
+    Picks the legal action with the highest logit for every row.
+
+    Parameters:
+        logits (numpy.ndarray): The logits, of shape (batch, NUM_ACTIONS).
+        legal_masks (numpy.ndarray): Boolean array of the same shape marking the legal actions.
+
+    Returns:
+        numpy.ndarray: The chosen action index of every row.
+    """
+    return np.where(legal_masks, logits, -np.inf).argmax(axis=1)
+
+
+class InferenceBroker:
+    """
+    Batches the decisions of concurrent games into single forward passes of a model. The broker must be used from
+    one asyncio event loop at a time.
+
+    Attributes:
+        model (callable): Maps encoded observations of shape (batch, OBSERVATION_SIZE) to logits of shape
+                          (batch, NUM_ACTIONS).
+        max_batch_size (int): The number of pending decisions that triggers a forward pass immediately.
+        max_delay_ms (float): The maximum time the first pending decision waits for others.
+        batches (int): The number of forward passes run so far.
+        decisions (int): The number of decisions made so far.
+    """
+
+    def __init__(self, model, max_batch_size=64, max_delay_ms=1.0):
+        """
+        Initializes the broker with a model.
+
+        Parameters:
+            model (callable): The model, e.g. an MLPPolicy.
+            max_batch_size (int): The number of pending decisions that triggers a forward pass immediately.
+            max_delay_ms (float): The maximum time the first pending decision waits for others.
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay_ms = max_delay_ms
+        self.batches = 0
+        self.decisions = 0
+        self.observations = np.zeros((max_batch_size, OBSERVATION_SIZE), dtype=np.float32)
+        self.legal_masks = np.zeros((max_batch_size, NUM_ACTIONS), dtype=np.bool_)
+        self.futures = []
+        self.timer = None
+
+    async def decide(self, observation):
+        """
+        Queues an observation for the next forward pass and waits for the chosen action.
+
+        Parameters:
+            observation (dict): The observation of the player to act, in the format of 'WhistEnv.observation'.
+
+        Returns:
+            int: The index of the chosen action in the flat action space.
+        """
+        loop = asyncio.get_running_loop()
+        row = len(self.futures)
+        encode_observation(observation, self.observations[row])
+        encode_legal_mask(observation, self.legal_masks[row])
+        future = loop.create_future()
+        self.futures.append(future)
+        if len(self.futures) >= self.max_batch_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_delay_ms / 1000, self.flush)
+        return await future
+
+    def decide_now(self, observation):
+        """
+        Evaluates a single observation immediately, for players used in synchronous games.
+
+        Parameters:
+            observation (dict): The observation of the player to act.
+
+        Returns:
+            int: The index of the chosen action in the flat action space.
+        """
+        observations = np.zeros((1, OBSERVATION_SIZE), dtype=np.float32)
+        legal_masks = np.zeros((1, NUM_ACTIONS), dtype=np.bool_)
+        encode_observation(observation, observations[0])
+        encode_legal_mask(observation, legal_masks[0])
+        self.decisions += 1
+        return int(masked_argmax(self.model(observations), legal_masks)[0])
+
+    def flush(self):
+        """
+        Runs one forward pass over the pending decisions and resolves them.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        count = len(self.futures)
+        if count == 0:
+            return
+        futures = self.futures
+        self.futures = []
+        try:
+            actions = masked_argmax(self.model(self.observations[:count]), self.legal_masks[:count])
+        except Exception as error:
+            for future in futures:
+                future.set_exception(error)
+        else:
+            for future, action in zip(futures, actions.tolist()):
+                future.set_result(action)
+            self.batches += 1
+            self.decisions += count
+        finally:
+            self.observations[:count] = 0
+            self.legal_masks[:count] = False
+
+
+class PolicyPlayer(Player):
+    """
+    A bot choosing its bids and cards with a model shared through an InferenceBroker. In games played with
+    'Game.play_round_async', its decisions are batched with those of the other games; in synchronous games, every
+    decision is evaluated on its own.
+
+    Attributes:
+        broker (InferenceBroker): The broker evaluating the decisions.
+    """
+
+    def __init__(self, name, broker):
+        """
+        Initializes the player.
+
+        Parameters:
+            name (str): The name of the player.
+            broker (InferenceBroker): The broker evaluating the decisions.
+        """
+        super().__init__(name)
+        self.broker = broker
+
+    def _observation(self, phase, legal_actions):
+        info = self.game.info
+        return {
+            'player': self.position,
+            'phase': phase,
+            'round_number': None,
+            'hand_size': len(self.cards) + len(self.game.tricks),
+            'hand': self.game.hands[self.position],
+            'trump': info.trump,
+            'lead_suit': info.lead_suit,
+            'trick': info.trick,
+            'bids': info.bids,
+            'won_tricks': info.won,
+            'total_bid': sum(bid for bid in info.bids if bid is not None),
+            'legal_actions': legal_actions,
+        }
+
+    def _bid_observation(self, is_last, total_bid):
+        forbidden = len(self.cards) - total_bid if is_last else None
+        return self._observation(BID, [bid for bid in range(len(self.cards) + 1) if bid != forbidden])
+
+    def _play_observation(self, lead_suit, trump):
+        return self._observation(PLAY, list(legal_moves(self.game.hands[self.position], lead_suit, trump)))
+
+    def _pop_card(self, action):
+        for i, card in enumerate(self.cards):
+            if card.index == action:
+                return self.cards.pop(i)
+
+    def make_bid(self, is_last, total_bid):
+        return self.broker.decide_now(self._bid_observation(is_last, total_bid)) - NUM_CARDS
+
+    def play_card(self, is_first, lead_suit, trump):
+        return self._pop_card(self.broker.decide_now(self._play_observation(lead_suit, trump)))
+
+    async def make_bid_async(self, is_last, total_bid):
+        return await self.broker.decide(self._bid_observation(is_last, total_bid)) - NUM_CARDS
+
+    async def play_card_async(self, is_first, lead_suit, trump):
+        return self._pop_card(await self.broker.decide(self._play_observation(lead_suit, trump)))
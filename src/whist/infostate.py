@@ -0,0 +1,168 @@
+from .masks import card_index, CARD_BITS, CARD_SUITS, SUIT_MASKS, NUM_SUITS
+
+
+class InformationState:
+    """
+    The public information of a round, updated one event at a time by 'Game' and 'Deck' instead of being rebuilt from
+    'Game.discard_deck' and 'Game.player_moves' on every decision.
+
+    Every update is O(1). The state is a handful of integers and short lists held in '__slots__', so 'copy()' is
+    cheap enough for search bots to branch on it.
+
+    Attributes:
+        num_players (int): The number of players in the game.
+        deck (int): The mask of the cards in the deck for this number of players.
+        trump (int): The trump suit, or None if there's no trump.
+        trump_card (int): The index of the trump card, or None.
+        seen (int): The mask of the cards seen by every player: the played cards and the trump card.
+        voids (list of int): For every position, a bitset with bit 'suit' set for every suit the player is known to
+                             be void in.
+        remaining (list of int): For every suit, the number of cards of the deck not seen yet.
+        bids (list of int): The bid of every player, or None if they haven't bid yet.
+        won (list of int): The tricks won by every player.
+        leader (int): The position of the player leading the current trick.
+        trick (list of tuples): The (position, card index) moves of the current trick.
+    """
+
+    __slots__ = ('num_players', 'deck', 'trump', 'trump_card', 'seen', 'voids', 'remaining', 'bids', 'won',
+                 'leader', 'trick')
+
+    def __init__(self, num_players):
+        """
+        Initializes the state for a number of players. 'start_round' must be called before every round.
+
+        Parameters:
+            num_players (int): The number of players in the game.
+        """
+        self.num_players = num_players
+        lowest_value = 3 + (6 - num_players) * 2
+        self.deck = 0
+        for suit in range(NUM_SUITS):
+            for value in range(lowest_value, 16):
+                if value != 11:
+                    self.deck |= CARD_BITS[card_index(value, suit)]
+        self.start_round(0)
+
+    def start_round(self, leader):
+        """
+        Resets the state for a new round.
+
+        Parameters:
+            leader (int): The position of the player who bids first and leads the first trick.
+        """
+        n = self.num_players
+        self.trump = None
+        self.trump_card = None
+        self.seen = 0
+        self.voids = [0] * n
+        self.remaining = [(self.deck & SUIT_MASKS[suit]).bit_count() for suit in range(NUM_SUITS)]
+        self.bids = [None] * n
+        self.won = [0] * n
+        self.leader = leader
+        self.trick = []
+
+    def set_trump(self, card):
+        """
+        Records the trump card revealed by 'Deck.set_trump'.
+
+        Parameters:
+            card (Card): The trump card.
+        """
+        self.trump = card.suit
+        self.trump_card = card.index
+        self.seen |= CARD_BITS[card.index]
+        self.remaining[card.suit] -= 1
+
+    def set_bid(self, player_pos, bid):
+        """
+        Records the bid of a player.
+
+        Parameters:
+            player_pos (int): The position of the player.
+            bid (int): The bid.
+        """
+        self.bids[player_pos] = bid
+
+    def play_card(self, player_pos, card):
+        """
+        Records a card played in the current trick. A player who does not follow the lead suit is void in it, and
+        also in trumps if they don't play one.
+
+        Parameters:
+            player_pos (int): The position of the player.
+            card (Card): The card played.
+        """
+        index = card.index
+        if self.trick:
+            lead_suit = CARD_SUITS[self.trick[0][1]]
+            if card.suit != lead_suit:
+                self.voids[player_pos] |= 1 << lead_suit
+                if self.trump is not None and card.suit != self.trump:
+                    self.voids[player_pos] |= 1 << self.trump
+        self.trick.append((player_pos, index))
+        self.seen |= CARD_BITS[index]
+        self.remaining[card.suit] -= 1
+
+    def finish_trick(self, winner_pos):
+        """
+        Records the winner of the current trick, who leads the next one.
+
+        Parameters:
+            winner_pos (int): The position of the player who won the trick.
+        """
+        self.won[winner_pos] += 1
+        self.leader = winner_pos
+        self.trick = []
+
+    @property
+    def lead_suit(self):
+        """
+        int: The suit led in the current trick, or None if no card has been played yet.
+        """
+        return CARD_SUITS[self.trick[0][1]] if self.trick else None
+
+    def tricks_needed(self, player_pos):
+        """
+        Computes the number of tricks a player still has to win to make their bid.
+
+        Parameters:
+            player_pos (int): The position of the player.
+
+        Returns:
+            int: The bid minus the tricks won, negative once the player won too many, or None if they haven't bid.
+        """
+        bid = self.bids[player_pos]
+        return None if bid is None else bid - self.won[player_pos]
+
+    def unseen(self, hand=0):
+        """
+        Computes the cards of the deck a player hasn't seen: held by the other players or never dealt.
+
+        Parameters:
+            hand (int): The hand mask of the player.
+
+        Returns:
+            int: The mask of the cards not seen.
+        """
+        return self.deck & ~self.seen & ~hand
+
+    def copy(self):
+        """
+        Creates an independent snapshot of the state.
+
+        Returns:
+            InformationState: The copy.
+        """
+        other = InformationState.__new__(InformationState)
+        other.num_players = self.num_players
+        other.deck = self.deck
+        other.trump = self.trump
+        other.trump_card = self.trump_card
+        other.seen = self.seen
+        other.voids = self.voids[:]
+        other.remaining = self.remaining[:]
+        other.bids = self.bids[:]
+        other.won = self.won[:]
+        other.leader = self.leader
+        other.trick = self.trick[:]
+        return other
@@ -0,0 +1,334 @@
+"""
+Information Set Monte Carlo Tree Search (ISMCTS) bot.
+
+Every iteration samples the hidden hands consistently with what the player has seen (see 'pimc.sample_hands'), walks
+down a single tree shared by all the samples, choosing among the moves legal in that sample, expands one move, plays
+the rest of the round out with random legal cards and backs the round scores of every player up the path. The tree
+holds the moves of every player, each node being scored for the player who made its move.
+
+The search runs between the player's own decisions only, but the tree persists through the round: at the next
+decision, the moves played since by every player are followed down from the old root and the subtree they reach is
+kept, with all its statistics, while the rest of the tree is returned to the pool.
+
+Nodes live in a 'NodePool' of preallocated typed arrays, indexed by integers, instead of one Python object per node,
+so that the tree costs a few bytes per node and freeing a subtree never involves the garbage collector.
+"""
+import math
+import random
+import time
+from array import array
+
+from .bidding import BidEstimator
+from .masks import legal_moves
+from .pimc import play_out, sample_hands
+from .player import Player
+from .state import GameState
+from .utils import calculate_score
+
+NO_NODE = -1
+
+
+class NodePool:
+    """
+    Preallocated storage of search tree nodes. Node i is described by the i-th entry of every array; the children of
+    a node form a linked list through 'first_child' and 'next_sibling', and free nodes are chained through
+    'next_sibling' as well.
+
+    Attributes:
+        capacity (int): The maximum number of nodes.
+        parent (array): The parent of every node, or NO_NODE for a root.
+        first_child (array): The first child of every node, or NO_NODE.
+        next_sibling (array): The next child of the same parent, or the next free node.
+        move (array): The card index played to reach every node.
+        player (array): The position of the player who played that card.
+        visits (array): The number of iterations through every node.
+        available (array): The number of iterations in which the move of every node was legal.
+        reward (array): The sum of the rewards of the player of every node, each between 0 and 1.
+        used (int): The number of nodes in use.
+    """
+
+    def __init__(self, capacity):
+        """
+        Allocates the arrays, with every node free.
+
+        Parameters:
+            capacity (int): The maximum number of nodes.
+        """
+        self.capacity = capacity
+        self.parent = array('i', [NO_NODE]) * capacity
+        self.first_child = array('i', [NO_NODE]) * capacity
+        self.next_sibling = array('i', range(1, capacity + 1))
+        self.next_sibling[capacity - 1] = NO_NODE
+        self.move = array('b', [0]) * capacity
+        self.player = array('b', [0]) * capacity
+        self.visits = array('i', [0]) * capacity
+        self.available = array('i', [0]) * capacity
+        self.reward = array('d', [0.0]) * capacity
+        self._free = 0 if capacity else NO_NODE
+        self.used = 0
+
+    def allocate(self, parent, move, player):
+        """
+        Takes a free node and links it as the first child of its parent.
+
+        Parameters:
+            parent (int): The parent node, or NO_NODE for a root.
+            move (int): The card index played to reach the node.
+            player (int): The position of the player who played it.
+
+        Returns:
+            int: The node, or NO_NODE if the pool is full.
+        """
+        node = self._free
+        if node == NO_NODE:
+            return NO_NODE
+        self._free = self.next_sibling[node]
+        self.parent[node] = parent
+        self.first_child[node] = NO_NODE
+        self.move[node] = move
+        self.player[node] = player
+        self.visits[node] = 0
+        self.available[node] = 0
+        self.reward[node] = 0.0
+        if parent == NO_NODE:
+            self.next_sibling[node] = NO_NODE
+        else:
+            self.next_sibling[node] = self.first_child[parent]
+            self.first_child[parent] = node
+        self.used += 1
+        return node
+
+    def child(self, node, move):
+        """
+        Finds the child of a node reached by a move.
+
+        Parameters:
+            node (int): The node.
+            move (int): The card index.
+
+        Returns:
+            int: The child, or NO_NODE if the move was never expanded.
+        """
+        child = self.first_child[node]
+        while child != NO_NODE and self.move[child] != move:
+            child = self.next_sibling[child]
+        return child
+
+    def free(self, node):
+        """
+        Returns a node and all its descendants to the pool. The node must already be detached from its parent.
+
+        Parameters:
+            node (int): The root of the subtree to free.
+        """
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            child = self.first_child[node]
+            while child != NO_NODE:
+                stack.append(child)
+                child = self.next_sibling[child]
+            self.next_sibling[node] = self._free
+            self._free = node
+            self.used -= 1
+
+    def keep(self, root, node):
+        """
+        Makes a descendant of a root the new root, freeing every other node of the tree.
+
+        Parameters:
+            root (int): The current root.
+            node (int): The descendant to keep.
+        """
+        if node == root:
+            return
+        parent = self.parent[node]
+        child = self.first_child[parent]
+        if child == node:
+            self.first_child[parent] = self.next_sibling[node]
+        else:
+            while self.next_sibling[child] != node:
+                child = self.next_sibling[child]
+            self.next_sibling[child] = self.next_sibling[node]
+        self.free(root)
+        self.parent[node] = NO_NODE
+        self.next_sibling[node] = NO_NODE
+
+
+class ISMCTSPlayer(Player):
+    """
+    A bot playing its cards by Information Set Monte Carlo Tree Search, reusing its tree from one decision to the next
+    within a round. Bids come from a 'BidEstimator' of 'whist.bidding'. The player must be seated in a 'Game'.
+
+    Every decision runs until it reaches its iteration budget or its time budget, whichever comes first, and plays
+    the most visited card.
+
+    Attributes:
+        iterations (int): The maximum number of iterations of a decision, or None for no limit.
+        budget_ms (float): The time budget of a decision in milliseconds, or None for no limit.
+        exploration (float): The exploration constant of the UCB selection.
+        pool (NodePool): The nodes of the tree.
+        root (int): The root of the tree, or NO_NODE.
+        estimator (BidEstimator): The estimator choosing the bids; created on the first bid if None.
+        rng (random.Random): The random generator of the samples and the play-outs.
+        last_iterations (int): The number of iterations of the last decision.
+        reused_visits (int): The visits of the root kept from earlier decisions at the start of the last decision.
+    """
+
+    def __init__(self, name, iterations=1000, budget_ms=None, exploration=0.7, capacity=1 << 17, estimator=None,
+                 seed=None):
+        """
+        Initializes the player and allocates its node pool.
+
+        Parameters:
+            name (string): The name of the player.
+            iterations (int): The maximum number of iterations of a decision, or None for no limit.
+            budget_ms (float): The time budget of a decision in milliseconds, or None for no limit.
+            exploration (float): The exploration constant of the UCB selection.
+            capacity (int): The number of nodes of the pool. Once it is full, iterations stop expanding the tree.
+            estimator (BidEstimator): The estimator choosing the bids.
+            seed (int): The seed of the random generator.
+
+        Raises:
+            ValueError: If neither an iteration nor a time budget is given.
+        """
+        if iterations is None and budget_ms is None:
+            raise ValueError("An iteration or a time budget is required")
+        super().__init__(name)
+        self.iterations = iterations
+        self.budget_ms = budget_ms
+        self.exploration = exploration
+        self.pool = NodePool(capacity)
+        self.root = NO_NODE
+        self.estimator = estimator
+        self.rng = random.Random(seed)
+        self.last_iterations = 0
+        self.reused_visits = 0
+        self._history = []
+
+    def make_bid(self, is_last, total_bid):
+        """
+        Implements make_bid with the bid estimator, which never lets the last player make the total bids equal to the
+        hand size. A new round starts with a new tree.
+        """
+        self._reset()
+        if self.estimator is None:
+            self.estimator = BidEstimator(self.game.num_players, num_samples=1024, persistent=False)
+        return self.estimator.make_bid(self, is_last, total_bid)
+
+    def play_card(self, is_first, lead_suit, trump):
+        """
+        Implements play_card by searching from the current position, starting from the subtree of the previous
+        decision reached by the cards played since.
+
+        If the player is not first, they must follow the lead suit or play a trump if they have no cards
+        in the lead suit.
+        """
+        hand = self.game.hands[self.position]
+        legal = legal_moves(hand, None if is_first else lead_suit, trump)
+        self._advance()
+        best = legal[0]
+        if len(legal) > 1:
+            self._search(hand)
+            best = max(legal, key=self._root_visits)
+
+        for i, card in enumerate(self.cards):
+            if card.index == best:
+                return self.cards.pop(i)
+
+    def _root_visits(self, move):
+        child = self.pool.child(self.root, move)
+        return self.pool.visits[child] if child != NO_NODE else -1
+
+    def _reset(self):
+        if self.root != NO_NODE:
+            self.pool.free(self.root)
+        self.root = NO_NODE
+        self._history = []
+
+    def _advance(self):
+        # Follows the moves played since the last decision down the tree, keeping the subtree they lead to.
+        game = self.game
+        history = [(pos, card.index) for trick in game.tricks for pos, card in trick] + game.info.trick
+        moves = history[len(self._history):]
+        self._history = history
+        node = self.root
+        for _, move in moves:
+            if node == NO_NODE:
+                break
+            node = self.pool.child(node, move)
+        if node == NO_NODE:
+            if self.root != NO_NODE:
+                self.pool.free(self.root)
+            self.root = self.pool.allocate(NO_NODE, 0, self.position)
+        elif node != self.root:
+            self.pool.keep(self.root, node)
+            self.root = node
+
+    def _search(self, hand):
+        info = self.game.info
+        counts = [len(player.cards) for player in self.game.players]
+        counts[self.position] = 0
+        unknown = info.unseen(hand)
+        hand_size = len(self.cards) + sum(info.won)
+        deadline = time.monotonic() + self.budget_ms / 1000 if self.budget_ms is not None else None
+        self.reused_visits = self.pool.visits[self.root]
+
+        iterations = 0
+        while self.iterations is None or iterations < self.iterations:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            hands = sample_hands(unknown, counts, info.voids, self.rng)
+            hands[self.position] = hand
+            self._iterate(GameState.from_info(info, hands, hand_size))
+            iterations += 1
+        self.last_iterations = iterations
+
+    def _iterate(self, state):
+        pool = self.pool
+        rng = self.rng
+        visits = pool.visits
+        available = pool.available
+        reward = pool.reward
+        c = self.exploration
+
+        # Selection: descend while every legal move of the sample has a child, then expand one untried move.
+        node = self.root
+        path = [node]
+        while not state.is_over:
+            legal = state.legal_moves()
+            best = NO_NODE
+            best_value = -1.0
+            child = pool.first_child[node]
+            tried = set()
+            while child != NO_NODE:
+                move = pool.move[child]
+                if move in legal:
+                    tried.add(move)
+                    available[child] += 1
+                    value = reward[child] / visits[child] + c * math.sqrt(math.log(available[child]) / visits[child])
+                    if value > best_value:
+                        best, best_value = child, value
+                child = pool.next_sibling[child]
+            untried = [move for move in legal if move not in tried]
+            if untried:
+                move = untried[rng.randrange(len(untried))]
+                child = pool.allocate(node, move, state.current_player)
+                state.apply(move)
+                if child != NO_NODE:
+                    available[child] += 1
+                    path.append(child)
+                break
+            state.apply(pool.move[best])
+            node = best
+            path.append(node)
+
+        # Play-out with random legal cards, then back up the score of the player of every node.
+        won = state.won
+        if not state.is_over:
+            won = play_out(state.hands, state.trump, state.leader, state.trick, list(state.won), rng)
+        span = 2 * state.hand_size + 5
+        rewards = [(calculate_score(bid, tricks) + state.hand_size) / span for bid, tricks in zip(state.bids, won)]
+        for node in path:
+            visits[node] += 1
+            reward[node] += rewards[pool.player[node]]
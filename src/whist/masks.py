@@ -0,0 +1,207 @@
+"""
+Compact integer representation of cards, hands and tricks used by the engine hot paths.
+
+Every card maps to an index between 0 and 51, computed as 'suit * 13 + rank', where 'rank' is the position of the card
+value inside RANK_VALUES (0 for 2, 12 for Ace). A hand is a single Python integer with one bit set per held card, so
+within a suit a higher bit always means a higher card. Suit checks, legal-move generation and trick resolution become
+a handful of bit operations instead of scans over lists of Card objects.
+"""
+from functools import lru_cache
+
+from .card import CARDS, RANK_VALUES
+
+NUM_SUITS = 4
+NUM_RANKS = 13
+NUM_CARDS = NUM_SUITS * NUM_RANKS
+
+VALUE_TO_RANK = [None] * 16
+for _rank, _value in enumerate(RANK_VALUES):
+    VALUE_TO_RANK[_value] = _rank
+
+FULL_SUIT = (1 << NUM_RANKS) - 1
+SUIT_MASKS = tuple(FULL_SUIT << (suit * NUM_RANKS) for suit in range(NUM_SUITS))
+FULL_MASK = (1 << NUM_CARDS) - 1
+
+# Precomputed per-index tables so that no arithmetic is needed in the hot paths.
+CARD_BITS = tuple(1 << i for i in range(NUM_CARDS))
+CARD_SUITS = tuple(i // NUM_RANKS for i in range(NUM_CARDS))
+CARD_RANKS = tuple(i % NUM_RANKS for i in range(NUM_CARDS))
+CARD_VALUES = tuple(RANK_VALUES[i % NUM_RANKS] for i in range(NUM_CARDS))
+
+
+def card_index(value, suit):
+    """
+    Computes the engine index of a card.
+
+    Parameters:
+        value (int): The card value, between 2 and 15, excluding 11.
+        suit (int): The suit index, between 0 and 3.
+
+    Returns:
+        int: The card index between 0 and 51.
+    """
+    return suit * NUM_RANKS + VALUE_TO_RANK[value]
+
+
+def hand_mask(cards):
+    """
+    Converts a list of Card objects to a hand mask.
+
+    Parameters:
+        cards (list of Card): The cards to convert.
+
+    Returns:
+        int: An integer with one bit set for every card in the list.
+    """
+    mask = 0
+    for card in cards:
+        mask |= CARD_BITS[card.index]
+    return mask
+
+
+def iter_indices(mask):
+    """
+    Yields the indices of the cards in a mask, from the lowest to the highest index.
+
+    Parameters:
+        mask (int): The card mask.
+
+    Yields:
+        int: The index of each card in the mask.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def to_cards(mask):
+    """
+    Materializes the cards of a mask as Card objects. This is only meant for display purposes and for the boundary
+    with the object based API, never for the engine hot paths.
+
+    Parameters:
+        mask (int): The card mask.
+
+    Returns:
+        list of Card: The cards in the mask, ordered by suit and then by value.
+    """
+    return [CARDS[i] for i in iter_indices(mask)]
+
+
+def mask_has_suit(mask, suit):
+    """
+    Determines whether a hand mask holds at least one card of the specified suit.
+
+    Parameters:
+        mask (int): The hand mask.
+        suit (int): The suit to check for.
+
+    Returns:
+        bool: True if there's at least one card of the suit in the hand; otherwise, False.
+    """
+    return mask & SUIT_MASKS[suit] != 0
+
+
+def suit_count(mask, suit):
+    """
+    Counts the cards of a suit in a hand mask.
+
+    Parameters:
+        mask (int): The hand mask.
+        suit (int): The suit to count.
+
+    Returns:
+        int: The number of cards of the suit in the hand.
+    """
+    return (mask & SUIT_MASKS[suit]).bit_count()
+
+
+def legal_mask(hand, lead_suit, trump):
+    """
+    Computes the cards of a hand that can legally be played, following the same rules as 'HumanPlayer.play_card':
+    the lead suit must be followed if possible, otherwise a trump must be played if the hand holds one.
+
+    Parameters:
+        hand (int): The hand mask of the player.
+        lead_suit (int): The suit led in the current trick, or None if the player is the first to play.
+        trump (int): The trump suit of the current round, or None if there's no trump.
+
+    Returns:
+        int: The mask of the cards that can be played.
+    """
+    if lead_suit is None:
+        return hand
+    follow = hand & SUIT_MASKS[lead_suit]
+    if follow:
+        return follow
+    if trump is not None:
+        trumps = hand & SUIT_MASKS[trump]
+        if trumps:
+            return trumps
+    return hand
+
+
+@lru_cache(maxsize=1 << 16)
+def legal_moves(hand, lead_suit, trump):
+    """
+    Lists the cards of a hand that can legally be played, as computed by 'legal_mask'. Results are cached per
+    (hand, lead_suit, trump) and shared by every caller: the game, the bots, the environment and the search states,
+    so that a repeated position costs a dictionary lookup.
+
+    Parameters:
+        hand (int): The hand mask of the player.
+        lead_suit (int): The suit led in the current trick, or None if the player is the first to play.
+        trump (int): The trump suit of the current round, or None if there's no trump.
+
+    Returns:
+        tuple of int: The indices of the cards that can be played, from the lowest to the highest index.
+    """
+    return tuple(iter_indices(legal_mask(hand, lead_suit, trump)))
+
+
+def winning_card(played, lead_suit, trump):
+    """
+    Determines the card that wins a trick: the highest trump if any was played, otherwise the highest card of the
+    lead suit.
+
+    Parameters:
+        played (int): The mask of the cards played in the trick.
+        lead_suit (int): The suit of the first card of the trick.
+        trump (int): The trump suit of the current round, or None if there's no trump.
+
+    Returns:
+        int: The index of the winning card.
+    """
+    winners = played & SUIT_MASKS[trump] if trump is not None else 0
+    if not winners:
+        winners = played & SUIT_MASKS[lead_suit]
+    return winners.bit_length() - 1
+
+
+def trick_winner(moves, trump):
+    """
+    Determines the winning player in a trick, following the same rules as 'determine_trick_winner', but working on
+    card indices instead of Card objects.
+
+    Parameters:
+        moves (list of tuples): Each tuple contains the position of a player and the index of the card they played,
+                                in playing order.
+        trump (int): The trump suit of the current round, or None if there's no trump.
+
+    Returns:
+        int: The position of the player who won the trick.
+
+    Raises:
+        ValueError: If moves is empty.
+    """
+    if not moves:
+        raise ValueError("moves cannot be empty")
+
+    played = 0
+    for move in moves:
+        played |= CARD_BITS[move[1]]
+    best = winning_card(played, CARD_SUITS[moves[0][1]], trump)
+    for move in moves:
+        if move[1] == best:
+            return move[0]
@@ -0,0 +1,302 @@
+"""
+Perfect Information Monte Carlo (PIMC) bot: every decision samples plausible hands for the other players, plays out
+each sample and keeps the action with the best average score.
+
+Samples are drawn in parallel worker processes under a per-decision time budget. Workers stop sampling at the
+deadline and the bot decides with whatever results came back, so that a decision never takes much longer than the
+budget, however many samples that allows.
+"""
+import multiprocessing as mp
+import os
+import random
+import time
+
+from .bidtables import single_card_bid
+from .env import BID, PLAY
+from .masks import iter_indices, legal_mask, legal_moves, trick_winner, CARD_BITS, CARD_SUITS
+from .player import Player
+from .utils import calculate_score
+
+
+def sample_hands(unknown, counts, voids, rng, attempts=20):
+    """
+    Deals the unknown cards at random to the other players, giving every player their number of cards and no card of
+    a suit they are void in. Players with the most voids are dealt first.
+
+    Parameters:
+        unknown (int): The mask of the cards that may be held by the other players, or still be in the deck.
+        counts (list of int): The number of cards held by every player, 0 for the players whose hand is known.
+        voids (list of int): The void suits of every player, as tracked by 'InformationState'.
+        rng (random.Random): The random generator to use.
+        attempts (int): The number of attempts at respecting the voids before ignoring them.
+
+    Returns:
+        list of int: The sampled hand mask of every player, 0 for the players whose hand is known.
+    """
+    cards = list(iter_indices(unknown))
+    order = sorted(range(len(counts)), key=lambda pos: -bin(voids[pos]).count("1"))
+    for _ in range(attempts):
+        pool = set(cards)
+        hands = [0] * len(counts)
+        for pos in order:
+            if not counts[pos]:
+                continue
+            eligible = [c for c in cards if c in pool and not voids[pos] >> CARD_SUITS[c] & 1]
+            if len(eligible) < counts[pos]:
+                break
+            for c in rng.sample(eligible, counts[pos]):
+                pool.discard(c)
+                hands[pos] |= CARD_BITS[c]
+        else:
+            return hands
+
+    # The observed voids cannot all be respected, which only happens with inconsistent observations.
+    rng.shuffle(cards)
+    hands = [0] * len(counts)
+    start = 0
+    for pos, count in enumerate(counts):
+        for c in cards[start:start + count]:
+            hands[pos] |= CARD_BITS[c]
+        start += count
+    return hands
+
+
+def _random_card(mask, rng):
+    k = rng.randrange(mask.bit_count())
+    for i in iter_indices(mask):
+        if k == 0:
+            return i
+        k -= 1
+
+
+def play_out(hands, trump, leader, trick, won, rng):
+    """
+    Plays the rest of a round with random legal cards for every player, starting from any point of a trick.
+
+    Parameters:
+        hands (list of int): The hand mask of every player. Updated in place.
+        trump (int): The trump suit, or None if there's no trump.
+        leader (int): The position of the player who leads the current trick.
+        trick (list of tuples): The (position, card index) moves already played in the current trick.
+        won (list of int): The tricks won so far by every player. Updated in place.
+        rng (random.Random): The random generator to use.
+
+    Returns:
+        list of int: The tricks won by every player at the end of the round.
+    """
+    n = len(hands)
+    trick = list(trick)
+    while True:
+        for step in range(len(trick), n):
+            seat = (leader + step) % n
+            lead_suit = CARD_SUITS[trick[0][1]] if trick else None
+            card = _random_card(legal_mask(hands[seat], lead_suit, trump), rng)
+            hands[seat] ^= CARD_BITS[card]
+            trick.append((seat, card))
+        leader = trick_winner(trick, trump)
+        won[leader] += 1
+        if not hands[leader]:
+            return won
+        trick = []
+
+
+def evaluate(decision, seed, deadline, max_samples):
+    """
+    Samples hidden hands and plays them out for a decision, until max_samples samples are done or the deadline has
+    passed. This is the unit of work run by the worker processes.
+
+    Parameters:
+        decision (dict): The public information of the decision, as built by 'PIMCPlayer'.
+        seed (int): The seed of the random generator.
+        deadline (float): The 'time.monotonic()' after which no new sample is started. The clock is system-wide,
+                          so the deadline holds in the worker processes too.
+        max_samples (int): The maximum number of samples.
+
+    Returns:
+        tuple: (totals, samples). When bidding, totals counts the samples in which the player took each number of
+               tricks; when playing, it holds the sum of the round scores obtained after each legal card.
+    """
+    rng = random.Random(seed)
+    position = decision['position']
+    actions = decision['actions']
+    if decision['phase'] == BID:
+        totals = [0] * (decision['hand_size'] + 1)
+    else:
+        totals = [0] * len(actions)
+
+    samples = 0
+    while samples < max_samples and time.monotonic() < deadline:
+        hands = sample_hands(decision['unknown'], decision['counts'], decision['voids'], rng)
+        hands[position] = decision['hand']
+        if decision['phase'] == BID:
+            won = play_out(hands, decision['trump'], decision['leader'], [], [0] * len(hands), rng)
+            totals[won[position]] += 1
+        else:
+            bid = decision['bids'][position]
+            for i, card in enumerate(actions):
+                sample = list(hands)
+                sample[position] ^= CARD_BITS[card]
+                trick = decision['trick'] + [(position, card)]
+                won = play_out(sample, decision['trump'], decision['leader'], trick, list(decision['won']), rng)
+                totals[i] += calculate_score(bid, won[position])
+        samples += 1
+    return totals, samples
+
+
+class PIMCPlayer(Player):
+    """
+    A bot deciding both its bids and its cards by Perfect Information Monte Carlo sampling. The hidden hands are
+    sampled from the cards not seen yet, respecting the voids observed in the round by the 'InformationState' of the
+    game, and every sample is played out with random legal cards.
+
+    Bids maximize the expected 'calculate_score' over the distribution of sampled tricks, and cards maximize the
+    average round score over the samples. The player must be seated in a 'Game', which gives it access to the public
+    state of the round.
+
+    Attributes:
+        budget_ms (float): The time budget of a decision, in milliseconds.
+        processes (int): The number of worker processes. With 0, samples are drawn in the calling process.
+        batch_size (int): The maximum number of samples of a single worker task.
+        rng (random.Random): The random generator seeding the samples.
+        samples (int): The number of samples used by the last decision.
+        estimator (BidEstimator): The estimator answering the bids from cached estimates, or None to sample every
+                                  bid under the time budget.
+    """
+
+    def __init__(self, name, budget_ms=200, processes=None, batch_size=8, seed=None, estimator=None):
+        """
+        Initializes the player. Worker processes are started on the first decision.
+
+        Parameters:
+            name (string): The name of the player.
+            budget_ms (float): The time budget of a decision, in milliseconds.
+            processes (int): The number of worker processes. Defaults to the number of cores; 0 samples in the
+                             calling process.
+            batch_size (int): The maximum number of samples of a single worker task. Smaller tasks let the bot stop
+                              closer to the deadline.
+            seed (int): The seed of the random generator.
+            estimator (BidEstimator): The estimator of 'whist.bidding' answering the bids, if any.
+        """
+        super().__init__(name)
+        self.budget_ms = budget_ms
+        self.processes = os.cpu_count() if processes is None else processes
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.samples = 0
+        self.estimator = estimator
+        self.pool = None
+
+    def make_bid(self, is_last, total_bid):
+        """
+        Implements make_bid by estimating the distribution of the tricks taken by the player over sampled deals.
+
+        The last player never bids the number of tricks that would make the total bids equal to the hand size.
+        Single-card rounds are answered from the exact tables of 'whist.bidtables' instead, and every round from the
+        cached estimates of the estimator when the player has one.
+        """
+        hand_size = len(self.cards)
+        info = self.game.info
+        if hand_size == 1 and info.trump_card is not None:
+            step = (self.position - info.leader) % info.num_players
+            return single_card_bid(info.num_players, self.cards[0].index,
+                                   info.trump_card, step, total_bid)
+        if self.estimator is not None:
+            return self.estimator.make_bid(self, is_last, total_bid)
+
+        bids = [bid for bid in range(hand_size + 1) if not (is_last and bid == hand_size - total_bid)]
+        decision = self._decision(BID, bids)
+        counts = self._search(decision)
+        return max(bids, key=lambda bid: sum(count * calculate_score(bid, tricks)
+                                             for tricks, count in enumerate(counts)))
+
+    def play_card(self, is_first, lead_suit, trump):
+        """
+        Implements play_card by playing out sampled deals after every legal card and playing the card with the best
+        average round score.
+
+        If the player is not first, they must follow the lead suit or play a trump if they have no cards
+        in the lead suit.
+        """
+        hand = self.game.hands[self.position]
+        legal = legal_moves(hand, None if is_first else lead_suit, trump)
+        best = legal[0]
+        if len(legal) > 1:
+            decision = self._decision(PLAY, legal)
+            totals = self._search(decision)
+            best = legal[max(range(len(legal)), key=lambda i: totals[i])]
+
+        for i, card in enumerate(self.cards):
+            if card.index == best:
+                return self.cards.pop(i)
+
+    def _decision(self, phase, actions):
+        info = self.game.info
+        hand = self.game.hands[self.position]
+        counts = [len(player.cards) for player in self.game.players]
+        counts[self.position] = 0
+
+        return {
+            'phase': phase,
+            'position': self.position,
+            'actions': actions,
+            'hand': hand,
+            'hand_size': len(self.cards),
+            'unknown': info.unseen(hand),
+            'counts': counts,
+            'voids': info.voids,
+            'trump': info.trump,
+            'leader': info.leader,
+            'trick': info.trick,
+            'won': info.won,
+            'bids': info.bids,
+        }
+
+    def _search(self, decision):
+        deadline = time.monotonic() + self.budget_ms / 1000
+        totals = None
+        samples = 0
+
+        def merge(result):
+            nonlocal totals, samples
+            if totals is None:
+                totals = list(result[0])
+            else:
+                totals = [a + b for a, b in zip(totals, result[0])]
+            samples += result[1]
+
+        if self.processes == 0:
+            while time.monotonic() < deadline:
+                merge(evaluate(decision, self.rng.getrandbits(64), deadline, self.batch_size))
+        else:
+            if self.pool is None:
+                self.pool = mp.Pool(self.processes)
+            pending = [self._submit(decision, deadline) for _ in range(self.processes)]
+            while pending:
+                pending[0].wait(max(0.0, deadline - time.monotonic()))
+                running = time.monotonic() < deadline
+                for result in [result for result in pending if result.ready()]:
+                    pending.remove(result)
+                    merge(result.get())
+                    if running:
+                        pending.append(self._submit(decision, deadline))
+                if not running:
+                    # Tasks still running stop sampling at the deadline; their results are dropped.
+                    break
+
+        if not samples:
+            # Nothing came back in time, e.g. with a tiny budget: decide on a single sample rather than blindly.
+            merge(evaluate(decision, self.rng.getrandbits(64), float("inf"), 1))
+        self.samples = samples
+        return totals
+
+    def _submit(self, decision, deadline):
+        return self.pool.apply_async(evaluate, (decision, self.rng.getrandbits(64), deadline, self.batch_size))
+
+    def close(self):
+        """
+        Stops the worker processes, if they were started.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
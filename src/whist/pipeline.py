@@ -0,0 +1,274 @@
+"""
+Offline training-data pipeline: replays recorded games into fixed-shape NumPy batches of (observation, legal-action
+mask, action, return), ready to feed a learner.
+
+Games are recorded either to log files with 'GameLogWriter' or in memory with 'EventRecorder'. Every bid and card of
+a recorded game becomes one transition, encoded with the observation layout of 'WhistEnv' (hand, trick, trump, lead
+suit, phase, hand size, bids and won tricks), and its return is the round score of the acting player, as in
+'whist.rollout'.
+
+'ReplayPipeline' decodes the recordings on worker processes, assembles batches on a background thread ahead of the
+consumer and optionally shuffles transitions through a bounded buffer.
+"""
+import glob
+import multiprocessing as mp
+import os
+import queue
+import threading
+
+import numpy as np
+
+from .env import BID, PLAY, NUM_ACTIONS, OBSERVATION_SIZE, action_index, encode_observation, encode_legal_mask
+from .gamelog import EventSink, read_events
+from .masks import CARD_SUITS
+from .state import GameState
+
+
+class EventRecorder(EventSink):
+    """
+    An event sink keeping the events of games in memory, in the same form as 'read_events' yields them.
+
+    Attributes:
+        events (list of tuples): The (name, values) events recorded so far.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def on_game_start(self, num_players):
+        self.events.append(('game_start', (num_players,)))
+
+    def on_deal(self, round_number, leader, hands):
+        self.events.append(('deal', (round_number, leader) + tuple(hands)))
+
+    def on_trump(self, card):
+        self.events.append(('trump', (card.index,)))
+
+    def on_bid(self, player_pos, bid):
+        self.events.append(('bid', (player_pos, bid)))
+
+    def on_move(self, player_pos, card):
+        self.events.append(('move', (player_pos, card.index)))
+
+    def on_round_end(self, round_number, scores):
+        self.events.append(('round_end', (round_number,) + tuple(scores)))
+
+
+def _observation(state, round_number):
+    player_pos = state.current_player
+    return {
+        'player': player_pos,
+        'phase': state.phase,
+        'round_number': round_number,
+        'hand_size': state.hand_size,
+        'hand': state.hands[player_pos],
+        'trump': state.trump,
+        'lead_suit': CARD_SUITS[state.trick[0][1]] if state.trick else None,
+        'trick': list(state.trick),
+        'bids': list(state.bids),
+        'won_tricks': list(state.won),
+        'total_bid': state.total_bid,
+        'legal_actions': state.legal_moves(),
+    }
+
+
+def decode_events(events):
+    """
+    Replays recorded events into transitions, one for every bid and card played. Rounds that are not complete are
+    dropped.
+
+    Parameters:
+        events (iterable of tuples): The (name, values) events, from 'read_events' or 'EventRecorder'.
+
+    Returns:
+        tuple: (observations, legal_masks, actions, returns) arrays of shapes (n, OBSERVATION_SIZE),
+               (n, NUM_ACTIONS), (n,) and (n,).
+    """
+    observations, legal_masks, actions, returns = [], [], [], []
+    state = None
+    round_number = None
+    seats = []
+    for name, values in events:
+        if name == 'game_start':
+            state = GameState(values[0])
+        elif name == 'deal':
+            round_number, leader = values[0], values[1]
+            state.deal(values[2:], None, leader)
+            del observations[len(returns):], legal_masks[len(returns):], actions[len(returns):]
+            seats = []
+        elif name == 'trump':
+            state.trump_card = values[0]
+            state.trump = CARD_SUITS[values[0]]
+        elif name in ('bid', 'move'):
+            obs = _observation(state, round_number)
+            observations.append(encode_observation(obs, np.zeros(OBSERVATION_SIZE, dtype=np.float32)))
+            legal_masks.append(encode_legal_mask(obs, np.zeros(NUM_ACTIONS, dtype=np.bool_)))
+            actions.append(action_index(BID if name == 'bid' else PLAY, values[1]))
+            seats.append(values[0])
+            state.apply(values[1])
+        elif name == 'round_end':
+            scores = values[1:]
+            returns.extend(scores[seat] for seat in seats)
+            seats = []
+
+    count = len(returns)
+    return (np.array(observations[:count], dtype=np.float32).reshape(count, OBSERVATION_SIZE),
+            np.array(legal_masks[:count], dtype=np.bool_).reshape(count, NUM_ACTIONS),
+            np.array(actions[:count], dtype=np.int16), np.array(returns, dtype=np.float32))
+
+
+def decode_source(source):
+    """
+    Decodes a recorded source: the path of a game log, or a list of events from 'EventRecorder'.
+
+    Parameters:
+        source (str or list): The source to decode.
+
+    Returns:
+        tuple: The transition arrays, as returned by 'decode_events'.
+    """
+    return decode_events(read_events(source) if isinstance(source, str) else source)
+
+
+def log_files(directory, pattern="*.log"):
+    """
+    Lists the game logs of a directory.
+
+    Parameters:
+        directory (str): The directory.
+        pattern (str): The glob pattern of the log files.
+
+    Returns:
+        list of str: The sorted paths of the logs.
+    """
+    return sorted(glob.glob(os.path.join(directory, pattern)))
+
+
+_END = object()
+
+
+class ReplayPipeline:
+    """
+    Iterates over fixed-shape batches of transitions decoded from recorded games.
+
+    Sources are decoded on a pool of worker processes, and a background thread assembles batches into a queue of at
+    most 'prefetch' batches, so that decoding runs ahead of the consumer. With a shuffle buffer, every batch is drawn
+    at random from a buffer of up to 'shuffle_buffer' transitions, refilled as sources are decoded.
+
+    Attributes:
+        sources (list): The game log paths or event lists to decode.
+        batch_size (int): The number of transitions per batch.
+        processes (int): The number of decoding processes. With 0, sources are decoded on the background thread.
+        prefetch (int): The maximum number of batches waiting for the consumer.
+        shuffle_buffer (int): The size of the shuffle buffer, or 0 to keep the recorded order.
+        drop_last (bool): Whether the last, smaller batch is dropped, so that every batch has the same shape.
+    """
+
+    def __init__(self, sources, batch_size, processes=None, prefetch=4, shuffle_buffer=0, seed=None,
+                 drop_last=True):
+        """
+        Initializes the pipeline. Decoding starts when iterating.
+
+        Parameters:
+            sources (str or list): A directory of game logs, or a list of game log paths and event lists.
+            batch_size (int): The number of transitions per batch.
+            processes (int): The number of decoding processes. Defaults to the number of cores.
+            prefetch (int): The maximum number of batches waiting for the consumer.
+            shuffle_buffer (int): The size of the shuffle buffer, or 0 to keep the recorded order.
+            seed (int): The seed of the shuffle.
+            drop_last (bool): Whether the last, smaller batch is dropped.
+        """
+        self.sources = log_files(sources) if isinstance(sources, str) else list(sources)
+        self.batch_size = batch_size
+        self.processes = os.cpu_count() if processes is None else processes
+        self.prefetch = prefetch
+        self.shuffle_buffer = shuffle_buffer
+        self.rng = np.random.default_rng(seed)
+        self.drop_last = drop_last
+
+    def __iter__(self):
+        batches = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        thread = threading.Thread(target=self._produce, args=(batches, stop), daemon=True)
+        thread.start()
+        try:
+            while True:
+                batch = batches.get()
+                if batch is _END:
+                    break
+                if isinstance(batch, BaseException):
+                    raise batch
+                yield batch
+        finally:
+            stop.set()
+            # Unblock the producer if it waits for room in the queue.
+            while thread.is_alive():
+                try:
+                    batches.get(timeout=0.01)
+                except queue.Empty:
+                    pass
+            thread.join()
+
+    def _decoded(self, stop):
+        if self.processes == 0:
+            for source in self.sources:
+                yield decode_source(source)
+            return
+        with mp.Pool(self.processes) as pool:
+            for arrays in pool.imap(decode_source, self.sources):
+                if stop.is_set():
+                    return
+                yield arrays
+
+    def _produce(self, batches, stop):
+        try:
+            # Decoded games are copied into a single preallocated buffer, which batches are drawn from in place.
+            capacity = self.batch_size + self.shuffle_buffer
+            buffer = (np.empty((capacity, OBSERVATION_SIZE), dtype=np.float32),
+                      np.empty((capacity, NUM_ACTIONS), dtype=np.bool_),
+                      np.empty(capacity, dtype=np.int16), np.empty(capacity, dtype=np.float32))
+            size = 0
+            for arrays in self._decoded(stop):
+                start, count = 0, len(arrays[2])
+                while start < count:
+                    copied = min(count - start, capacity - size)
+                    for target, array in zip(buffer, arrays):
+                        target[size:size + copied] = array[start:start + copied]
+                    size += copied
+                    start += copied
+                    if size == capacity:
+                        size = self._emit(batches, buffer, size, stop)
+                        if stop.is_set():
+                            return
+            while size >= self.batch_size:
+                size = self._emit(batches, buffer, size, stop)
+                if stop.is_set():
+                    return
+            if size and not self.drop_last:
+                batches.put(tuple(array[:size].copy() for array in buffer))
+            batches.put(_END)
+        except BaseException as error:
+            batches.put(error)
+
+    def _emit(self, batches, buffer, size, stop):
+        # Returns the number of transitions left in the buffer, in its first rows.
+        rest = size - self.batch_size
+        if self.shuffle_buffer:
+            chosen = self.rng.choice(size, self.batch_size, replace=False)
+            batch = tuple(array[chosen] for array in buffer)
+            # The rows of the chosen transitions take those of the last rows that were not chosen.
+            holes = chosen[chosen < rest]
+            moved = np.setdiff1d(np.arange(rest, size), chosen, assume_unique=True)
+            for array in buffer:
+                array[holes] = array[moved]
+        else:
+            batch = tuple(array[:self.batch_size].copy() for array in buffer)
+            for array in buffer:
+                array[:rest] = array[self.batch_size:size]
+        while not stop.is_set():
+            try:
+                batches.put(batch, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        return rest
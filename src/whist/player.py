@@ -1,4 +1,4 @@
-from .utils import has_suit
+from .masks import hand_mask, legal_moves, CARD_SUITS
 
 
 class Player:
@@ -8,6 +8,8 @@ class Player:
     Attributes:
         name (string): The name of the player.
         cards (list of Card): The list of cards being held by the player.
+        game (Game): The game the player is seated at, set by 'Game.__init__'. None until then.
+        position (int): The position of the player in the game, set by 'Game.__init__'. None until then.
     """
 
     def __init__(self, name):
@@ -19,6 +21,8 @@ class Player:
         """
         self.name = name
         self.cards = []
+        self.game = None
+        self.position = None
 
     def make_bid(self, is_last, total_bid):
         """
@@ -48,6 +52,26 @@ class Player:
         """
         raise NotImplementedError
 
+    async def make_bid_async(self, is_last, total_bid):
+        """
+        Asynchronous version of 'make_bid', awaited by 'Game.play_round_async'. Calls 'make_bid' by default;
+        players waiting for batched inference or remote input override it.
+
+        Returns:
+            int: The bid made by the player.
+        """
+        return self.make_bid(is_last, total_bid)
+
+    async def play_card_async(self, is_first, lead_suit, trump):
+        """
+        Asynchronous version of 'play_card', awaited by 'Game.play_round_async'. Calls 'play_card' by default;
+        players waiting for batched inference or remote input override it.
+
+        Returns:
+            Card: The card played by the player.
+        """
+        return self.play_card(is_first, lead_suit, trump)
+
 
 class HumanPlayer(Player):
 
@@ -90,6 +114,10 @@ class HumanPlayer(Player):
         print("Your cards are: ")
         for i, card in enumerate(self.cards):
             print(f"{i + 1}. {card}")
+        # A player seated at a dealt game reads the hand mask the game keeps; otherwise it is built from the cards.
+        hand = self.game.hands[self.position] if self.game is not None and self.game.hands is not None \
+            else hand_mask(self.cards)
+        legal = legal_moves(hand, None if is_first else lead_suit, trump)
 
         while True:
             try:
@@ -100,13 +128,12 @@ class HumanPlayer(Player):
 
                 selected_card = self.cards[card_number - 1]
 
-                if not is_first and has_suit(self, lead_suit):
-                    if selected_card.suit != lead_suit:
+                if selected_card.index not in legal:
+                    if CARD_SUITS[legal[0]] == lead_suit:
                         print(f"You must play a card of the lead suit, {lead_suit}.")
-                        continue
-
-                elif not is_first and trump is not None and has_suit(self, trump) and selected_card.suit != trump:
-                    print(f"You don't have the lead suit but have a trump suit card. You must play a trump suit, {trump}.")
+                    else:
+                        print(f"You don't have the lead suit but have a trump suit card. You must play a trump suit, "
+                              f"{trump}.")
                     continue
 
                 return self.cards.pop(card_number - 1)
@@ -0,0 +1,212 @@
+"""
+Timing instrumentation of games.
+
+A 'Game' created with a profiler reports the duration of every phase of a round (dealing, bidding, every trick and
+scoring) and the latency of every decision of its players, timed around the call of the player method only.
+'GameProfiler' aggregates them into counters and log-scale histograms; any object with the same 'record_phase' and
+'record_decision' methods can be used instead.
+
+Bidding and trick phases include the decisions made during them, so the engine overhead of a phase is its total time
+minus the decision time of the players ('GameProfiler.summary' reports both):
+
+    profiler = GameProfiler()
+    game = Game(players, verbose=False, profiler=profiler)
+    game.play_game()
+    print(profiler.report())
+"""
+
+PHASES = ('deal', 'bid', 'trick', 'score')
+
+# Histogram buckets: bucket 0 holds durations under 1 us, bucket i those from 2 ** (i - 1) us to 2 ** i us, and the
+# last bucket everything from about 17 s up.
+NUM_BUCKETS = 26
+
+
+def bucket(duration_ns):
+    """
+    Finds the histogram bucket of a duration.
+
+    Parameters:
+        duration_ns (int): The duration in nanoseconds.
+
+    Returns:
+        int: The index of the bucket.
+    """
+    return min((duration_ns // 1000).bit_length(), NUM_BUCKETS - 1)
+
+
+class Timing:
+    """
+    Aggregated durations of one kind of event.
+
+    Attributes:
+        count (int): The number of events.
+        total_ns (int): The sum of the durations.
+        max_ns (int): The longest duration.
+        histogram (list of int): The number of events in every bucket (see 'bucket').
+    """
+
+    __slots__ = ('count', 'total_ns', 'max_ns', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * NUM_BUCKETS
+
+    def add(self, duration_ns):
+        """
+        Records a duration.
+
+        Parameters:
+            duration_ns (int): The duration in nanoseconds.
+        """
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.histogram[bucket(duration_ns)] += 1
+
+    def merge(self, other):
+        """
+        Adds the durations of another Timing to this one.
+
+        Parameters:
+            other (Timing): The other timing.
+        """
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def percentile(self, q):
+        """
+        Estimates a percentile from the histogram, as the upper bound of the bucket it falls in.
+
+        Parameters:
+            q (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The estimated duration in microseconds, or 0 if nothing was recorded.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank and count:
+                return min(float(1 << i), self.max_ns / 1000)
+        return self.max_ns / 1000
+
+    def summary(self):
+        """
+        Summarizes the durations.
+
+        Returns:
+            dict: 'count', 'total_ms', 'mean_us', 'p50_us', 'p99_us' and 'max_us'.
+        """
+        return {
+            'count': self.count,
+            'total_ms': self.total_ns / 1e6,
+            'mean_us': self.total_ns / self.count / 1000 if self.count else 0.0,
+            'p50_us': self.percentile(50),
+            'p99_us': self.percentile(99),
+            'max_us': self.max_ns / 1000,
+        }
+
+
+class GameProfiler:
+    """
+    Collects phase durations and decision latencies from one or more games.
+
+    Attributes:
+        phases (dict): The Timing of every phase in PHASES.
+        decisions (dict): The Timing of the decisions of every player position, bids and cards together.
+    """
+
+    def __init__(self):
+        self.phases = {phase: Timing() for phase in PHASES}
+        self.decisions = {}
+
+    def record_phase(self, phase, duration_ns):
+        """
+        Records the duration of a phase; called by 'Game'.
+
+        Parameters:
+            phase (str): One of PHASES.
+            duration_ns (int): The duration in nanoseconds.
+        """
+        self.phases[phase].add(duration_ns)
+
+    def record_decision(self, player_pos, duration_ns):
+        """
+        Records the time a player took to make a bid or play a card; called by 'Game'.
+
+        Parameters:
+            player_pos (int): The position of the player.
+            duration_ns (int): The duration in nanoseconds.
+        """
+        timing = self.decisions.get(player_pos)
+        if timing is None:
+            timing = self.decisions[player_pos] = Timing()
+        timing.add(duration_ns)
+
+    def merge(self, other):
+        """
+        Adds the timings of another profiler, e.g. one returned by a worker process, to this one.
+
+        Parameters:
+            other (GameProfiler): The other profiler.
+        """
+        for phase, timing in other.phases.items():
+            self.phases[phase].merge(timing)
+        for player_pos, timing in other.decisions.items():
+            self.decisions.setdefault(player_pos, Timing()).merge(timing)
+
+    def summary(self):
+        """
+        Summarizes the timings.
+
+        Returns:
+            dict: 'phases' and 'decisions' map every phase and player position to its 'Timing.summary', and
+                  'engine_ms' and 'decision_ms' split the total time of the phases between the engine and the
+                  decisions of the players.
+        """
+        total_ns = sum(timing.total_ns for timing in self.phases.values())
+        decision_ns = sum(timing.total_ns for timing in self.decisions.values())
+        return {
+            'phases': {phase: timing.summary() for phase, timing in self.phases.items()},
+            'decisions': {pos: timing.summary() for pos, timing in sorted(self.decisions.items())},
+            'engine_ms': (total_ns - decision_ns) / 1e6,
+            'decision_ms': decision_ns / 1e6,
+        }
+
+    def histograms(self):
+        """
+        Exports the histograms, e.g. to plot them or save them as JSON.
+
+        Returns:
+            dict: The bucket upper bounds in microseconds under 'bounds_us', and the bucket counts of every phase and
+                  of the decisions of every player position (as 'player <position>').
+        """
+        histograms = {'bounds_us': [1 << i for i in range(NUM_BUCKETS)]}
+        histograms.update((phase, list(timing.histogram)) for phase, timing in self.phases.items())
+        histograms.update((f"player {pos}", list(timing.histogram)) for pos, timing in sorted(self.decisions.items()))
+        return histograms
+
+    def report(self):
+        """
+        Formats the summary as a table.
+
+        Returns:
+            str: The report.
+        """
+        summary = self.summary()
+        lines = [f"{'':<10}{'count':>9}{'total ms':>12}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+        rows = list(summary['phases'].items()) + [(f"player {pos}", s) for pos, s in summary['decisions'].items()]
+        for name, s in rows:
+            lines.append(f"{name:<10}{s['count']:>9}{s['total_ms']:>12.2f}{s['mean_us']:>10.1f}{s['p50_us']:>10.0f}"
+                         f"{s['p99_us']:>10.0f}{s['max_us']:>10.0f}")
+        lines.append(f"engine {summary['engine_ms']:.2f} ms, decisions {summary['decision_ms']:.2f} ms")
+        return "\n".join(lines)
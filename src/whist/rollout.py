@@ -0,0 +1,316 @@
+import multiprocessing as mp
+import os
+import random
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .env import WhistEnv, OBSERVATION_SIZE, NUM_ACTIONS, action_index, encode_observation, encode_legal_mask
+from .schedule import round_schedule
+
+
+def random_policy(observation, rng):
+    """
+    Self-play policy that picks a uniformly random legal action.
+
+    Parameters:
+        observation (dict): The observation of the player to act, as returned by 'WhistEnv'.
+        rng (random.Random): The random generator of the worker.
+
+    Returns:
+        int: The chosen action.
+    """
+    return rng.choice(observation['legal_actions'])
+
+
+class RolloutBuffer:
+    """
+    A fixed-capacity ring buffer of transitions stored in shared memory, so that worker processes can write their
+    experience directly into arrays the learner reads, instead of pickling it back through queues.
+
+    Each transition is made of an encoded observation, a legal-action mask, the action index in the flat action space
+    and the reward. Once the buffer is full the oldest transitions are overwritten.
+
+    Attributes:
+        capacity (int): The maximum number of transitions held by the buffer.
+        observations (numpy.ndarray): Array of shape (capacity, OBSERVATION_SIZE).
+        legal_masks (numpy.ndarray): Boolean array of shape (capacity, NUM_ACTIONS).
+        actions (numpy.ndarray): Array of shape (capacity,).
+        rewards (numpy.ndarray): Array of shape (capacity,).
+    """
+
+    _fields = (
+        ('observations', np.float32, (OBSERVATION_SIZE,)),
+        ('legal_masks', np.bool_, (NUM_ACTIONS,)),
+        ('actions', np.int16, ()),
+        ('rewards', np.float32, ()),
+    )
+
+    def __init__(self, capacity, name=None, lock=None):
+        """
+        Creates a new shared buffer, or attaches to an existing one when a name is given.
+
+        Parameters:
+            capacity (int): The maximum number of transitions held by the buffer.
+            name (str): The name of an existing shared memory block to attach to.
+            lock (multiprocessing.Lock): The lock guarding writes. A new one is created if None.
+        """
+        self.capacity = capacity
+        self.lock = lock if lock is not None else mp.Lock()
+        sizes = [capacity * int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+                 for _, dtype, shape in self._fields]
+        total_size = 8 + sum(sizes)
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=total_size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self._counter = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf, offset=0)
+        if self.owner:
+            self._counter[0] = 0
+        offset = 8
+        for (field, dtype, shape), size in zip(self._fields, sizes):
+            setattr(self, field, np.ndarray((capacity,) + shape, dtype=dtype, buffer=self.shm.buf, offset=offset))
+            offset += size
+
+    @property
+    def name(self):
+        """
+        str: The name of the shared memory block, used by worker processes to attach to the buffer.
+        """
+        return self.shm.name
+
+    @property
+    def total_written(self):
+        """
+        int: The number of transitions written since the buffer was created, including overwritten ones.
+        """
+        return int(self._counter[0])
+
+    def __len__(self):
+        return min(self.total_written, self.capacity)
+
+    def reserve(self, count):
+        """
+        Reserves the positions of transitions written later with 'write', e.g. by other processes in any order.
+
+        Parameters:
+            count (int): The number of transitions.
+
+        Returns:
+            int: The position of the first of them, counted like 'total_written'.
+        """
+        with self.lock:
+            start = int(self._counter[0])
+            self._counter[0] += count
+            return start
+
+    def write(self, observations, legal_masks, actions, rewards, start=None):
+        """
+        Appends a batch of transitions, wrapping around and overwriting the oldest ones when the buffer is full.
+
+        Parameters:
+            observations (numpy.ndarray): Array of shape (n, OBSERVATION_SIZE).
+            legal_masks (numpy.ndarray): Array of shape (n, NUM_ACTIONS).
+            actions (numpy.ndarray): Array of shape (n,).
+            rewards (numpy.ndarray): Array of shape (n,).
+            start (int): The position of the first transition, reserved with 'reserve', or None to append them.
+        """
+        count = len(actions)
+        if count == 0:
+            return
+        if count > self.capacity:
+            observations, legal_masks = observations[-self.capacity:], legal_masks[-self.capacity:]
+            actions, rewards = actions[-self.capacity:], rewards[-self.capacity:]
+            if start is not None:
+                start += count - self.capacity
+            count = self.capacity
+        with self.lock:
+            if start is None:
+                start = int(self._counter[0])
+                self._counter[0] += count
+            slots = (start + np.arange(count)) % self.capacity
+            self.observations[slots] = observations
+            self.legal_masks[slots] = legal_masks
+            self.actions[slots] = actions
+            self.rewards[slots] = rewards
+
+    def sample(self, batch_size, rng=None):
+        """
+        Samples a batch of transitions uniformly from the buffer.
+
+        Parameters:
+            batch_size (int): The number of transitions to sample.
+            rng (numpy.random.Generator): The random generator to use. A fresh one is used if None.
+
+        Returns:
+            tuple: (observations, legal_masks, actions, rewards) arrays holding copies of the sampled transitions.
+
+        Raises:
+            RuntimeError: If the buffer is empty.
+        """
+        size = len(self)
+        if size == 0:
+            raise RuntimeError("Cannot sample from an empty buffer")
+        rng = np.random.default_rng(rng)
+        with self.lock:
+            idx = rng.integers(0, size, size=batch_size)
+            return self.observations[idx], self.legal_masks[idx], self.actions[idx], self.rewards[idx]
+
+    def close(self):
+        """
+        Detaches from the shared memory block, and frees it if this buffer created it.
+        """
+        for field, _, _ in self._fields:
+            setattr(self, field, None)
+        self._counter = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def play_episode(env, policy, rng):
+    """
+    Plays one self-play episode and collects the transitions of every seat. The reward of each transition is the
+    score the acting player obtained at the end of the round the transition belongs to, as given by 'calculate_score'.
+
+    Parameters:
+        env (WhistEnv): The environment to play in.
+        policy (callable): The policy used by every seat, called with the observation and the random generator.
+        rng (random.Random): The random generator passed to the policy.
+
+    Returns:
+        tuple: (observations, legal_masks, actions, rewards) arrays for every transition of the episode.
+    """
+    observations, legal_masks, actions, rewards = [], [], [], []
+    round_start = 0
+    seats = []
+    obs = env.reset()
+    done = False
+    while not done:
+        action = policy(obs, rng)
+        observations.append(encode_observation(obs))
+        legal_masks.append(encode_legal_mask(obs))
+        actions.append(action_index(obs['phase'], action))
+        seats.append(obs['player'])
+        obs, round_scores, done, info = env.step(action)
+        if 'round_scores' in info:
+            for i in range(round_start, len(seats)):
+                rewards.append(round_scores[seats[i]])
+            round_start = len(seats)
+
+    return (np.asarray(observations, dtype=np.float32), np.asarray(legal_masks, dtype=np.bool_),
+            np.asarray(actions, dtype=np.int16), np.asarray(rewards, dtype=np.float32))
+
+
+_worker_buffer = None
+
+
+def _init_worker(name, capacity, lock):
+    global _worker_buffer
+    _worker_buffer = RolloutBuffer(capacity, name=name, lock=lock)
+
+
+def _run_task(task):
+    seed, num_episodes, num_players, rounds, policy, start, end = task
+    rng = random.Random(seed)
+    env = WhistEnv(num_players, rounds=rounds, rng=rng)
+    written = 0
+    for i in range(num_episodes):
+        batch = play_episode(env, policy, rng)
+        # Transitions are written at the positions reserved for the task, whatever order the tasks finish in. Those
+        # overwritten by a later task of the run are skipped, as the later task may have finished first.
+        skip = max(0, end - _worker_buffer.capacity - start - written)
+        if skip < len(batch[2]):
+            _worker_buffer.write(*(array[skip:] for array in batch), start=start + written + skip)
+        written += len(batch[2])
+    return written
+
+
+def episode_length(num_players, rounds=None):
+    """
+    Computes the number of transitions of an episode: every player bids once and plays every card of every round.
+
+    Parameters:
+        num_players (int): The number of players in every episode.
+        rounds (list of int): The round numbers played in every episode. Defaults to every round of a game.
+
+    Returns:
+        int: The number of transitions.
+    """
+    schedule = round_schedule(num_players)
+    rounds = rounds if rounds is not None else schedule.rounds()
+    return sum(num_players * (1 + schedule.hand_size(round_number)) for round_number in rounds)
+
+
+class RolloutPool:
+    """
+    Runs self-play episodes on a pool of worker processes. Every worker plays its own 'WhistEnv' games, built on
+    'Game' and 'Deck', with an independent random generator derived from the pool seed, and writes the transitions
+    straight into a shared 'RolloutBuffer'.
+
+    Attributes:
+        buffer (RolloutBuffer): The shared buffer receiving the transitions.
+        num_players (int): The number of players in every episode.
+        processes (int): The number of worker processes.
+    """
+
+    def __init__(self, num_players, capacity, processes=None, seed=None, rounds=None, policy=random_policy):
+        """
+        Creates the shared buffer and starts the worker processes.
+
+        Parameters:
+            num_players (int): The number of players in every episode.
+            capacity (int): The capacity of the shared buffer, in transitions.
+            processes (int): The number of worker processes. Defaults to the number of cores.
+            seed (int): The root seed. Runs with the same seed and tasks fill the buffer with the same transitions, in the same order.
+            rounds (list of int): The round numbers played in every episode. Defaults to every round of a game.
+            policy (callable): The self-play policy, which must be picklable. Defaults to 'random_policy'.
+        """
+        self.num_players = num_players
+        self.rounds = rounds
+        self.policy = policy
+        self.processes = processes or os.cpu_count()
+        self.seeds = np.random.SeedSequence(seed)
+        self.buffer = RolloutBuffer(capacity)
+        self.pool = mp.Pool(self.processes, initializer=_init_worker,
+                            initargs=(self.buffer.name, capacity, self.buffer.lock))
+
+    def run(self, num_episodes, episodes_per_task=1):
+        """
+        Plays episodes on the workers and waits for them to finish.
+
+        Parameters:
+            num_episodes (int): The number of episodes to play.
+            episodes_per_task (int): The number of episodes a worker plays per task, and per random seed.
+
+        Returns:
+            int: The number of transitions written to the buffer.
+        """
+        length = episode_length(self.num_players, self.rounds)
+        start = self.buffer.reserve(num_episodes * length)
+        end = start + num_episodes * length
+        tasks = []
+        remaining = num_episodes
+        while remaining > 0:
+            count = min(episodes_per_task, remaining)
+            seed = int(self.seeds.spawn(1)[0].generate_state(1)[0])
+            tasks.append((seed, count, self.num_players, self.rounds, self.policy, start, end))
+            start += count * length
+            remaining -= count
+        return sum(self.pool.imap_unordered(_run_task, tasks))
+
+    def close(self):
+        """
+        Stops the worker processes and frees the shared buffer.
+        """
+        self.pool.close()
+        self.pool.join()
+        self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
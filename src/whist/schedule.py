@@ -0,0 +1,116 @@
+"""
+Round schedules.
+
+A game with X players has 3 * X + 12 rounds: X rounds of 1 card, rounds of 2 to 7 cards, X rounds of 8 cards, rounds
+of 7 to 2 cards and X rounds of 1 card. Rounds of fewer than 8 cards have a trump. 'round_schedule' builds the
+schedule of a player count once and shares it, so the hand size, the trump flag and the number of tricks left in the
+game are tuple lookups indexed by the round number:
+
+    schedule = round_schedule(4)
+    schedule.hand_sizes[6]              # 3
+    schedule.tricks_remaining(6, 1)     # tricks left in the game after the first trick of round 6
+"""
+from functools import lru_cache
+
+# Hand size of the middle rounds, played X times
+MAX_HAND_SIZE = 8
+
+
+class RoundSchedule:
+    """
+    The round structure of a game. The tables are indexed by round number, starting at 1; index 0 holds a 0 hand size
+    so that 'tricks_before' doubles as a prefix sum.
+
+    Attributes:
+        num_players (int): The number of players.
+        num_rounds (int): The number of rounds of the game.
+        hand_sizes (tuple of int): The hand size of every round.
+        has_trump (tuple of bool): Whether every round has a trump, i.e. has fewer than 8 cards.
+        tricks_before (tuple of int): The number of tricks played before every round; index num_rounds + 1 holds the
+                                      total.
+        total_tricks (int): The number of tricks of the game.
+    """
+
+    __slots__ = ('num_players', 'num_rounds', 'hand_sizes', 'has_trump', 'tricks_before', 'total_tricks')
+
+    def __init__(self, num_players):
+        """
+        Parameters:
+            num_players (int): The number of players.
+        """
+        ones = [1] * num_players
+        sizes = ones + list(range(2, MAX_HAND_SIZE)) + [MAX_HAND_SIZE] * num_players + \
+            list(range(MAX_HAND_SIZE - 1, 1, -1)) + ones
+        self.num_players = num_players
+        self.num_rounds = len(sizes)
+        self.hand_sizes = (0, *sizes)
+        self.has_trump = (False, *(size < MAX_HAND_SIZE for size in sizes))
+        tricks_before = [0]
+        for size in self.hand_sizes:
+            tricks_before.append(tricks_before[-1] + size)
+        self.tricks_before = tuple(tricks_before)
+        self.total_tricks = self.tricks_before[-1]
+
+    def rounds(self):
+        """
+        Returns:
+            range: The round numbers of the game, from 1 to num_rounds.
+        """
+        return range(1, self.num_rounds + 1)
+
+    def hand_size(self, round_number):
+        """
+        Looks up the hand size of a round, checking the round number.
+
+        Parameters:
+            round_number (int): The round number.
+
+        Returns:
+            int: The hand size of the round.
+
+        Raises:
+            ValueError: If the round number is not between 1 and num_rounds.
+        """
+        if not 1 <= round_number <= self.num_rounds:
+            raise ValueError("Invalid round number")
+        return self.hand_sizes[round_number]
+
+    def tricks_remaining(self, round_number, tricks_played=0):
+        """
+        Counts the tricks left in the game, including those of the current round.
+
+        Parameters:
+            round_number (int): The current round number.
+            tricks_played (int): The number of tricks already played in the current round.
+
+        Returns:
+            int: The number of tricks still to be played.
+        """
+        return self.total_tricks - self.tricks_before[round_number] - tricks_played
+
+    def cards_remaining(self, round_number, tricks_played=0):
+        """
+        Counts the cards left to be played in the game, including those of the current round.
+
+        Parameters:
+            round_number (int): The current round number.
+            tricks_played (int): The number of tricks already played in the current round.
+
+        Returns:
+            int: The number of cards still to be played by all the players.
+        """
+        return self.num_players * self.tricks_remaining(round_number, tricks_played)
+
+
+@lru_cache(maxsize=None)
+def round_schedule(num_players):
+    """
+    Returns the shared schedule of a player count, building it on the first call.
+
+    Parameters:
+        num_players (int): The number of players.
+
+    Returns:
+        RoundSchedule: The schedule of the game.
+    """
+    return RoundSchedule(num_players)
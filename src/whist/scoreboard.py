@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Scoreboard:
     """
     A class to manage and track scores, bids, and won tricks for each player throughout the game.
@@ -87,3 +90,173 @@ class Scoreboard:
         if player in self.scores and round_number in self.scores[player]['rounds']:
             return self.scores[player]['rounds'][round_number]
         return None
+
+
+class ColumnarScoreboard:
+    """
+    An append-only Scoreboard for long evaluation runs, storing the bids, won tricks and scores of many games in
+    preallocated NumPy arrays indexed by (game, round, seat) instead of nested dicts.
+
+    It is API-compatible with Scoreboard for 'add_player', 'update_score', 'get_score' and 'get_round_details', so
+    it can be given to 'Game'. Players are seated in order in the current game and adding a seated player again does
+    nothing; once a round of a full game is recorded, adding a player starts the next game. Queries about a player
+    refer to the current game. The players of a game are forgotten when
+    the next one starts, so that only the arrays grow with the number of games; they grow by doubling when more games
+    are played than preallocated.
+
+    Attributes:
+        num_seats (int): The number of players of every game.
+        num_rounds (int): The maximum number of rounds of a game.
+        num_games (int): The number of games started so far.
+        bids (numpy.ndarray): The bids, of shape (capacity, num_rounds, num_seats), or -1 for rounds not played.
+        won_tricks (numpy.ndarray): The won tricks, of the same shape.
+        round_scores (numpy.ndarray): The round scores, of the same shape.
+        cumulative_scores (numpy.ndarray): The total score after every round, of the same shape.
+        totals (numpy.ndarray): The total score of every seat, of shape (capacity, num_seats).
+    """
+
+    def __init__(self, num_seats, num_rounds=30, capacity=1024):
+        """
+        Initializes an empty scoreboard.
+
+        Args:
+            num_seats (int): The number of players of every game.
+            num_rounds (int): The maximum number of rounds of a game. Defaults to the rounds of a 6 player game.
+            capacity (int): The number of games to preallocate.
+        """
+        self.num_seats = num_seats
+        self.num_rounds = num_rounds
+        self.num_games = 0
+        self._seats = {}
+        self._next_seat = num_seats
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        shape = (capacity, self.num_rounds, self.num_seats)
+        old = getattr(self, 'bids', None)
+        arrays = {
+            'bids': np.full(shape, -1, dtype=np.int8),
+            'won_tricks': np.zeros(shape, dtype=np.int8),
+            'round_scores': np.zeros(shape, dtype=np.int16),
+            'cumulative_scores': np.zeros(shape, dtype=np.int32),
+            'totals': np.zeros((capacity, self.num_seats), dtype=np.int32),
+        }
+        for name, array in arrays.items():
+            if old is not None:
+                previous = getattr(self, name)
+                array[:len(previous)] = previous
+            setattr(self, name, array)
+
+    def new_game(self):
+        """
+        Starts a new game, in which the next added players are seated.
+
+        Returns:
+            int: The index of the new game.
+        """
+        if self.num_games == len(self.totals):
+            self._allocate(2 * len(self.totals))
+        self.num_games += 1
+        # Only the players of the current game are kept: those of finished games are only needed in the arrays.
+        self._seats.clear()
+        self._next_seat = 0
+        return self.num_games - 1
+
+    def add_player(self, player):
+        """
+        Seats a player in the current game, starting a new game if the current one is full and already played.
+        Players already seated are left as they are.
+
+        Args:
+            player (Player): The player object to add to the scoreboard.
+
+        Raises:
+            ValueError: If the current game is full and none of its rounds has been recorded yet, i.e. the game would
+                        seat more than 'num_seats' players.
+        """
+        if player in self._seats:
+            return
+        if self._next_seat == self.num_seats:
+            if self.num_games and (self.bids[self.num_games - 1] < 0).all():
+                raise ValueError(f"A game can't seat more than {self.num_seats} players")
+            self.new_game()
+        self._seats[player] = (self.num_games - 1, self._next_seat)
+        self._next_seat += 1
+
+    def update_score(self, player, round_number, bid, won_tricks, round_score):
+        """
+        Records the results of a single round for a specified player, in O(1).
+
+        Args:
+            player (Player): The player for whom the score is being updated.
+            round_number (int): The round number being updated.
+            bid (int): The bid made by the player for this round.
+            won_tricks (int): The number of tricks won by the player in this round.
+            round_score (int): The score achieved by the player in this round.
+        """
+        if player not in self._seats:
+            self.add_player(player)
+        game, seat = self._seats[player]
+        r = round_number - 1
+        self.bids[game, r, seat] = bid
+        self.won_tricks[game, r, seat] = won_tricks
+        self.round_scores[game, r, seat] = round_score
+        self.totals[game, seat] += round_score
+        self.cumulative_scores[game, r, seat] = self.totals[game, seat]
+
+    def get_score(self, player):
+        """
+        Retrieves the total cumulative score for a specified player, in O(1).
+
+        Args:
+            player (Player): The player whose total score is requested.
+
+        Returns:
+            int: The total score of the player if they are seated in the current game, otherwise None.
+        """
+        if player not in self._seats:
+            return None
+        game, seat = self._seats[player]
+        return int(self.totals[game, seat])
+
+    def get_round_details(self, player, round_number):
+        """
+        Retrieves the details of a specific round for a specified player.
+
+        Args:
+            player (Player): The player whose round details are requested.
+            round_number (int): The specific round number for which details are requested.
+
+        Returns:
+            dict: A dictionary containing bid, won tricks, score, and cumulative score for the round if available.
+                  Returns None if the player or round data does not exist.
+        """
+        if player not in self._seats or not 1 <= round_number <= self.num_rounds:
+            return None
+        game, seat = self._seats[player]
+        r = round_number - 1
+        if self.bids[game, r, seat] < 0:
+            return None
+        return {
+            'bid': int(self.bids[game, r, seat]),
+            'won_tricks': int(self.won_tricks[game, r, seat]),
+            'score': int(self.round_scores[game, r, seat]),
+            'cumulative_score': int(self.cumulative_scores[game, r, seat]),
+        }
+
+    def leaderboard(self):
+        """
+        Ranks the seats over every game played so far.
+
+        Returns:
+            tuple: (seats, mean_scores, win_rates), where seats lists the seats from the best mean total score to the
+                   worst, and mean_scores and win_rates hold, for every seat in that order, the mean total score and
+                   the share of games it finished with the highest score, ties included.
+        """
+        if not self.num_games:
+            return np.arange(self.num_seats), np.zeros(self.num_seats), np.zeros(self.num_seats)
+        totals = self.totals[:self.num_games]
+        mean_scores = totals.mean(axis=0)
+        wins = (totals == totals.max(axis=1, keepdims=True)).mean(axis=0)
+        seats = np.argsort(-mean_scores, kind='stable')
+        return seats, mean_scores[seats], wins[seats]
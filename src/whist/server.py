@@ -0,0 +1,399 @@
+"""
+Asyncio server hosting many human-vs-bot tables in a single event loop.
+
+Every connection is a table: the human takes the first seat and bots built by 'bot_factory' fill the others. Games are
+played with 'Game.play_round_async', so a table waiting for its human costs nothing but memory. Bot decisions run in
+an executor, so a slow bot does not stall the other tables.
+
+Connections speak newline-delimited JSON. The client opens with {"name": <name>}. The server then sends events:
+
+    {"type": "deal", "round": r, "leader": p, "hand": [card index, ...]}
+    {"type": "trump", "card": i}
+    {"type": "bid", "position": p, "bid": b}
+    {"type": "move", "position": p, "card": i}
+    {"type": "round_end", "round": r, "scores": [...]}
+    {"type": "game_over", "scores": [...]}
+
+and requests, which the client answers with {"seq": s, "bid": b} or {"seq": s, "card": i}:
+
+    {"type": "bid_request", "seq": s, "legal": [bid, ...]}
+    {"type": "play_request", "seq": s, "legal": [card index, ...]}
+
+Every request has a new sequence number 's', which the answer must repeat: answers to an earlier request, e.g. one
+that timed out, are discarded. An illegal answer gets {"type": "error"} and the request is repeated until the move
+timeout; answers must be integers, so JSON booleans and floats are illegal. When the timeout expires, the seat plays
+the first legal move. Once the client disconnects, the table is aborted, so that its bots stop using the server.
+Connections beyond 'max_tables' are refused with an error message.
+"""
+import asyncio
+import json
+
+from .card import CARDS
+from .game import Game
+from .gamelog import EventSink
+from .masks import iter_indices, legal_moves
+from .player import Player
+from .schedule import round_schedule
+
+
+def legal_bids(hand_size, is_last, total_bid):
+    """
+    Lists the bids a player can make.
+
+    Parameters:
+        hand_size (int): The number of cards of the player.
+        is_last (bool): True if the player is the last one to bid.
+        total_bid (int): The sum of the bids made before.
+
+    Returns:
+        list of int: The legal bids. The last player cannot make the total equal to the hand size.
+    """
+    forbidden = hand_size - total_bid if is_last else None
+    return [bid for bid in range(hand_size + 1) if bid != forbidden]
+
+
+class RemotePlayer(Player):
+    """
+    A human seat fed by a stream connection.
+
+    Attributes:
+        reader (asyncio.StreamReader): The stream the answers are read from.
+        writer (asyncio.StreamWriter): The stream the events and requests are written to.
+        move_timeout (float): The number of seconds the player has for every decision.
+        connected (bool): False once the client disconnected.
+        timeouts (int): The number of decisions that timed out.
+        sequence (int): The sequence number of the last request.
+    """
+
+    def __init__(self, name, reader, writer, move_timeout=30.0):
+        """
+        Initializes the seat.
+
+        Parameters:
+            name (str): The name of the player.
+            reader (asyncio.StreamReader): The stream the answers are read from.
+            writer (asyncio.StreamWriter): The stream the events and requests are written to.
+            move_timeout (float): The number of seconds the player has for every decision.
+        """
+        super().__init__(name)
+        self.reader = reader
+        self.writer = writer
+        self.move_timeout = move_timeout
+        self.connected = True
+        self.timeouts = 0
+        self.sequence = 0
+
+    def send(self, message):
+        """
+        Queues a message for the client without waiting; see 'drain'.
+
+        Parameters:
+            message (dict): The message.
+        """
+        if self.connected:
+            try:
+                self.writer.write(json.dumps(message).encode() + b'\n')
+            except ConnectionError:
+                self.connected = False
+
+    async def drain(self):
+        """
+        Waits until the queued messages are flushed to the client, so that slow clients hold their own table back
+        instead of growing the buffers of the server.
+        """
+        if self.connected:
+            try:
+                await self.writer.drain()
+            except ConnectionError:
+                self.connected = False
+
+    async def _ask(self, request, key, legal):
+        self.sequence += 1
+        request['seq'] = self.sequence
+        self.send(request)
+        await self.drain()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.move_timeout
+        while self.connected:
+            try:
+                line = await asyncio.wait_for(self.reader.readline(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                self.send({'type': 'timeout'})
+                break
+            except ConnectionError:
+                line = b''
+            if not line:
+                self.connected = False
+                break
+            try:
+                message = json.loads(line)
+                if message.get('seq') != self.sequence:
+                    # A late answer to an earlier request.
+                    continue
+                answer = message[key]
+            except (ValueError, KeyError, TypeError, AttributeError):
+                answer = None
+            # 'True == 1' and '1.0 == 1': only integers are legal answers.
+            if type(answer) is int and answer in legal:
+                return answer
+            self.send({'type': 'error', 'message': f"Illegal {key}"})
+        if not self.connected:
+            raise ConnectionResetError("The client disconnected")
+        return legal[0]
+
+    def make_bid(self, is_last, total_bid):
+        raise NotImplementedError("RemotePlayer only plays in asynchronous games")
+
+    def play_card(self, is_first, lead_suit, trump):
+        raise NotImplementedError("RemotePlayer only plays in asynchronous games")
+
+    async def make_bid_async(self, is_last, total_bid):
+        legal = legal_bids(len(self.cards), is_last, total_bid)
+        return await self._ask({'type': 'bid_request', 'legal': legal}, 'bid', legal)
+
+    async def play_card_async(self, is_first, lead_suit, trump):
+        legal = list(legal_moves(self.game.hands[self.position], lead_suit, trump))
+        index = await self._ask({'type': 'play_request', 'legal': legal}, 'card', legal)
+        self.cards.remove(CARDS[index])
+        return CARDS[index]
+
+
+class ExecutorPlayer(Player):
+    """
+    Runs the decisions of a synchronous bot in an executor. The cards, game and position of the seat are those of the
+    bot, so the bot sees the game as if it were seated directly.
+
+    Attributes:
+        bot (Player): The bot making the decisions.
+        executor (concurrent.futures.Executor): The executor, or None for the default executor of the event loop.
+    """
+
+    def __init__(self, bot, executor=None):
+        """
+        Initializes the seat.
+
+        Parameters:
+            bot (Player): The bot making the decisions.
+            executor (concurrent.futures.Executor): The executor, or None for the default executor of the event loop.
+        """
+        self.bot = bot
+        self.executor = executor
+        self.name = bot.name
+
+    @property
+    def cards(self):
+        return self.bot.cards
+
+    @cards.setter
+    def cards(self, cards):
+        self.bot.cards = cards
+
+    @property
+    def game(self):
+        return self.bot.game
+
+    @game.setter
+    def game(self, game):
+        self.bot.game = game
+
+    @property
+    def position(self):
+        return self.bot.position
+
+    @position.setter
+    def position(self, position):
+        self.bot.position = position
+
+    def make_bid(self, is_last, total_bid):
+        return self.bot.make_bid(is_last, total_bid)
+
+    def play_card(self, is_first, lead_suit, trump):
+        return self.bot.play_card(is_first, lead_suit, trump)
+
+    async def make_bid_async(self, is_last, total_bid):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.bot.make_bid, is_last, total_bid)
+
+    async def play_card_async(self, is_first, lead_suit, trump):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.bot.play_card, is_first, lead_suit, trump)
+
+
+class TableSink(EventSink):
+    """
+    Forwards the events of a table to its remote players. Each player only receives their own hand.
+
+    Attributes:
+        remotes (list of RemotePlayer): The remote players of the table.
+    """
+
+    def __init__(self, remotes):
+        self.remotes = remotes
+
+    def _broadcast(self, message):
+        for remote in self.remotes:
+            remote.send(message)
+
+    def on_deal(self, round_number, leader, hands):
+        for remote in self.remotes:
+            remote.send({'type': 'deal', 'round': round_number, 'leader': leader,
+                         'hand': list(iter_indices(hands[remote.position]))})
+
+    def on_trump(self, card):
+        self._broadcast({'type': 'trump', 'card': card.index})
+
+    def on_bid(self, player_pos, bid):
+        self._broadcast({'type': 'bid', 'position': player_pos, 'bid': bid})
+
+    def on_move(self, player_pos, card):
+        self._broadcast({'type': 'move', 'position': player_pos, 'card': card.index})
+
+    def on_round_end(self, round_number, scores):
+        self._broadcast({'type': 'round_end', 'round': round_number, 'scores': list(scores)})
+
+
+class TableServer:
+    """
+    Hosts one table per connection on the running event loop.
+
+    Attributes:
+        bot_factory (callable): Called with the seat position, returns the bot Player for that seat.
+        num_players (int): The number of seats of every table.
+        rounds (list of int): The round numbers played at every table.
+        max_tables (int): The maximum number of tables played at once.
+        move_timeout (float): The number of seconds a human has for every decision.
+        executor (concurrent.futures.Executor): The executor running the bot decisions, or None for the default one.
+        active_tables (int): The number of tables being played.
+        finished_tables (int): The number of tables played to the end.
+        aborted_tables (int): The number of tables aborted because their client disconnected.
+    """
+
+    def __init__(self, bot_factory, num_players=4, rounds=None, max_tables=1000, move_timeout=30.0, executor=None):
+        """
+        Initializes the server.
+
+        Parameters:
+            bot_factory (callable): Called with the seat position, returns the bot Player for that seat.
+            num_players (int): The number of seats of every table.
+            rounds (list of int): The round numbers played at every table. Defaults to the full game.
+            max_tables (int): The maximum number of tables played at once.
+            move_timeout (float): The number of seconds a human has for every decision.
+            executor (concurrent.futures.Executor): The executor running the bot decisions.
+        """
+        self.bot_factory = bot_factory
+        self.num_players = num_players
+        self.rounds = list(rounds) if rounds is not None else list(round_schedule(num_players).rounds())
+        self.max_tables = max_tables
+        self.move_timeout = move_timeout
+        self.executor = executor
+        self.active_tables = 0
+        self.finished_tables = 0
+        self.aborted_tables = 0
+
+    async def handle_connection(self, reader, writer):
+        """
+        Plays a table for a connection, then closes it. The table is aborted as soon as the client disconnects. Used
+        as the callback of 'asyncio.start_server'.
+
+        Parameters:
+            reader (asyncio.StreamReader): The stream of the client.
+            writer (asyncio.StreamWriter): The stream to the client.
+        """
+        try:
+            if self.active_tables >= self.max_tables:
+                writer.write(json.dumps({'type': 'error', 'message': "Server full"}).encode() + b'\n')
+                return
+            self.active_tables += 1
+            try:
+                await self._play_table(reader, writer)
+            except ConnectionError:
+                self.aborted_tables += 1
+            finally:
+                self.active_tables -= 1
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _play_table(self, reader, writer):
+        try:
+            hello = json.loads(await asyncio.wait_for(reader.readline(), self.move_timeout))
+            name = str(hello['name'])
+        except (asyncio.TimeoutError, ValueError, KeyError, TypeError):
+            return
+        human = RemotePlayer(name, reader, writer, self.move_timeout)
+        players = [human] + [ExecutorPlayer(self.bot_factory(pos), self.executor)
+                             for pos in range(1, self.num_players)]
+        game = Game(players, verbose=False, sink=TableSink([human]))
+        for round_number in self.rounds:
+            await game.play_round_async(round_number)
+            await human.drain()
+            if not human.connected:
+                raise ConnectionResetError("The client disconnected")
+        human.send({'type': 'game_over', 'scores': [game.scoreboard.get_score(player) for player in players]})
+        await human.drain()
+        self.finished_tables += 1
+
+    async def start(self, host='127.0.0.1', port=0):
+        """
+        Starts listening for TCP connections.
+
+        Parameters:
+            host (str): The address to listen on.
+            port (int): The port to listen on, or 0 for any free port.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def connect_local(self):
+        """
+        Opens an in-process connection to the server, without sockets, and plays its table in a new task. Must be
+        called from the running event loop.
+
+        Returns:
+            tuple: (reader, writer, task): the client side of the connection and the task playing the table.
+        """
+        client_reader, server_reader = asyncio.StreamReader(), asyncio.StreamReader()
+        client_writer = LocalWriter(server_reader)
+        server_writer = LocalWriter(client_reader)
+        task = asyncio.get_running_loop().create_task(self.handle_connection(server_reader, server_writer))
+        return client_reader, client_writer, task
+
+
+class LocalWriter:
+    """
+    The writing half of an in-process connection: feeds the bytes written to the StreamReader of the other side.
+    Implements the part of the asyncio.StreamWriter interface used by the server.
+    """
+
+    def __init__(self, peer):
+        self.peer = peer
+        self.closed = False
+
+    def write(self, data):
+        if self.closed:
+            raise ConnectionResetError("Connection closed")
+        self.peer.feed_data(data)
+
+    async def drain(self):
+        if self.closed:
+            raise ConnectionResetError("Connection closed")
+        await asyncio.sleep(0)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.peer.feed_eof()
+
+    def is_closing(self):
+        return self.closed
+
+    async def wait_closed(self):
+        pass
@@ -0,0 +1,198 @@
+"""
+Compact, versioned snapshots of games in progress, for server restarts, table migration and search branching.
+
+A snapshot is a little-endian byte string, built with 'struct' only (no pickle, so restoring untrusted data cannot run
+code):
+
+    header          magic (4 bytes, b'WSNP'), version (uint8), number of players (uint8), lead player position
+                    (uint8), trump card index (uint8, 255 if none), mask of the players who bid this round (uint8),
+                    round number (uint8, 0 before the first round)
+    deck            number of cards (uint8), then the card indices, the top of the deck last
+    every player    name length (uint8) and UTF-8 name, number of cards (uint8) and card indices in hand order,
+                    bid (uint8), won tricks (uint8)
+    tricks          number of completed tricks of the round (uint8), then for every trick the position of its
+                    leader (uint8) and its card indices in playing order
+    current trick   number of cards (uint8), position of its leader (uint8), card indices
+    scoreboard      for every player, the number of rounds (uint8), then the round number (uint8), bid (uint8), won
+                    tricks (uint8) and score (int16) of every round
+
+A game of 4 players takes about 200 bytes after five rounds and under 600 bytes at the end, and encodes or decodes
+in well under a millisecond. The discard deck and the information state are rebuilt from the tricks. The random
+generator of the game is not part of the snapshot.
+
+A restored game continues with 'Game.play_game(resume=True)', from the next bid or card of the round in progress,
+even in the middle of a trick.
+"""
+import struct
+
+from .card import CARDS
+from .deck import BASE_DECKS, Deck
+from .game import Game
+from .masks import hand_mask
+
+MAGIC = b'WSNP'
+VERSION = 1
+NO_CARD = 255
+_HEADER = struct.Struct('<4sBBBBBB')
+_ROUND = struct.Struct('<BBBh')
+
+
+def _cards(out, cards):
+    out.append(len(cards))
+    out += bytes(card.index for card in cards)
+
+
+def snapshot(game):
+    """
+    Encodes the state of a game: the round number, the deck and trump card, the hands, bids and won tricks, the
+    tricks of the current round and the scoreboard.
+
+    Parameters:
+        game (Game): The game, between two moves.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    n = game.num_players
+    trump_card = game.deck.trump_card
+    bid_mask = sum(1 << pos for pos, bid in enumerate(game.info.bids) if bid is not None)
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, n, game.lead_player_pos,
+                                 NO_CARD if trump_card is None else trump_card.index, bid_mask,
+                                 game.round_number or 0))
+    out.append(len(game.deck.indices))
+    out += bytes(game.deck.indices)
+    for pos, player in enumerate(game.players):
+        name = player.name.encode()[:255]
+        out.append(len(name))
+        out += name
+        _cards(out, player.cards)
+        out.append(game.current_bids[pos])
+        out.append(game.current_won_tricks[pos])
+    out.append(len(game.tricks))
+    for trick in game.tricks:
+        out.append(trick[0][0])
+        out += bytes(card.index for _, card in trick)
+    # 'Game.player_moves' still holds the last trick once it is finished.
+    moves = game.player_moves if len(game.player_moves) < n else []
+    out.append(len(moves))
+    out.append(moves[0][0] if moves else game.lead_player_pos)
+    out += bytes(card.index for _, card in moves)
+
+    # Round numbers go up to 3 * 6 + 12 rounds in a 6 player game.
+    scoreboard = game.scoreboard
+    for player in game.players:
+        rounds = [(r, scoreboard.get_round_details(player, r)) for r in game.schedule.rounds()]
+        rounds = [(r, details) for r, details in rounds if details is not None]
+        out.append(len(rounds))
+        for r, details in rounds:
+            out += _ROUND.pack(r, details['bid'], details['won_tricks'], details['score'])
+    return bytes(out)
+
+
+def restore(data, players, verbose=False, rng=None, scoreboard=None, sink=None):
+    """
+    Recreates a game from a snapshot. The players take the seats in order, and receive the hands of the snapshot.
+
+    Parameters:
+        data (bytes): The snapshot.
+        players (list of Player): The players of the restored game. Their names need not match the snapshot.
+        verbose (bool): Whether the restored game prints its progress.
+        rng (random.Random): The random generator of the restored game.
+        scoreboard (Scoreboard or ColumnarScoreboard): The empty scoreboard to restore the scores into. A new
+                                                       Scoreboard if None.
+        sink (EventSink): The event sink of the restored game.
+
+    Returns:
+        Game: The restored game, ready to play the next move, e.g. with 'Game.play_game(resume=True)'.
+
+    Raises:
+        ValueError: If the data is not a valid snapshot of a supported version, or if the number of players does not
+                    match.
+    """
+    try:
+        magic, version, n, lead_player_pos, trump_index, bid_mask, round_number = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a game snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        if len(players) != n:
+            raise ValueError("The number of players does not match the snapshot")
+        trump_card = CARDS[trump_index] if trump_index != NO_CARD else None
+        round_number = round_number or None
+        pos = _HEADER.size
+
+        game = Game(players, verbose=verbose, rng=rng, scoreboard=scoreboard, sink=sink)
+        if round_number is not None and round_number > game.schedule.num_rounds:
+            raise ValueError("Invalid game snapshot")
+        count = data[pos]
+        deck = Deck(n, verbose=verbose, info=game.info, indices=BASE_DECKS[n])
+        deck.indices = list(data[pos + 1:pos + 1 + count])
+        pos += 1 + count
+
+        hands = []
+        for player_pos, player in enumerate(players):
+            pos += 1 + data[pos]
+            count = data[pos]
+            hands.append([CARDS[i] for i in data[pos + 1:pos + 1 + count]])
+            pos += 1 + count
+            game.current_bids[player_pos] = data[pos]
+            game.current_won_tricks[player_pos] = data[pos + 1]
+            pos += 2
+
+        tricks = []
+        num_tricks = data[pos]
+        pos += 1
+        for i in range(num_tricks + 1):
+            count = n
+            if i == num_tricks:
+                count = data[pos]
+                pos += 1
+            leader = data[pos]
+            tricks.append([((leader + j) % n, CARDS[index])
+                           for j, index in enumerate(data[pos + 1:pos + 1 + count])])
+            pos += 1 + count
+        current_trick = tricks.pop()
+
+        rounds = []
+        for player in players:
+            count = data[pos]
+            pos += 1
+            for _ in range(count):
+                rounds.append((player,) + _ROUND.unpack_from(data, pos))
+                pos += _ROUND.size
+        if pos != len(data) or len(current_trick) > n:
+            raise ValueError("Invalid game snapshot")
+    except (struct.error, IndexError):
+        raise ValueError("Invalid game snapshot")
+
+    # Rebuild the information state by replaying the round.
+    info = game.info
+    info.start_round(tricks[0][0][0] if tricks else current_trick[0][0] if current_trick else lead_player_pos)
+    if trump_card is not None:
+        deck.trump_card = trump_card
+        deck.trump = trump_card.suit
+        info.set_trump(trump_card)
+    for player_pos in range(n):
+        if bid_mask >> player_pos & 1:
+            info.set_bid(player_pos, game.current_bids[player_pos])
+    for trick in tricks:
+        for player_pos, card in trick:
+            info.play_card(player_pos, card)
+        game.player_moves[:] = trick
+        game.trick_mask = hand_mask(card for _, card in trick)
+        game.finish_trick(deck.trump)
+    if current_trick:
+        for player_pos, card in current_trick:
+            info.play_card(player_pos, card)
+        game.player_moves[:] = current_trick
+        game.trick_mask = hand_mask(card for _, card in current_trick)
+    game.deck = deck
+    game.lead_player_pos = lead_player_pos
+    game.round_number = round_number
+    for player, hand in zip(players, hands):
+        player.cards = hand
+    game.hands = [hand_mask(hand) for hand in hands]
+
+    for player, round_number, bid, won_tricks, score in sorted(rounds, key=lambda r: r[1]):
+        game.scoreboard.update_score(player, round_number, bid, won_tricks, score)
+    return game
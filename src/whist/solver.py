@@ -0,0 +1,697 @@
+import math
+import time
+
+from .masks import hand_mask, iter_indices, legal_mask, winning_card, CARD_BITS, CARD_SUITS, NUM_CARDS, NUM_SUITS, \
+    SUIT_MASKS
+
+
+class _Timeout(Exception):
+    # Raised by the search when the deadline of the current solve has passed.
+    pass
+
+
+def _master_trumps(hand, others, trump_mask):
+    # The trumps of a hand above every trump of the other hands: each of them takes a trick whenever it is played.
+    return hand & trump_mask & ~((1 << (others & trump_mask).bit_length()) - 1)
+
+
+class DoubleDummySolver:
+    """
+    Perfect-information (double dummy) solver for the tricks of a Whist round.
+
+    Given every hand, the trump suit and the lead player, the solver computes the maximum number of tricks a player
+    can take when every other player plays against them. Play follows the rules of 'HumanPlayer.play_card' (follow
+    the lead suit, otherwise trump if possible) and tricks are resolved as in 'determine_trick_winner', both through
+    their bitmask equivalents in 'whist.masks'.
+
+    The search is an alpha-beta search over single card plays. Cards of a hand that are adjacent in rank among the
+    cards still in play are equivalent, so only one of them is searched, and once a card is searched the lower cards
+    of its suit are skipped if its result doesn't depend on their ranks. Every node is first checked against cheap
+    bounds on the tricks left to the player: top cards, master trumps and side suits stopped by another player at the
+    start of a trick, whether the current trick can still be won inside it. Without trump, the player also surely
+    takes a trick with the top card of a suit when the other players run out of other suits to lead first. Leads are
+    tried suit by suit, the suits most likely to cut the search first, after the best lead found in the same position
+    by an earlier search.
+
+    The tricks of a player are found by null-window tests of ever more tricks, so that the tricks proven so far are a
+    lower bound whenever the search stops. With a time limit, the search stops at the deadline and returns that bound:
+    most deals of 8 cards and 6 players are solved within a fraction of a second, but a few take tens of seconds.
+
+    Positions at the start of a trick are stored in a transposition table by partition search: along with its value,
+    the search of a position returns the cards its result depends on, i.e. the cards that won a trick against another
+    card of their suit, and those the bounds relied on. In every suit, only the players holding the cards from the
+    top down to the lowest of those matter: the result holds for every position where the same players hold them and
+    every player holds as many cards of each suit, whatever the ranks of the other cards. Entries are keyed on these
+    suit lengths and matched on the holders of the top cards of every suit. The plain suits are ordered canonically
+    (see 'whist.canonical'), so that positions that only differ by a permutation of the plain suits share entries.
+
+    Attributes:
+        hands (list of int): The hand mask of every player, indexed by position.
+        trump (int): The trump suit, or None if there's no trump.
+        leader (int): The position of the player leading the next trick.
+        trick (list of tuples): The (position, card index) moves already played in the current trick.
+        time_limit (float): The time budget in seconds of every call to 'max_tricks', 'solve' or 'evaluate_moves', or
+                            None for no limit.
+        exact (bool): Whether the last call finished in time; if not, its results are lower bounds.
+        nodes (int): The number of nodes searched by the last call.
+    """
+
+    def __init__(self, hands, trump, leader=0, trick=None, time_limit=None):
+        """
+        Initializes the solver for a position.
+
+        Parameters:
+            hands (list): The hand of every player, indexed by position, either as a card mask or as a list of Card.
+            trump (int): The trump suit, usually 'Deck.trump', or None if there's no trump.
+            leader (int): The position of the player who leads the current trick.
+            trick (list of tuples): The (position, card index) moves already played in the current trick, if any.
+            time_limit (float): The time budget in seconds of every call, or None for no limit.
+
+        Raises:
+            ValueError: If the hands don't hold a consistent number of cards for the current trick, or if the current
+                        trick is already complete.
+        """
+        self.hands = [hand if isinstance(hand, int) else hand_mask(hand) for hand in hands]
+        self.num_players = len(self.hands)
+        self.trump = trump
+        self.leader = leader
+        self.trick = list(trick) if trick else []
+        self.time_limit = time_limit
+        self.exact = True
+        self.nodes = 0
+        self._deadline = math.inf
+
+        if len(self.trick) >= self.num_players:
+            raise ValueError("The current trick is already complete")
+        # Players who already played in the current trick hold one card less than the others.
+        sizes = [hand.bit_count() for hand in self.hands]
+        size = sizes[(leader + len(self.trick)) % self.num_players]
+        for step in range(self.num_players):
+            seat = (leader + step) % self.num_players
+            if sizes[seat] != size - (1 if step < len(self.trick) else 0):
+                raise ValueError("Inconsistent hand sizes")
+
+        self._trump_mask = SUIT_MASKS[trump] if trump is not None else 0
+        # The holder of every card, which doesn't change until the card is played.
+        self._owners = [-1] * NUM_CARDS
+        for seat, hand in enumerate(self.hands):
+            for card in iter_indices(hand):
+                self._owners[card] = seat
+        for seat, card in self.trick:
+            self._owners[card] = seat
+        # The description of every suit for every set of its cards still in play, at most 2 ** 13 per suit.
+        self._descriptions = [{} for _ in range(NUM_SUITS)]
+        self._tables = {}
+        self._best_leads = {}
+        # For every card, the mask of the cards that take the trick from it when played after it.
+        self._beating = tuple((SUIT_MASKS[CARD_SUITS[card]] & ~((CARD_BITS[card] << 1) - 1)) |
+                              (SUIT_MASKS[trump] if trump is not None and CARD_SUITS[card] != trump else 0)
+                              for card in range(NUM_CARDS))
+
+    def max_tricks(self, player):
+        """
+        Computes the maximum number of tricks a player can take from the current position, counting the current trick.
+
+        Parameters:
+            player (int): The position of the player.
+
+        Returns:
+            int: The maximum number of tricks the player can take against the best defence of all other players, or a
+                 lower bound if the time limit is reached.
+        """
+        return self._solve_all([(player, self.hands, len(self.trick), self.trick)])[0]
+
+    def solve(self):
+        """
+        Computes the maximum number of tricks every player can take from the current position.
+
+        Returns:
+            list of int: The maximum number of tricks of every player, indexed by position, or lower bounds for the
+                         players not solved in time.
+        """
+        return self._solve_all([(player, self.hands, len(self.trick), self.trick)
+                                for player in range(self.num_players)])
+
+    def evaluate_moves(self):
+        """
+        Evaluates every legal card of the player to move in the current trick.
+
+        Returns:
+            dict: Maps the index of every legal card to the maximum number of tricks the player to move can take
+                  after playing it, counting the current trick, or to a lower bound if the time limit is reached.
+        """
+        step = len(self.trick)
+        seat = (self.leader + step) % self.num_players
+        lead_suit = CARD_SUITS[self.trick[0][1]] if self.trick else None
+        cards = list(iter_indices(legal_mask(self.hands[seat], lead_suit, self.trump)))
+        searches = []
+        for card in cards:
+            hands = list(self.hands)
+            hands[seat] ^= CARD_BITS[card]
+            searches.append((seat, hands, step + 1, self.trick + [(seat, card)]))
+        return dict(zip(cards, self._solve_all(searches)))
+
+    def _solve_all(self, searches):
+        # Runs the searches in turn, every one until its share of the time left. Those interrupted are resumed from
+        # the tricks they proved while time is left, with the bounds they stored in the transposition table.
+        self.nodes = 0
+        end = time.perf_counter() + self.time_limit if self.time_limit is not None else math.inf
+        values = [0] * len(searches)
+        pending = list(range(len(searches)))
+        while pending:
+            unfinished = []
+            for i, index in enumerate(pending):
+                now = time.perf_counter()
+                self._deadline = now + (end - now) / (len(pending) - i)
+                values[index], done = self._solve(*searches[index], values[index])
+                if not done:
+                    unfinished.append(index)
+            pending = unfinished
+            if time.perf_counter() >= end:
+                break
+        self.exact = not pending
+        return values
+
+    def _solve(self, target, hands, step, trick, tricks):
+        # Sequence of null-window searches testing whether the target can take more than 'tricks' tricks, already
+        # proven. They prune far more than a full-window search, and the bounds they store in the transposition table
+        # are reused. Returns the tricks proven and whether the search finished before the deadline. Entries are only
+        # stored once their search is complete, so the table stays valid when the deadline interrupts a search.
+        self._hands = list(hands)
+        self._target = target
+        self._table = self._tables.setdefault(target, {})
+        self._leads = self._best_leads.setdefault(target, {})
+        remaining = hands[self.leader].bit_count() + (1 if step else 0)
+        try:
+            while tricks < remaining and self._search(step, trick, tricks, tricks + 1) > tricks:
+                tricks += 1
+        except _Timeout:
+            return tricks, False
+        return tricks, True
+
+    def _search(self, step, trick, alpha, beta):
+        if step == 0:
+            return self._trick_start(self.leader, alpha, beta)[0]
+        beating = self._beating
+        leader = trick[0][0]
+        top, winner, contested = trick[0][1], leader, False
+        in_play = 0
+        for hand in self._hands:
+            in_play |= hand
+        for seat, card in trick:
+            in_play |= CARD_BITS[card]
+            if beating[top] >> card & 1:
+                contested = CARD_SUITS[card] == CARD_SUITS[top]
+                top, winner = card, seat
+            elif seat != leader and CARD_SUITS[card] == CARD_SUITS[top]:
+                contested = True
+        if step == self.num_players:
+            won = 1 if winner == self._target else 0
+            return won + self._trick_start(winner, alpha - won, beta - won)[0]
+        return self._play(step, leader, CARD_SUITS[trick[0][1]], top, winner, contested, in_play, alpha, beta)[0]
+
+    def _trick_start(self, leader, alpha, beta):
+        # Returns the value of the position along with the cards it depends on, as a mask: in every suit, the cards
+        # from the top down to the lowest card of the mask must be held by the same players.
+        hands = self._hands
+        hand = hands[leader]
+        remaining = hand.bit_count()
+        if remaining <= 1:
+            if not remaining:
+                return 0, 0
+            # Every card of the last trick is forced.
+            played = 0
+            for other in hands:
+                played |= other
+            top = winning_card(played, CARD_SUITS[hand.bit_length() - 1], self.trump)
+            relevant = CARD_BITS[top] if (played & SUIT_MASKS[CARD_SUITS[top]]).bit_count() > 1 else 0
+            return (1 if hands[self._target] >> top & 1 else 0), relevant
+        if beta <= 0:
+            return 0, 0
+        if alpha >= remaining:
+            return remaining, 0
+
+        in_play = 0
+        for other in hands:
+            in_play |= other
+        # The trump suit comes first, then the plain suits in canonical order.
+        suits = []
+        for suit, descriptions in enumerate(self._descriptions):
+            cards = in_play & SUIT_MASKS[suit]
+            description = descriptions.get(cards)
+            if description is None:
+                description = descriptions[cards] = self._describe(suit, cards)
+            suits.append(description)
+        suits.sort(reverse=True)
+        first, second, third, fourth = suits
+        bucket = (leader, first[1], second[1], third[1], fourth[1])
+        position = (leader, first[2], second[2], third[2], fourth[2])
+
+        table = self._table
+        groups = table.get(bucket)
+        relevant = 0
+        lower = -1
+        if groups is not None:
+            upper = remaining + 1
+            for sizes, entries in groups.items():
+                entry = entries.get((first[4][sizes[0]], second[4][sizes[1]], third[4][sizes[2]],
+                                     fourth[4][sizes[3]]))
+                if entry is not None:
+                    lower = max(lower, entry[0])
+                    upper = min(upper, entry[1])
+                    for description, size in zip(suits, sizes):
+                        if size:
+                            relevant |= CARD_BITS[description[5][size - 1]]
+                    if lower >= beta or upper <= alpha or lower == upper:
+                        break
+        if lower < 0:
+            lower, upper, relevant = self._bounds(leader, remaining, in_play)
+        if lower >= beta or lower == upper:
+            return lower, relevant
+        if upper <= alpha:
+            return upper, relevant
+        if lower > alpha:
+            alpha = lower
+        if upper < beta:
+            beta = upper
+
+        value, found = self._play(0, leader, None, -1, -1, False, in_play, alpha, beta, (position, suits))
+        relevant |= found
+        if value <= alpha:
+            upper = value
+        elif value >= beta:
+            lower = value
+        else:
+            lower = upper = value
+        # The entry holds for every position where the same players hold the top cards of every suit, down to the
+        # lowest relevant card.
+        sizes = []
+        signature = []
+        for description in suits:
+            cards = relevant & SUIT_MASKS[description[3]]
+            size = (in_play & SUIT_MASKS[description[3]] & -(cards & -cards)).bit_count() if cards else 0
+            sizes.append(size)
+            signature.append(description[4][size])
+        entries = table.setdefault(bucket, {}).setdefault(tuple(sizes), {})
+        signature = tuple(signature)
+        entry = entries.get(signature)
+        if entry is not None:
+            lower = max(lower, entry[0])
+            upper = min(upper, entry[1])
+        entries[signature] = (lower, upper)
+        return value, relevant
+
+    def _describe(self, suit, cards):
+        # Describes a suit by the lengths of the hands in it and by the holders of its cards from the top. Holders
+        # don't change while the cards are in play, so the description only depends on the cards left in the suit.
+        owners = self._owners
+        n = self.num_players
+        lengths = 0
+        code = 1
+        codes = [code]
+        order = []
+        while cards:
+            card = cards.bit_length() - 1
+            seat = owners[card]
+            lengths += 1 << (4 * seat)
+            code = code * n + seat
+            codes.append(code)
+            order.append(card)
+            cards ^= CARD_BITS[card]
+        return suit == self.trump, lengths, code, suit, codes, order
+
+    def _bounds(self, leader, remaining, in_play):
+        # Returns a lower and an upper bound on the tricks of the target, and the cards both depend on.
+        hands = self._hands
+        target = self._target
+        trump_mask = self._trump_mask
+        target_hand = hands[target]
+        coalition = in_play & ~target_hand
+        lower = lower_cards = 0
+        stopped, upper_cards = self._stopped(target_hand)
+        upper = remaining - stopped
+        if trump_mask:
+            masters = _master_trumps(target_hand, coalition, trump_mask)
+            lower, lower_cards = masters.bit_count(), masters
+            for seat in range(self.num_players):
+                if seat != target:
+                    masters = _master_trumps(hands[seat], target_hand, trump_mask)
+                    if remaining - masters.bit_count() < upper:
+                        upper, upper_cards = remaining - masters.bit_count(), masters
+        tricks, cards = self._top_tricks(leader, in_play)
+        if leader == target:
+            if tricks > lower:
+                lower, lower_cards = tricks, cards
+        else:
+            if remaining - tricks < upper:
+                upper, upper_cards = remaining - tricks, cards
+            if lower == 0:
+                cards = self._controls_every_suit(target_hand, hands[leader], coalition)
+                if cards is None and not trump_mask:
+                    cards = self._leads_run_out(target_hand, remaining, in_play)
+                if cards is not None:
+                    lower, lower_cards = 1, cards
+        return lower, upper, lower_cards | upper_cards
+
+    def _top_tricks(self, seat, in_play):
+        # Tricks the player surely takes by leading their top cards, suit after suit. In a side suit this only holds
+        # as long as every other player holding trumps still has to follow suit.
+        hands = self._hands
+        hand = hands[seat]
+        trump_mask = self._trump_mask
+        total = 0
+        relevant = 0
+        for suit in range(NUM_SUITS):
+            suit_mask = SUIT_MASKS[suit]
+            cards = in_play & suit_mask
+            tops = []
+            while cards and hand >> (cards.bit_length() - 1) & 1:
+                tops.append(cards.bit_length() - 1)
+                cards ^= 1 << tops[-1]
+            length = len(tops)
+            if length and suit != self.trump and trump_mask:
+                for other in range(self.num_players):
+                    if other != seat and hands[other] & trump_mask:
+                        length = min(length, (hands[other] & suit_mask).bit_count())
+            if length:
+                total += length
+                relevant |= CARD_BITS[tops[length - 1]]
+        return total, relevant
+
+    def _stopped(self, target_hand):
+        # A player holding k cards of a side suit above every card of the target in that suit can always play one of
+        # them when the suit is led, and keep them for it since other cards are discarded first: k cards of the target
+        # in the suit then lose. Suits are matched to distinct players, whose plans never conflict.
+        hands = self._hands
+        target = self._target
+        gains = []
+        for suit in range(NUM_SUITS):
+            if suit == self.trump:
+                continue
+            holding = target_hand & SUIT_MASKS[suit]
+            if not holding:
+                continue
+            length = holding.bit_count()
+            above = SUIT_MASKS[suit] & ~((1 << holding.bit_length()) - 1)
+            for seat in range(self.num_players):
+                if seat != target:
+                    count = (hands[seat] & above).bit_count()
+                    if count:
+                        gains.append((min(count, length), suit, seat))
+        gains.sort(reverse=True)
+        total = 0
+        relevant = 0
+        suits = seats = 0
+        for gain, suit, seat in gains:
+            if not suits >> suit & 1 and not seats >> seat & 1:
+                total += gain
+                # Only the players holding the cards above the top card of the target in the suit matter.
+                relevant |= 1 << ((target_hand & SUIT_MASKS[suit]).bit_length() - 1)
+                suits |= 1 << suit
+                seats |= 1 << seat
+        return total, relevant
+
+    def _controls_every_suit(self, target_hand, leader_hand, coalition):
+        # Whatever suit the leader leads, the target holds its top card still in play and nobody can ruff it. Returns
+        # the top cards of those suits, or None.
+        hands = self._hands
+        trump_mask = self._trump_mask
+        relevant = 0
+        for suit in range(NUM_SUITS):
+            suit_mask = SUIT_MASKS[suit]
+            if not leader_hand & suit_mask:
+                continue
+            top = 1 << (((target_hand | coalition) & suit_mask).bit_length() - 1)
+            if not target_hand & top:
+                return None
+            if suit != self.trump:
+                for seat in range(self.num_players):
+                    if seat != self._target and hands[seat] & trump_mask and not hands[seat] & suit_mask:
+                        return None
+            relevant |= top
+        return relevant
+
+    def _leads_run_out(self, target_hand, remaining, in_play):
+        # Without trump, the target takes a trick with the top card of a suit whenever the suit is led. It plays its
+        # other cards first, so that the other players must lead the other suits to all the tricks until it has none
+        # left, and the one after. Every trick led in a suit takes a card of the suit from every other player holding
+        # it, which bounds the tricks they can lead in it by the length of their longest holding. Returns the top
+        # cards of the target if they cannot lead the other suits that often, or None.
+        hands = self._hands
+        relevant = 0
+        masters = 0
+        leads = 0
+        for suit_mask in SUIT_MASKS:
+            cards = in_play & suit_mask
+            if not cards:
+                continue
+            top = 1 << (cards.bit_length() - 1)
+            if target_hand & top:
+                relevant |= top
+                masters += 1
+            else:
+                cards &= ~target_hand
+                longest = 0
+                for hand in hands:
+                    length = (hand & cards).bit_count()
+                    if length > longest:
+                        longest = length
+                leads += longest
+        return relevant if masters and leads <= remaining - masters else None
+
+    def _sure_trick(self, step, leader, lead_suit, top, winner):
+        # Whether the target surely takes the current trick: it wins it, or still has to play a card that wins it, and
+        # none of the players left to play can legally beat that card. Returns 1 and the card, or 0 and no card.
+        n = self.num_players
+        hands = self._hands
+        target = self._target
+        beating = self._beating
+        if (target - leader) % n < step:
+            if winner != target:
+                return 0, 0
+            card = top
+        else:
+            legal = legal_mask(hands[target], lead_suit, self.trump) & beating[top]
+            if not legal:
+                return 0, 0
+            card = legal.bit_length() - 1
+        for later in range(step, n):
+            seat = (leader + later) % n
+            if seat != target and legal_mask(hands[seat], lead_suit, self.trump) & beating[card]:
+                return 0, 0
+        return 1, CARD_BITS[card]
+
+    def _order_leads(self, seat, in_play):
+        # Leads are ordered by suit. The target first cashes the suits in which it holds the top card still in play,
+        # then leads its trumps, then its shortest suits from the lowest card. The other players first lead the suits
+        # in which the target cannot take the trick: it is void without trumps to ruff, or one of them holds a card
+        # above its cards or can ruff them. Among those, the suits in which the leader holds the top card still in
+        # play come first, and every suit is led from the highest card.
+        hand = self._hands[seat]
+        target_hand = self._hands[self._target]
+        first = []
+        middle = []
+        last = []
+        for suit in range(NUM_SUITS):
+            holding = hand & SUIT_MASKS[suit]
+            if not holding:
+                continue
+            cards = list(iter_indices(holding))
+            suit_cards = in_play & SUIT_MASKS[suit]
+            top_held = hand >> (suit_cards.bit_length() - 1) & 1
+            if seat == self._target:
+                if top_held:
+                    cards.reverse()
+                    first.append((-len(cards), cards))
+                elif suit == self.trump:
+                    cards.reverse()
+                    middle.append((0, cards))
+                else:
+                    last.append((len(cards), cards))
+            else:
+                target_cards = target_hand & SUIT_MASKS[suit]
+                if target_cards:
+                    safe = in_play & ~target_hand & SUIT_MASKS[suit] & ~((1 << target_cards.bit_length()) - 1)
+                    if not safe and suit != self.trump and self._trump_mask:
+                        for other in range(self.num_players):
+                            if (other != self._target and not self._hands[other] & SUIT_MASKS[suit] and
+                                    self._hands[other] & self._trump_mask):
+                                safe = True
+                else:
+                    safe = suit == self.trump or not target_hand & self._trump_mask
+                if safe and top_held:
+                    cards.reverse()
+                    first.append((0, cards))
+                elif safe:
+                    cards.reverse()
+                    middle.append((0, cards))
+                else:
+                    cards.reverse()
+                    last.append((0, cards))
+        moves = []
+        for group in (first, middle, last):
+            group.sort(key=lambda item: item[0])
+            for _, cards in group:
+                moves.extend(cards)
+        return moves
+
+    def _order_follows(self, seat, legal, lead_suit, top, winner, step, leader, in_play):
+        # Cards are tried from the highest, except for the cards that cannot take the trick away from whoever is
+        # winning it for the side to move. Players keep their strongest cards: those are tried from the one with the
+        # most cards of its suit above it.
+        if not legal & (legal - 1):
+            return [legal.bit_length() - 1]
+        target = self._target
+        moves = list(iter_indices(legal))
+        moves.reverse()
+        beat = legal & self._beating[top]
+        beats = [card for card in moves if beat >> card & 1]
+        others = [card for card in moves if not beat >> card & 1]
+        if len(others) > 1:
+            others.sort(key=lambda card: (in_play & SUIT_MASKS[CARD_SUITS[card]] & -CARD_BITS[card]).bit_count(),
+                        reverse=True)
+        if seat == target:
+            return beats + others
+        if winner == target:
+            # Take the trick away from the target with the lowest card that does it.
+            beats.reverse()
+            return beats + others
+        if ((target - leader) % self.num_players > step and
+                legal_mask(self._hands[target], lead_suit, self.trump) & self._beating[top]):
+            # The target still has to play and could beat the current card: beat it from the highest.
+            return beats + others
+        return others + beats
+
+    def _play(self, step, leader, lead_suit, top, winner, contested, in_play, alpha, beta, position=None):
+        # Returns the value of the node along with the cards it depends on, like '_trick_start'. 'contested' tells
+        # whether the card winning the trick so far beat another card of its suit, which makes its rank matter.
+        self.nodes += 1
+        if not self.nodes & 255 and time.perf_counter() > self._deadline:
+            raise _Timeout
+        n = self.num_players
+        hands = self._hands
+        target = self._target
+        beating = self._beating
+        seat = (leader + step) % n
+        hand = hands[seat]
+        if step:
+            # Quick bounds: the target takes at most the later tricks, plus the current one if it still can, and at
+            # least one trick with each of its trumps above every other trump still in play.
+            target_hand = hands[target]
+            later = hands[leader].bit_count()
+            if (target - leader) % n < step:
+                upper = later + (1 if winner == target else 0)
+            else:
+                upper = later + (1 if legal_mask(target_hand, lead_suit, self.trump) & beating[top] else 0)
+            if upper <= alpha:
+                return upper, CARD_BITS[top]
+            lower, cards = self._sure_trick(step, leader, lead_suit, top, winner)
+            if self._trump_mask:
+                masters = _master_trumps(target_hand & ~cards, in_play & ~target_hand, self._trump_mask)
+                if lower + masters.bit_count() >= beta:
+                    return lower + masters.bit_count(), cards | masters
+            elif lower >= beta:
+                return lower, cards
+            elif lower + 1 >= beta and (target - leader) % n < step:
+                # The target already played: the bound of '_leads_run_out' holds for the next trick whatever the
+                # other players still play, as they can only shorten their holdings.
+                left = 0
+                for other in hands:
+                    left |= other
+                masters = self._leads_run_out(target_hand, later, left)
+                if masters is not None:
+                    return lower + 1, cards | masters
+            moves = self._order_follows(seat, legal_mask(hand, lead_suit, self.trump), lead_suit, top, winner, step,
+                                        leader, in_play)
+        else:
+            moves = self._order_leads(seat, in_play)
+            key, suits = position
+            hint = self._leads.get(key)
+            if hint is not None:
+                # The best lead is stored as its canonical suit and its order from the top, a card of the leader in
+                # every position with the same key.
+                hint = suits[hint[0]][5][hint[1]]
+                if moves[0] != hint:
+                    moves.remove(hint)
+                    moves.insert(0, hint)
+
+        maximizing = seat == target
+        best = -1 if maximizing else 1 << 30
+        best_card = -1
+        relevant = 0
+        skipped = []
+        # For every suit, the cards below this bit are known to give the same result as a card already searched.
+        covered = [0] * NUM_SUITS
+        last = step == n - 1
+        for card in moves:
+            suit = CARD_SUITS[card]
+            if CARD_BITS[card] < covered[suit]:
+                continue
+            # Skip the card if the next lower card still in play is in the same hand: both are equivalent.
+            below = in_play & (CARD_BITS[card] - 1) & SUIT_MASKS[suit]
+            if below and hand >> (below.bit_length() - 1) & 1:
+                skipped.append(card)
+                continue
+
+            if not step:
+                next_top, next_winner, next_suit, next_contested = card, seat, CARD_SUITS[card], False
+            elif beating[top] >> card & 1:
+                next_top, next_winner, next_suit = card, seat, lead_suit
+                next_contested = CARD_SUITS[card] == CARD_SUITS[top]
+            else:
+                next_top, next_winner, next_suit = top, winner, lead_suit
+                next_contested = contested or CARD_SUITS[card] == CARD_SUITS[top]
+            hands[seat] = hand ^ CARD_BITS[card]
+            if last:
+                won = 1 if next_winner == target else 0
+                if won >= beta:
+                    # The trick alone reaches the bound.
+                    value, found = won, 0
+                else:
+                    value, found = self._trick_start(next_winner, alpha - won, beta - won)
+                    value += won
+                if next_contested:
+                    found |= CARD_BITS[next_top]
+            else:
+                value, found = self._play(step + 1, leader, next_suit, next_top, next_winner, next_contested,
+                                          in_play, alpha, beta)
+            hands[seat] = hand
+
+            if maximizing:
+                if value > best:
+                    best, best_card = value, card
+                if best > alpha:
+                    alpha = best
+            else:
+                if value < best:
+                    best, best_card = value, card
+                if best < beta:
+                    beta = best
+            if alpha >= beta:
+                # The cut only depends on the card that caused it.
+                relevant = found
+                skipped = None
+                break
+            relevant |= found
+            # The result holds whatever the ranks of the cards of the suit below the relevant ones: if the card is
+            # one of them, playing another one of them instead gives the same result.
+            cards = found & SUIT_MASKS[suit]
+            bound = cards & -cards if cards else SUIT_MASKS[suit]
+            if CARD_BITS[card] < bound and bound > covered[suit]:
+                covered[suit] = bound
+
+        if skipped:
+            # An equivalent card stands for the cards above it only if they are all relevant or all irrelevant.
+            skipped.sort(reverse=True)
+            for card in skipped:
+                cards = relevant & SUIT_MASKS[CARD_SUITS[card]]
+                if cards & -cards == CARD_BITS[card]:
+                    below = in_play & (CARD_BITS[card] - 1) & SUIT_MASKS[CARD_SUITS[card]]
+                    relevant |= 1 << (below.bit_length() - 1)
+        if position is not None:
+            suit = CARD_SUITS[best_card]
+            for index, description in enumerate(position[1]):
+                if description[3] == suit:
+                    above = in_play & SUIT_MASKS[suit] & ~((CARD_BITS[best_card] << 1) - 1)
+                    self._leads[position[0]] = (index, above.bit_count())
+        return best, relevant
@@ -0,0 +1,252 @@
+"""
+Lean, full-information state of a Whist round for tree search.
+
+'Game' ties the round to Player objects, a Deck of Card objects and the Scoreboard, which makes copying it for search
+slow. 'GameState' keeps the same round in a few flat lists of integers, applies bids and cards in place with 'apply'
+and reverts them with 'undo', so search bots can walk a tree without copying anything, and 'clone' when they must.
+"""
+from .env import BID, PLAY
+from .masks import card_index, legal_moves, trick_winner, CARD_BITS, CARD_SUITS
+from .utils import calculate_score
+from .schedule import round_schedule
+
+
+class GameState:
+    """
+    The state of a Whist round: hands, trump, bids, won tricks and the current trick, with bids and cards applied as
+    moves. Moves are the bid during the bidding phase and the card index (see 'whist.masks') during the playing phase,
+    as in 'WhistEnv'.
+
+    Attributes:
+        num_players (int): The number of players.
+        hands (list of int): The hand mask of every player.
+        trump (int): The trump suit, or None if there's no trump.
+        trump_card (int): The index of the trump card, or None.
+        hand_size (int): The number of cards dealt to every player.
+        phase (str): Either BID or PLAY.
+        bids (list of int): The bid of every player, or None before they bid.
+        total_bid (int): The sum of the bids made so far.
+        won (list of int): The tricks won by every player.
+        leader (int): The position of the player who leads the current trick, or bids first.
+        step (int): The number of players who already acted in the current bidding turn or trick.
+        trick (list of tuples): The (position, card index) moves of the current trick.
+    """
+
+    __slots__ = ('num_players', 'hands', 'trump', 'trump_card', 'hand_size', 'phase', 'bids', 'total_bid', 'won',
+                 'leader', 'step', 'trick', 'history')
+
+    def __init__(self, num_players, hands=None, trump_card=None, leader=0):
+        """
+        Initializes the state of a round with the given hands, in the bidding phase.
+
+        Parameters:
+            num_players (int): The number of players.
+            hands (list of int): The hand mask of every player. Empty hands if None; see 'deal_cards'.
+            trump_card (int): The index of the trump card, or None if there's no trump.
+            leader (int): The position of the player who bids first and leads the first trick.
+        """
+        self.num_players = num_players
+        self.deal(hands if hands is not None else [0] * num_players, trump_card, leader)
+
+    def deal(self, hands, trump_card=None, leader=0):
+        """
+        Starts a round with the given hands, in the bidding phase. The undo history is cleared.
+
+        Parameters:
+            hands (list of int): The hand mask of every player.
+            trump_card (int): The index of the trump card, or None if there's no trump.
+            leader (int): The position of the player who bids first and leads the first trick.
+        """
+        n = self.num_players
+        self.hands = list(hands)
+        self.trump_card = trump_card
+        self.trump = CARD_SUITS[trump_card] if trump_card is not None else None
+        self.hand_size = self.hands[leader].bit_count()
+        self.phase = BID
+        self.bids = [None] * n
+        self.total_bid = 0
+        self.won = [0] * n
+        self.leader = leader
+        self.step = 0
+        self.trick = []
+        self.history = []
+
+    def deal_cards(self, round_number, rng, leader=None):
+        """
+        Shuffles a deck and deals the cards of a round the way 'Game.deal_cards' and 'Game.start_round' do: one card
+        at a time from the top of the deck starting with the leader, then the trump card if the hand size is smaller
+        than 8. The deck is built in the order of 'Deck.__init__', so the same random generator state gives the same
+        deal as the game.
+
+        Parameters:
+            round_number (int): The round number, used to determine the hand size.
+            rng (random.Random): The random generator used to shuffle the deck.
+            leader (int): The position of the player who bids first. Defaults to the current leader.
+
+        Returns:
+            int: The hand size of the round.
+        """
+        n = self.num_players
+        leader = self.leader if leader is None else leader
+        schedule = round_schedule(n)
+        hand_size = schedule.hand_size(round_number)
+        deck = [card_index(v, s) for v in range(3 + (6 - n) * 2, 16) if v != 11 for s in range(4)]
+        rng.shuffle(deck)
+        hands = [0] * n
+        for i in range(hand_size):
+            for j in range(n):
+                hands[(leader + j) % n] |= CARD_BITS[deck.pop()]
+        self.deal(hands, deck.pop() if schedule.has_trump[round_number] else None, leader)
+        return hand_size
+
+    @classmethod
+    def from_info(cls, info, hands, hand_size):
+        """
+        Builds the state of a round in progress from its public information and a guess of the hands, e.g. a sample
+        of the hidden hands for information-set search.
+
+        Parameters:
+            info (InformationState): The public information of the round.
+            hands (list of int): The hand mask of every player.
+            hand_size (int): The number of cards dealt to every player.
+
+        Returns:
+            GameState: The state, in the bidding phase until every player bid.
+        """
+        state = cls(info.num_players, hands, info.trump_card, info.leader)
+        state.hand_size = hand_size
+        if None in info.bids:
+            state.bids = list(info.bids)
+            state.step = state.num_players - info.bids.count(None)
+        else:
+            state.phase = PLAY
+            state.bids = list(info.bids)
+            state.step = len(info.trick)
+            state.trick = list(info.trick)
+        state.total_bid = sum(bid for bid in info.bids if bid is not None)
+        state.won = list(info.won)
+        return state
+
+    @property
+    def current_player(self):
+        """
+        int: The position of the player who has to act next.
+        """
+        return (self.leader + self.step) % self.num_players
+
+    @property
+    def is_over(self):
+        """
+        bool: True once every trick of the round has been played.
+        """
+        return self.phase == PLAY and sum(self.won) == self.hand_size
+
+    def legal_moves(self):
+        """
+        Lists the legal moves of the player to act.
+
+        Returns:
+            list of int: The legal bids during the bidding phase, where the last player cannot make the total bids
+                         equal to the hand size, or the indices of the playable cards otherwise.
+        """
+        if self.phase == BID:
+            forbidden = self.hand_size - self.total_bid if self.step == self.num_players - 1 else None
+            return [bid for bid in range(self.hand_size + 1) if bid != forbidden]
+        if self.is_over:
+            return []
+        lead_suit = CARD_SUITS[self.trick[0][1]] if self.trick else None
+        return list(legal_moves(self.hands[self.current_player], lead_suit, self.trump))
+
+    def apply(self, move):
+        """
+        Applies a bid or a card of the player to act. Moves are not validated; see 'legal_moves'.
+
+        Parameters:
+            move (int): The bid, or the index of the card to play.
+
+        Returns:
+            int: The position of the winner if the move completes a trick, otherwise None.
+        """
+        n = self.num_players
+        pos = (self.leader + self.step) % n
+        if self.phase == BID:
+            self.bids[pos] = move
+            self.total_bid += move
+            self.step += 1
+            if self.step == n:
+                self.phase = PLAY
+                self.step = 0
+            self.history.append((BID, pos, move, None))
+            return None
+
+        self.hands[pos] ^= CARD_BITS[move]
+        self.trick.append((pos, move))
+        self.step += 1
+        if self.step < n:
+            self.history.append((PLAY, pos, move, None))
+            return None
+
+        winner = trick_winner(self.trick, self.trump)
+        self.won[winner] += 1
+        self.history.append((PLAY, pos, move, (self.leader, self.trick)))
+        self.leader = winner
+        self.step = 0
+        self.trick = []
+        return winner
+
+    def undo(self):
+        """
+        Reverts the last move applied since the state was dealt or cloned.
+
+        Raises:
+            IndexError: If there's no move to undo.
+        """
+        phase, pos, move, completed = self.history.pop()
+        if phase == BID:
+            if self.phase == PLAY:
+                self.phase = BID
+                self.step = self.num_players
+            self.bids[pos] = None
+            self.total_bid -= move
+            self.step -= 1
+            return
+
+        if completed is not None:
+            self.won[self.leader] -= 1
+            self.leader, self.trick = completed
+            self.step = self.num_players
+        self.trick.pop()
+        self.step -= 1
+        self.hands[pos] |= CARD_BITS[move]
+
+    def clone(self):
+        """
+        Copies the state. The copy starts with an empty undo history.
+
+        Returns:
+            GameState: The copy.
+        """
+        other = GameState.__new__(GameState)
+        other.num_players = self.num_players
+        other.hands = self.hands[:]
+        other.trump = self.trump
+        other.trump_card = self.trump_card
+        other.hand_size = self.hand_size
+        other.phase = self.phase
+        other.bids = self.bids[:]
+        other.total_bid = self.total_bid
+        other.won = self.won[:]
+        other.leader = self.leader
+        other.step = self.step
+        other.trick = self.trick[:]
+        other.history = []
+        return other
+
+    def round_scores(self):
+        """
+        Scores the round with 'calculate_score'.
+
+        Returns:
+            list of int: The round score of every player, indexed by position.
+        """
+        return [calculate_score(bid, won) for bid, won in zip(self.bids, self.won)]
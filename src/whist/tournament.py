@@ -0,0 +1,350 @@
+"""
+Tournaments ranking populations of bots with duplicate deals, parallel matches and early stopping.
+
+A match seats k entrants (3 to 6) at the same deals k times, rotating the seats between games, so that every entrant
+plays every hand from every seat and the luck of the deal cancels out. The entrants of a match are then compared
+pairwise on their total score over the k games; the k - 1 comparisons of an entrant share the same deals, so together
+they weigh as much as a single game in the ratings.
+
+Matches are scheduled round robin (every combination of k entrants, in random order) or Swiss (entrants of similar
+rating play together), run on a process pool and streamed back as they finish. After every result the ratings are
+refitted; the tournament stops as soon as the ranking is settled, i.e. every entrant is separated from the next one
+in the ranking at the requested confidence, instead of playing every scheduled match.
+
+Entrants are given as a dict mapping their names to factories: picklable callables (e.g. classes or
+functools.partial objects) called with a name that return a new Player.
+"""
+import itertools
+import math
+import multiprocessing as mp
+import os
+import random
+from statistics import NormalDist
+
+import numpy as np
+
+from .deals import generate_deals
+from .game import Game
+from .schedule import round_schedule
+from .scoreboard import ColumnarScoreboard
+
+ROUND_ROBIN = "round_robin"
+SWISS = "swiss"
+
+# Scale of the ratings: a difference of 400 points means 10 to 1 odds.
+ELO_SCALE = 400 / math.log(10)
+
+_entrants = None
+
+
+def _init_worker(entrants):
+    global _entrants
+    _entrants = entrants
+
+
+def play_match(names, seed, entrants=None):
+    """
+    Plays a duplicate match: one game per seat rotation, all on the same deals.
+
+    Parameters:
+        names (tuple of str): The names of the k entrants of the match, in seat order for the first game.
+        seed (int): The seed of the deals.
+        entrants (dict): The factories of the entrants. Defaults to those given to the worker process.
+
+    Returns:
+        tuple: (names, scores), where scores is the total score of every entrant over the k games.
+    """
+    entrants = entrants if entrants is not None else _entrants
+    k = len(names)
+    num_rounds = round_schedule(k).num_rounds
+    deals = generate_deals(k, num_rounds, seed)
+    scoreboard = ColumnarScoreboard(k, num_rounds=num_rounds, capacity=k)
+    for rotation in range(k):
+        seated = [names[(seat + rotation) % k] for seat in range(k)]
+        players = [entrants[name](name) for name in seated]
+        Game(players, verbose=False, rng=random.Random(seed), deals=deals, scoreboard=scoreboard).play_game()
+    # Seat s of game r was taken by entrant (s + r) % k.
+    totals = scoreboard.totals[:k]
+    scores = [int(sum(totals[rotation, (i - rotation) % k] for rotation in range(k))) for i in range(k)]
+    return tuple(names), scores
+
+
+class Ratings:
+    """
+    Bradley-Terry (Elo scale) ratings fitted by maximum a posteriori estimation on pairwise results, with a Gaussian
+    prior keeping the ratings of entrants with few results near 0.
+
+    Attributes:
+        names (list of str): The names of the entrants.
+        points (numpy.ndarray): points[i, j] is the weighted number of wins of entrant i against j, draws counting
+                                half.
+        weights (numpy.ndarray): weights[i, j] is the weighted number of comparisons between entrants i and j.
+        games (numpy.ndarray): games[i, j] is the number of comparisons between entrants i and j.
+        prior (float): The standard deviation of the prior, in rating points.
+        rating (numpy.ndarray): The fitted rating of every entrant.
+        covariance (numpy.ndarray): The covariance of the fitted ratings, in rating points squared.
+    """
+
+    def __init__(self, names, prior=400.0):
+        """
+        Initializes the ratings of the entrants at 0, the mean rating.
+
+        Parameters:
+            names (list of str): The names of the entrants.
+            prior (float): The standard deviation of the prior, in rating points.
+        """
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        self.points = np.zeros((n, n))
+        self.weights = np.zeros((n, n))
+        self.games = np.zeros((n, n))
+        self.prior = prior
+        self.rating = np.zeros(n)
+        self.covariance = np.eye(n) * prior ** 2
+
+    def add_match(self, names, scores):
+        """
+        Records the pairwise results of a match. The results of a k player match are correlated, as they come from
+        the same deals: each of them weighs 1 / (k - 1), so that the information of an entrant grows by one game per
+        match rather than by k - 1 independent games, which would make the intervals too narrow.
+
+        Parameters:
+            names (tuple of str): The entrants of the match.
+            scores (list of int): Their total scores.
+        """
+        weight = 1 / (len(names) - 1)
+        for (a, score_a), (b, score_b) in itertools.combinations(zip(names, scores), 2):
+            i, j = self.index[a], self.index[b]
+            result = 1.0 if score_a > score_b else 0.0 if score_a < score_b else 0.5
+            self.points[i, j] += weight * result
+            self.points[j, i] += weight * (1 - result)
+            self.weights[i, j] += weight
+            self.weights[j, i] += weight
+            self.games[i, j] += 1
+            self.games[j, i] += 1
+
+    def fit(self, iterations=50, tolerance=1e-9):
+        """
+        Fits the ratings and their covariance with Newton's method, starting from the previous fit.
+
+        Parameters:
+            iterations (int): The maximum number of Newton steps.
+            tolerance (float): The step size, in natural units, below which the fit has converged.
+        """
+        precision = (ELO_SCALE / self.prior) ** 2
+        r = self.rating / ELO_SCALE
+        for _ in range(iterations):
+            p = 1 / (1 + np.exp(r[None, :] - r[:, None]))
+            gradient = (self.points - self.weights * p).sum(axis=1) - precision * r
+            weights = self.weights * p * (1 - p)
+            hessian = weights - np.diag(weights.sum(axis=1) + precision)
+            step = np.linalg.solve(hessian, gradient)
+            r -= step
+            if np.abs(step).max() < tolerance:
+                break
+        # Only rating differences are identified by the results: report the ratings relative to their mean, whose
+        # covariance leaves out the uncertainty of the mean that only the prior constrains.
+        n = len(r)
+        centering = np.eye(n) - 1 / n
+        self.rating = (r - r.mean()) * ELO_SCALE
+        self.covariance = centering @ np.linalg.inv(-hessian) @ centering * ELO_SCALE ** 2
+
+    def interval(self, confidence=0.95):
+        """
+        Computes the half-width of the confidence interval of every rating.
+
+        Parameters:
+            confidence (float): The confidence level.
+
+        Returns:
+            numpy.ndarray: The half-widths, in rating points.
+        """
+        return NormalDist().inv_cdf((1 + confidence) / 2) * np.sqrt(np.diag(self.covariance))
+
+    def settled(self, confidence=0.95):
+        """
+        Tells whether every entrant is rated above the next one in the ranking at the given confidence, using the
+        variance of the difference of their ratings.
+
+        Parameters:
+            confidence (float): The confidence level.
+
+        Returns:
+            bool: True if the ranking is settled.
+        """
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        order = np.argsort(-self.rating)
+        for a, b in zip(order, order[1:]):
+            variance = self.covariance[a, a] + self.covariance[b, b] - 2 * self.covariance[a, b]
+            if self.rating[a] - self.rating[b] <= z * math.sqrt(max(variance, 0.0)):
+                return False
+        return True
+
+
+def round_robin(names, seat_counts, rng):
+    """
+    Generates round robin matches: every combination of entrants for every seat count, in random order, repeated
+    with new seat orders for as long as the tournament asks.
+
+    Parameters:
+        names (list of str): The names of the entrants.
+        seat_counts (tuple of int): The numbers of players of the matches.
+        rng (random.Random): The random generator.
+
+    Yields:
+        tuple of str: The entrants of every match.
+    """
+    matches = [list(group) for k in seat_counts for group in itertools.combinations(names, k)]
+    while True:
+        rng.shuffle(matches)
+        for match in matches:
+            rng.shuffle(match)
+            yield tuple(match)
+
+
+def swiss_round(ratings, num_players, rng):
+    """
+    Pairs the entrants for a Swiss round: the entrants are sorted by rating and cut into consecutive groups of
+    num_players. Entrants left over sit the round out, chosen among those who played the most.
+
+    Parameters:
+        ratings (Ratings): The current ratings.
+        num_players (int): The number of players of the matches.
+        rng (random.Random): The random generator, to break ties between entrants of equal rating.
+
+    Returns:
+        list of tuples: The entrants of every match of the round.
+    """
+    played = ratings.games.sum(axis=1)
+    order = sorted(range(len(ratings.names)), key=lambda i: (-played[i], rng.random()))
+    playing = sorted(order[len(order) % num_players:], key=lambda i: (-ratings.rating[i], rng.random()))
+    return [tuple(ratings.names[i] for i in playing[start:start + num_players])
+            for start in range(0, len(playing), num_players)]
+
+
+class Tournament:
+    """
+    Runs matches between entrants until their ranking is settled or the match budget is spent.
+
+    Attributes:
+        entrants (dict): Maps the name of every entrant to its factory.
+        seat_counts (tuple of int): The numbers of players of the matches, between 3 and 6.
+        pairing (str): Either ROUND_ROBIN or SWISS.
+        processes (int): The number of worker processes. With 0, matches are played in the calling process.
+        confidence (float): The confidence at which the ranking must be settled to stop early.
+        min_matches (int): The number of matches played before the tournament can stop early.
+        max_matches (int): The maximum number of matches.
+        ratings (Ratings): The ratings of the entrants.
+        matches (int): The number of matches played.
+        scores (dict): The total score of every entrant over all its matches.
+    """
+
+    def __init__(self, entrants, seat_counts=(4,), pairing=ROUND_ROBIN, processes=None, seed=0, confidence=0.99,
+                 min_matches=None, max_matches=1000):
+        """
+        Initializes the tournament.
+
+        Parameters:
+            entrants (dict): Maps the name of every entrant to its factory.
+            seat_counts (int or tuple of int): The numbers of players of the matches, between 3 and 6.
+            pairing (str): Either ROUND_ROBIN or SWISS.
+            processes (int): The number of worker processes. Defaults to the number of cores; 0 plays the matches
+                             in the calling process.
+            seed (int): The seed of the schedule and the deals.
+            confidence (float): The confidence at which the ranking must be settled to stop early. The ranking is
+                                checked after every match, which makes a false early stop more likely than the
+                                confidence suggests, so it should stay high.
+            min_matches (int): The number of matches played before the tournament can stop early. Defaults to 10
+                               matches per entrant.
+            max_matches (int): The maximum number of matches.
+
+        Raises:
+            ValueError: If a seat count is not between 3 and 6 or exceeds the number of entrants, or if the pairing
+                        is unknown.
+        """
+        self.entrants = dict(entrants)
+        self.seat_counts = (seat_counts,) if isinstance(seat_counts, int) else tuple(seat_counts)
+        if any(k < 3 or k > 6 or k > len(self.entrants) for k in self.seat_counts):
+            raise ValueError("Invalid number of players")
+        if pairing not in (ROUND_ROBIN, SWISS):
+            raise ValueError(f"Unknown pairing {pairing}")
+        self.pairing = pairing
+        self.processes = processes
+        self.rng = random.Random(seed)
+        self.confidence = confidence
+        self.min_matches = min_matches if min_matches is not None else 10 * len(self.entrants)
+        self.max_matches = max_matches
+        self.ratings = Ratings(self.entrants)
+        self.matches = 0
+        self.scores = {name: 0 for name in self.entrants}
+
+    def _batches(self, window):
+        # Round robin matches are independent: they are submitted in windows, to keep results streaming in. Swiss
+        # rounds depend on the ratings, so each round is played in full before the next one is paired.
+        if self.pairing == ROUND_ROBIN:
+            matches = round_robin(list(self.entrants), self.seat_counts, self.rng)
+            while True:
+                yield list(itertools.islice(matches, window))
+        for k in itertools.cycle(self.seat_counts):
+            yield swiss_round(self.ratings, k, self.rng)
+
+    def _record(self, result, callback):
+        names, scores = result
+        self.ratings.add_match(names, scores)
+        self.ratings.fit()
+        for name, score in zip(names, scores):
+            self.scores[name] += score
+        self.matches += 1
+        if callback is not None:
+            callback(self, names, scores)
+        return self.matches >= self.min_matches and self.ratings.settled(self.confidence)
+
+    def run(self, callback=None):
+        """
+        Plays matches until the ranking is settled or max_matches matches were played.
+
+        Parameters:
+            callback (callable): Called with the tournament, the entrants and the scores after every match.
+
+        Returns:
+            list of dicts: The standings, see 'standings'.
+        """
+        pool = None
+        window = 1
+        if self.processes != 0:
+            pool = mp.Pool(self.processes, initializer=_init_worker, initargs=(self.entrants,))
+            window = 4 * (self.processes or os.cpu_count())
+        try:
+            for batch in self._batches(window):
+                jobs = [(match, self.rng.getrandbits(32)) for match in batch[:self.max_matches - self.matches]]
+                if pool is not None:
+                    results = pool.imap_unordered(_play_job, jobs)
+                else:
+                    results = (play_match(match, seed, self.entrants) for match, seed in jobs)
+                if any(self._record(result, callback) for result in results) or self.matches >= self.max_matches:
+                    break
+        finally:
+            if pool is not None:
+                # Matches still running when the ranking settled are dropped.
+                pool.terminate()
+                pool.join()
+        return self.standings()
+
+    def standings(self):
+        """
+        Ranks the entrants by rating.
+
+        Returns:
+            list of dicts: For every entrant, best first: 'name', 'rating', 'interval' (the half-width of the
+                           confidence interval), 'comparisons' (the number of pairwise comparisons) and 'score'.
+        """
+        intervals = self.ratings.interval(self.confidence)
+        games = self.ratings.games.sum(axis=1)
+        return [{'name': name, 'rating': float(self.ratings.rating[i]), 'interval': float(intervals[i]),
+                 'comparisons': int(games[i]), 'score': self.scores[name]}
+                for i, name in sorted(enumerate(self.ratings.names), key=lambda item: -self.ratings.rating[item[0]])]
+
+
+def _play_job(job):
+    return play_match(*job)
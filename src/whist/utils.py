@@ -1,3 +1,7 @@
+from .masks import hand_mask, mask_has_suit, winning_card, CARD_BITS
+from .schedule import round_schedule
+
+
 def has_suit(player, suit):
     """
     Determines whether the player has at least one card of the specified suit in their hand.
@@ -14,12 +18,14 @@ def has_suit(player, suit):
 
     Note:
         The function does not modify the player's hand or any card within it. It's a read-only operation that can
-        be safely used at any point in the game logic without side effects.
+        be safely used at any point in the game logic without side effects. The check runs on the hand mask of
+        'player.cards'; engine code that already holds a mask, e.g. from 'Game.hands', should call
+        'masks.mask_has_suit' directly.
     """
-    return any(card.suit == suit for card in player.cards)
+    return mask_has_suit(hand_mask(player.cards), suit)
 
 
-def determine_trick_winner(player_moves, trump):
+def determine_trick_winner(player_moves, trump, played=None):
     """
     Determines the winning player in a trick based on the cards played and the rules for trump and lead suits.
 
@@ -31,6 +37,8 @@ def determine_trick_winner(player_moves, trump):
                                          and a Card object representing the card played by that player.
         trump (int): The integer representing the trump suit of the current round. If there is no trump,
                        this could be None.
+        played (int): The mask of the cards played in the trick (see 'whist.masks'), if the caller keeps it, e.g.
+                      'Game.trick_mask'. Built from player_moves if None.
 
     Returns:
         int: The position of the player who won the current trick. This is the index in the game's player list,
@@ -38,24 +46,19 @@ def determine_trick_winner(player_moves, trump):
 
     Note:
         The function assumes that player_moves is not empty and that each player plays exactly one card in the trick.
+        The winner is found on the mask of the played cards with 'masks.winning_card', as in 'masks.trick_winner'.
     """
     if not player_moves:
         raise ValueError("player_moves cannot be empty")
 
-    lead_suit = player_moves[0][1].suit
-    max_trump_value = 0
-    max_lead_suit_value = 0
-    winning_player_pos = player_moves[0][0]
-    for i, move in enumerate(player_moves):
-        player_pos = move[0]
-        card = move[1]
-        if card.suit == trump and card.value > max_trump_value:
-            max_trump_value = card.value
-            winning_player_pos = player_pos
-        elif card.suit == lead_suit and card.value > max_lead_suit_value and max_trump_value == 0:
-            max_lead_suit_value = card.value
-            winning_player_pos = player_pos
-    return winning_player_pos
+    if played is None:
+        played = 0
+        for move in player_moves:
+            played |= CARD_BITS[move[1].index]
+    best = winning_card(played, player_moves[0][1].suit, trump)
+    for move in player_moves:
+        if move[1].index == best:
+            return move[0]
 
 
 def determine_hand_size(num_players, round_number):
@@ -69,6 +72,8 @@ def determine_hand_size(num_players, round_number):
     - Next 6 rounds: Hand size decrements sequentially from 7 to 2.
     - Last X rounds: Hand size is 1.
 
+    The sizes are looked up in the shared schedule of the player count (see 'whist.schedule').
+
     Args:
         num_players (int): The number of players participating in the game.
         round_number (int): The current round number.
@@ -79,28 +84,7 @@ def determine_hand_size(num_players, round_number):
     Raises:
         ValueError: If the round number is out of the expected range based on the game structure.
     """
-    total_rounds = 3 * num_players + 12
-    third_phase_start = num_players + 7  # Start of the third phase
-    fifth_phase_start = 2 * num_players + 13  # Start of the fifth phase
-
-    if round_number <= num_players:
-        # First phase: increasing from 1 up to 1 (constant)
-        return 1
-    elif num_players < round_number <= num_players + 6:
-        # Second phase: increasing from 2 to 7
-        return round_number - num_players + 1
-    elif third_phase_start <= round_number <= third_phase_start + num_players - 1:
-        # Third phase: constant at 8
-        return 8
-    elif third_phase_start + num_players <= round_number <= third_phase_start + num_players + 5:
-        # Fourth phase: decreasing from 7 to 2
-        return 8 - (round_number - (third_phase_start + num_players - 1))
-    elif fifth_phase_start <= round_number <= total_rounds:
-        # Fifth phase: constant at 1
-        return 1
-    else:
-        # This condition should not normally be hit unless an invalid round_number is provided
-        raise ValueError("Invalid round number")
+    return round_schedule(num_players).hand_size(round_number)
 
 
 def calculate_score(bid, won_tricks):
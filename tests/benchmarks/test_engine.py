@@ -0,0 +1,44 @@
+import json
+import os
+import unittest
+from benchmarks.engine import run, compare, BENCHMARKS
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run(self):
+        """Test running benchmarks reports their metrics"""
+        results = run(['calculate_score_x81', 'game_3p'], repeat=2)
+        self.assertEqual(set(results['results']), {'calculate_score_x81', 'game_3p'})
+        game = results['results']['game_3p']
+        self.assertGreater(game['games_per_sec'], 0)
+        self.assertGreater(game['peak_traced_bytes_per_game'], 0)
+        self.assertLessEqual(game['p50_us'], game['p99_us'])
+
+    def test_all_benchmarks_listed(self):
+        """Test every engine hot path and player count is covered"""
+        self.assertIn('play_round_4p_8cards', BENCHMARKS)
+        self.assertIn('batch_play_round_4p_8cards', BENCHMARKS)
+        self.assertIn('solve_6p_8cards', BENCHMARKS)
+        self.assertIn('solve_6p_8cards_500ms', BENCHMARKS)
+        self.assertTrue(all(f'game_{n}p' in BENCHMARKS for n in range(3, 7)))
+
+    def test_baseline(self):
+        """Test the committed baseline covers every benchmark"""
+        path = os.path.join(os.path.dirname(__file__), '..', '..', 'benchmarks', 'baselines', 'reference.json')
+        with open(path) as f:
+            baseline = json.load(f)
+        self.assertEqual(set(baseline['results']), set(BENCHMARKS))
+
+    def test_compare(self):
+        """Test regressions are reported in the worse direction of every metric only"""
+        baseline = {'results': {'deal_cards': {'ops_per_sec': 1000, 'p50_us': 10}}}
+        faster = {'results': {'deal_cards': {'ops_per_sec': 2000, 'p50_us': 5}}}
+        slower = {'results': {'deal_cards': {'ops_per_sec': 800, 'p50_us': 12}}}
+        self.assertEqual(compare(baseline, faster), [])
+        self.assertEqual(len(compare(baseline, slower, threshold=0.1)), 2)
+        self.assertEqual(compare(baseline, slower, threshold=0.25), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,15 @@
+from src.whist import Player
+
+
+class FirstCardPlayer(Player):
+    """A deterministic player: bids the lowest legal bid and plays the first legal card of its hand"""
+
+    def make_bid(self, is_last, total_bid):
+        return 1 if is_last and total_bid == len(self.cards) else 0
+
+    def play_card(self, is_first, lead_suit, trump):
+        for suit in (lead_suit, trump):
+            for i, card in enumerate(self.cards):
+                if not is_first and card.suit == suit:
+                    return self.cards.pop(i)
+        return self.cards.pop(0)
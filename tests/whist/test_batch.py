@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+from src.whist import Card
+from src.whist.batch import BatchGame, deck_indices, random_bid_policy, random_card_policy
+from src.whist.masks import card_index, CARD_SUITS, CARD_VALUES
+from src.whist.utils import determine_trick_winner, calculate_score
+
+
+class TestBatchGame(unittest.TestCase):
+
+    def setUp(self):
+        self.game = BatchGame(4, 200, rng=7)
+
+    def test_invalid_player_count(self):
+        """Test batch creation with an invalid number of players raises errors"""
+        with self.assertRaises(ValueError):
+            BatchGame(2, 10)
+        with self.assertRaises(ValueError):
+            BatchGame(7, 10)
+
+    def test_deck_indices(self):
+        """Test the batch deck matches the cards of Deck"""
+        for num_players in range(3, 7):
+            expected = {card_index(i, j) for i in range(3 + (6 - num_players) * 2, 16) if i != 11 for j in range(4)}
+            self.assertSetEqual(set(deck_indices(num_players).tolist()), expected)
+
+    def test_deal_cards(self):
+        """Test every player gets hand_size distinct cards and the trump is set for small hands"""
+        self.game.deal_cards(5)
+        self.assertTrue((self.game.hands.sum(axis=2) == 5).all())
+        self.assertTrue((self.game.hands.sum(axis=1) <= 1).all())
+        self.assertTrue(((self.game.trump >= 0) & (self.game.trump < 4)).all())
+        self.game.deal_cards(8)
+        self.assertTrue((self.game.trump == -1).all())
+
+    def test_legal_cards(self):
+        """Test legal cards follow the lead suit, then trump, then anything"""
+        game = BatchGame(3, 1)
+        hand = [card_index(7, 0), card_index(8, 1), card_index(9, 2)]
+        game.hands[0, 0, hand] = True
+        game.trump[:] = 1
+        seats = np.array([0])
+        self.assertEqual(np.flatnonzero(game.legal_cards(seats, np.array([-1]))).tolist(), hand)
+        self.assertEqual(np.flatnonzero(game.legal_cards(seats, np.array([0]))).tolist(), [hand[0]])
+        self.assertEqual(np.flatnonzero(game.legal_cards(seats, np.array([3]))).tolist(), [hand[1]])
+        game.trump[:] = -1
+        self.assertEqual(np.flatnonzero(game.legal_cards(seats, np.array([3]))).tolist(), hand)
+
+    def test_legal_bids_last_player(self):
+        """Test the last bidder cannot make the total equal to the hand size"""
+        self.game.deal_cards(3)
+        legal = self.game.legal_bids(3, np.full(200, 1))
+        self.assertFalse(legal[:, 2].any())
+        self.assertTrue(legal[:, [0, 1, 3]].all())
+        self.assertTrue(self.game.legal_bids(3, np.full(200, 5)).all())
+
+    def test_trick_winners_match_determine_trick_winner(self):
+        """Test the vectorized trick resolution agrees with determine_trick_winner"""
+        rng = np.random.default_rng(3)
+        game = BatchGame(4, 500)
+        cards = np.array([rng.permutation(52)[:4] for _ in range(500)])
+        game.trump = rng.integers(-1, 4, size=500)
+        lead = rng.integers(0, 4, size=500)
+        lead_suit = np.array(CARD_SUITS)[cards[np.arange(500), lead]]
+        winners = game.determine_trick_winners(cards, lead_suit)
+        for i in range(500):
+            moves = [((lead[i] + k) % 4, Card(CARD_VALUES[cards[i, (lead[i] + k) % 4]],
+                                              CARD_SUITS[cards[i, (lead[i] + k) % 4]])) for k in range(4)]
+            trump = None if game.trump[i] < 0 else game.trump[i]
+            self.assertEqual(winners[i], determine_trick_winner(moves, trump))
+
+    def test_illegal_card(self):
+        """Test a policy playing an illegal card raises errors"""
+        self.game.deal_cards(2)
+        self.game.make_bids(random_bid_policy)
+        with self.assertRaises(ValueError):
+            self.game.play_trick(lambda game, seats, legal: np.argmin(legal, axis=1))
+
+    def test_play_round(self):
+        """Test a full round deals out every card, awards every trick and scores with calculate_score"""
+        round_scores = self.game.play_round(7, random_bid_policy, random_card_policy)
+        self.assertFalse(self.game.hands.any())
+        self.assertTrue((self.game.won_tricks.sum(axis=1) == 4).all())
+        for i in range(200):
+            for j in range(4):
+                self.assertEqual(round_scores[i, j], calculate_score(self.game.bids[i, j], self.game.won_tricks[i, j]))
+        np.testing.assert_array_equal(self.game.scores, round_scores)
+
+    def test_seeded_games_are_reproducible(self):
+        """Test two batches with the same seed play the same games"""
+        scores1 = BatchGame(3, 20, rng=11).play_game(random_bid_policy, random_card_policy)
+        scores2 = BatchGame(3, 20, rng=11).play_game(random_bid_policy, random_card_policy)
+        np.testing.assert_array_equal(scores1, scores2)
+
+
+if __name__ == '__main__':
+    unittest.main()
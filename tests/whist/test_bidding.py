@@ -0,0 +1,106 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.whist import Game
+from src.whist.batch import BatchGame, greedy_card_policy, random_bid_policy
+from src.whist.bidding import BidEstimator, BidEstimatorMixin, best_bid, simulate_tricks, VERSION
+from src.whist.masks import card_index
+from src.whist.pimc import PIMCPlayer
+from tests.whist.helpers import FirstCardPlayer
+
+
+def mask(*cards):
+    result = 0
+    for value, suit in cards:
+        result |= 1 << card_index(value, suit)
+    return result
+
+
+class TestBidding(unittest.TestCase):
+
+    def test_simulate_tricks(self):
+        """Test the distribution sums to one and strong hands expect more tricks"""
+        strong = simulate_tricks(mask((15, 0), (14, 0), (13, 0)), card_index(9, 0), 0, 4, 2000, 0)
+        weak = simulate_tricks(mask((7, 1), (8, 2), (9, 3)), card_index(9, 0), 0, 4, 2000, 0)
+        self.assertEqual(len(strong), 4)
+        self.assertAlmostEqual(strong.sum(), 1)
+        self.assertEqual(strong[3], 1)
+        self.assertGreater(weak[0], 0.5)
+
+    def test_best_bid(self):
+        """Test the best bid follows the distribution and the last bidder rule"""
+        distribution = np.array([0.1, 0.8, 0.1])
+        self.assertEqual(best_bid(distribution, False, 0), 1)
+        self.assertEqual(best_bid(distribution, True, 0), 1)
+        # The last player cannot bid 1 after a total of 1, and bidding 2 loses less than bidding 0
+        self.assertEqual(best_bid(distribution, True, 1), 2)
+
+    def test_greedy_card_policy(self):
+        """Test the greedy policy plays whole rounds of legal cards"""
+        game = BatchGame(5, 100, rng=3)
+        for round_number in (3, 8, 14):
+            game.play_round(round_number, random_bid_policy, greedy_card_policy)
+        self.assertFalse(game.hands.any())
+
+    def test_cache(self):
+        """Test estimates are cached per canonical key and persist across estimators"""
+        hand = mask((15, 0), (12, 1), (6, 2))
+        swapped = mask((15, 0), (12, 3), (6, 1))
+        with tempfile.TemporaryDirectory() as cache_dir:
+            estimator = BidEstimator(4, num_samples=500, cache_dir=cache_dir)
+            first = estimator.distribution(hand, card_index(8, 0), 2)
+            self.assertIs(estimator.distribution(swapped, card_index(8, 0), 2), first)
+            self.assertEqual(estimator.misses, 1)
+            # Single-card rounds use the exact tables
+            single = estimator.distribution(mask((15, 0)), card_index(8, 0), 2)
+            self.assertEqual(list(single), [0, 1])
+            estimator.save()
+            self.assertIn(os.path.basename(estimator.path), os.listdir(cache_dir))
+            self.assertTrue(estimator.path.endswith(f"_v{VERSION}.npz"))
+
+            reloaded = BidEstimator(4, num_samples=500, cache_dir=cache_dir)
+            np.testing.assert_array_equal(reloaded.distribution(hand, card_index(8, 0), 2), first)
+            self.assertEqual(reloaded.misses, 0)
+
+    def test_pimc_player(self):
+        """Test PIMC players bid from the estimator and respect the last bidder rule"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            estimator = BidEstimator(4, num_samples=200, cache_dir=cache_dir, persistent=False)
+            players = [PIMCPlayer(f"Bot {i + 1}", budget_ms=5, processes=0, seed=i, estimator=estimator)
+                       for i in range(4)]
+            game = Game(players, verbose=False, rng=random.Random(1))
+            # Round 8 of a 4 player game is played with 5 cards
+            game.play_round(8)
+            self.assertNotEqual(sum(game.current_bids), 5)
+            self.assertEqual(estimator.misses, 4)
+            self.assertEqual(os.listdir(cache_dir), [])
+
+    def test_mixin(self):
+        """Test the mixin bids from the estimator and keeps the cards of the player class"""
+        class Bot(BidEstimatorMixin, FirstCardPlayer):
+            pass
+
+        estimator = BidEstimator(4, num_samples=200, persistent=False)
+        players = [Bot(f"Bot {i + 1}", estimator=estimator) for i in range(4)]
+        game = Game(players, verbose=False, rng=random.Random(2))
+        bids = []
+        original = estimator.make_bid
+
+        def make_bid(player, is_last, total_bid):
+            bids.append(original(player, is_last, total_bid))
+            return bids[-1]
+
+        estimator.make_bid = make_bid
+        # Round 8 of a 4 player game is played with 5 cards
+        game.play_round(8)
+        self.assertEqual(len(bids), 4)
+        self.assertEqual(sorted(game.current_bids), sorted(bids))
+        self.assertNotEqual(sum(game.current_bids), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import itertools
+import os
+import tempfile
+import unittest
+from src.whist.batch import deck_indices
+from src.whist.bidding import best_bid
+from src.whist.bidtables import win_probability, compute_tables, load_tables, single_card_bid, \
+    table_index, VERSION
+from src.whist.masks import card_index, trick_winner
+
+
+class TestBidTables(unittest.TestCase):
+
+    def test_win_probability_matches_enumeration(self):
+        """Test the exact probabilities against an enumeration of every deal of a 3 player game"""
+        deck = [int(c) for c in deck_indices(3)]
+        trump_card = card_index(9, 1)
+        for card in (card_index(15, 0), card_index(7, 0), card_index(5, 1), card_index(13, 3)):
+            remaining = [c for c in deck if c not in (card, trump_card)]
+            for seat in range(3):
+                wins = total = 0
+                for others in itertools.permutations(remaining, 2):
+                    hands = list(others)
+                    hands.insert(seat, card)
+                    total += 1
+                    wins += trick_winner(list(enumerate(hands)), 1) == seat
+                self.assertAlmostEqual(win_probability(card, trump_card, seat == 0, 3), wins / total)
+
+    def test_best_bid(self):
+        """Test the single-card bid follows the probability of the trick and the last bidder rule"""
+        self.assertEqual(best_bid((0.1, 0.9), False, 0), 1)
+        self.assertEqual(best_bid((0.9, 0.1), False, 0), 0)
+        # The last player cannot bid 1 when nobody bid 1, nor 0 when someone did
+        self.assertEqual(best_bid((0.1, 0.9), True, 0), 0)
+        self.assertEqual(best_bid((0.9, 0.1), True, 1), 1)
+
+    def test_tables(self):
+        """Test the table entries outside the deck are marked as invalid"""
+        probabilities, bids = compute_tables(6)
+        self.assertEqual(bids.shape, (13, 2, 13, 6, 6))
+        self.assertEqual(bids[(*table_index(card_index(15, 0), card_index(15, 0)), 0, 0)], -1)
+        self.assertEqual(probabilities[(*table_index(card_index(15, 1), card_index(3, 1)), 0)], 1.0)
+
+    def test_table_index(self):
+        """Test the cards of every plain suit share their entries, which match the exact probabilities"""
+        probabilities = compute_tables(4)[0]
+        trump_card = card_index(9, 2)
+        for card in (card_index(13, 0), card_index(13, 1), card_index(13, 3)):
+            self.assertEqual(table_index(card, trump_card), table_index(card_index(13, 0), trump_card))
+            self.assertAlmostEqual(probabilities[(*table_index(card, trump_card), 1)],
+                                   win_probability(card, trump_card, False, 4))
+        self.assertNotEqual(table_index(card_index(13, 2), trump_card), table_index(card_index(13, 0), trump_card))
+
+    def test_load_tables(self):
+        """Test the tables are saved to the cache directory and memory-mapped"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            probabilities, bids = load_tables(3, cache_dir)
+            self.assertEqual(sorted(os.listdir(cache_dir)), [f"single_card_{name}_3_v{VERSION}.npy"
+                                                             for name in ("bids", "probabilities")])
+            self.assertEqual(bids.shape, (13, 2, 13, 3, 3))
+            self.assertIs(load_tables(3, cache_dir)[1], bids)
+            # The Ace of trumps always takes the trick
+            self.assertEqual(single_card_bid(3, card_index(15, 2), card_index(9, 2), 1, 0, cache_dir), 1)
+            del probabilities, bids
+
+
+if __name__ == '__main__':
+    unittest.main()
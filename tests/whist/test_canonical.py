@@ -0,0 +1,100 @@
+import random
+import unittest
+
+from src.whist.canonical import bidding_key, canonical_card, canonical_hand, canonical_hands, compress_ranks, \
+    canonical_position, deck_ranks, expand_ranks, original_card, permute_mask, position_key, restore_mask
+from src.whist.masks import card_index, iter_indices, CARD_BITS, SUIT_MASKS
+
+
+def mask(*cards):
+    result = 0
+    for value, suit in cards:
+        result |= CARD_BITS[card_index(value, suit)]
+    return result
+
+
+def swap_suits(hand, a, b):
+    perm = list(range(4))
+    perm[a], perm[b] = b, a
+    return permute_mask(hand, tuple(perm))
+
+
+class TestCanonical(unittest.TestCase):
+
+    def test_round_trip(self):
+        """Test hands and cards map to the canonical suits and back"""
+        rng = random.Random(0)
+        for _ in range(50):
+            hand = sum(CARD_BITS[c] for c in rng.sample(range(52), 8))
+            trump = rng.choice([None, 0, 1, 2, 3])
+            canonical, perm = canonical_hand(hand, trump)
+            self.assertEqual(restore_mask(canonical, perm), hand)
+            self.assertEqual(canonical.bit_count(), 8)
+            if trump is not None:
+                self.assertEqual(canonical & SUIT_MASKS[0], permute_mask(hand & SUIT_MASKS[trump], perm))
+            for card in iter_indices(hand):
+                self.assertTrue(canonical & CARD_BITS[canonical_card(card, perm)])
+                self.assertEqual(original_card(canonical_card(card, perm), perm), card)
+
+    def test_suit_isomorphism(self):
+        """Test hands and deals that only differ by swapping plain suits share their canonical form"""
+        hand = mask((15, 0), (3, 1), (9, 1), (12, 2))
+        self.assertEqual(canonical_hand(hand, 0)[0], canonical_hand(swap_suits(hand, 1, 3), 0)[0])
+        self.assertNotEqual(canonical_hand(hand, 0)[0], canonical_hand(swap_suits(hand, 0, 3), 0)[0])
+        self.assertEqual(canonical_hand(hand, None)[0], canonical_hand(swap_suits(hand, 0, 3), None)[0])
+
+        hands = [mask((15, 1), (3, 2)), mask((14, 2), (4, 1)), mask((13, 3), (5, 0))]
+        swapped = [swap_suits(h, 1, 2) for h in hands]
+        self.assertEqual(canonical_hands(hands, 0)[0], canonical_hands(swapped, 0)[0])
+        masks, perm = canonical_hands(hands, 3)
+        self.assertEqual([restore_mask(m, perm) for m in masks], hands)
+
+    def test_ranks(self):
+        """Test holdings are renumbered over the live ranks and mapped back"""
+        live = deck_ranks(4)
+        # A 4 player deck starts at the 7: the 7, 9 and Ace are the 1st, 3rd and 8th ranks
+        holding = mask((7, 0), (9, 0), (15, 0))
+        self.assertEqual(compress_ranks(holding, live), 0b10000101)
+        self.assertEqual(expand_ranks(compress_ranks(holding, live), live), holding)
+        self.assertEqual(deck_ranks(6).bit_count(), 12)
+
+    def test_bidding_key(self):
+        """Test equivalent bidding positions share a key: plain suits swapped and trumps renumbered"""
+        hand = mask((15, 0), (14, 0), (15, 1), (7, 2), (8, 3))
+        key = bidding_key(hand, card_index(9, 0), 1, 4)
+        self.assertEqual(bidding_key(swap_suits(hand, 1, 2), card_index(9, 0), 1, 4), key)
+        # With the 10 of trumps turned up, the 9 and the King of trumps rank like the 10 and the King with the 9 up
+        self.assertEqual(bidding_key(mask((9, 0), (14, 0)), card_index(10, 0), 0, 4),
+                         bidding_key(mask((10, 0), (14, 0)), card_index(9, 0), 0, 4))
+        self.assertNotEqual(bidding_key(hand, card_index(9, 0), 2, 4), key)
+        self.assertNotEqual(bidding_key(hand, card_index(9, 1), 1, 4), key)
+        self.assertEqual(bidding_key(hand, None, 1, 4)[1], -1)
+
+    def test_position_key(self):
+        """Test positions differing by plain suits or by the ranks of played cards share a key"""
+        hands = [mask((15, 0), (3, 1)), mask((14, 1), (9, 2)), mask((4, 2), (13, 3))]
+        key = position_key(hands, 0, 1)
+        self.assertEqual(position_key([swap_suits(h, 2, 3) for h in hands], 0, 1), key)
+        self.assertNotEqual(position_key([swap_suits(h, 0, 3) for h in hands], 0, 1), key)
+        self.assertNotEqual(position_key(hands, 0, 2), key)
+        # Lowering the 9 of Diamonds to the 5 keeps it between the 4 and the King
+        lowered = [hands[0], mask((14, 1), (5, 2)), hands[2]]
+        self.assertEqual(position_key(lowered, 0, 1), key)
+        # Moving a card to another player changes the position
+        moved = [mask((15, 0)), mask((14, 1), (9, 2), (3, 1)), hands[2]]
+        self.assertNotEqual(position_key(moved, 0, 1), key)
+
+    def test_canonical_position(self):
+        """Test the suit permutation of a position maps its canonical suits back to the original ones"""
+        hands = [mask((15, 0), (3, 1)), mask((14, 1), (9, 2)), mask((4, 2), (13, 3))]
+        key, perm = canonical_position(hands, 0, 1)
+        self.assertEqual(key, position_key(hands, 0, 1))
+        self.assertEqual(perm[0], 0)
+        swapped, swapped_perm = canonical_position([swap_suits(h, 2, 3) for h in hands], 0, 1)
+        self.assertEqual(swapped, key)
+        # The canonical suit holding the 9 of Diamonds is the one holding the 9 of Clubs once the suits are swapped
+        self.assertEqual(swapped_perm[perm.index(2)], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
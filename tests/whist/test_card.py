@@ -1,5 +1,7 @@
+import pickle
 import unittest
 from src.whist import Card
+from src.whist.card import CARDS
 
 
 class TestCard(unittest.TestCase):
@@ -51,6 +53,20 @@ class TestCard(unittest.TestCase):
         card = Card(12, 2)  # Jack of Diamonds
         self.assertEqual(str(card), "Jack of Diamonds")
 
+    def test_card_interned(self):
+        """Test cards are interned, hashable and indexed in the card table"""
+        card = Card(14, 3)  # King of Clubs
+        self.assertIs(card, Card(14, 3))
+        self.assertIs(CARDS[card.index], card)
+        self.assertEqual(len(set(CARDS)), 52)
+        self.assertEqual({card: 1}[Card(14, 3)], 1)
+        self.assertIs(pickle.loads(pickle.dumps(card)), card)
+
+    def test_card_immutable(self):
+        """Test the attributes of a card cannot be changed"""
+        with self.assertRaises(AttributeError):
+            Card(3, 0).value = 4
+
 
 if __name__ == '__main__':
     unittest.main()
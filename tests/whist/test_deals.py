@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.whist import Game, Player, Deck
+from src.whist.deals import base_deck, generate_deals, write_deals, read_deals
+
+
+class TestDeals(unittest.TestCase):
+
+    def test_generate_deals(self):
+        """Test every generated deal is a permutation of the deck"""
+        deals = generate_deals(4, 1000, 0)
+        self.assertEqual(deals.shape, (1000, 32))
+        self.assertTrue((np.sort(deals, axis=1) == np.sort(base_deck(4))).all())
+        self.assertGreater(len({deal.tobytes() for deal in deals}), 990)
+
+    def test_generate_deals_seeded(self):
+        """Test the same seed gives the same deals"""
+        self.assertTrue((generate_deals(6, 10, 7) == generate_deals(6, 10, np.random.default_rng(7))).all())
+        self.assertFalse((generate_deals(6, 10, 7) == generate_deals(6, 10, 8)).all())
+
+    def test_deal_file(self):
+        """Test writing deals to a deal file and memory-mapping them back"""
+        deals = generate_deals(5, 20, 1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "eval.deals")
+            write_deals(path, deals, 5)
+            self.assertEqual(os.path.getsize(path), 32 + 20 * 40)
+            num_players, loaded = read_deals(path)
+            self.assertEqual(num_players, 5)
+            self.assertTrue((loaded == deals).all())
+            del loaded
+
+    def test_invalid_deal_file(self):
+        """Test invalid deals and files are rejected"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "eval.deals")
+            with self.assertRaises(ValueError):
+                write_deals(path, generate_deals(5, 2, 0), 4)
+            with open(path, 'wb') as f:
+                f.write(b'not a deal file' * 4)
+            with self.assertRaises(ValueError):
+                read_deals(path)
+
+    def test_deck_from_deal(self):
+        """Test a deck built from a deal draws its cards from the end"""
+        deal = generate_deals(3, 1, 0)[0]
+        deck = Deck(3, verbose=False, indices=deal)
+        self.assertEqual(deck.draw().index, deal[-1])
+        with self.assertRaises(ValueError):
+            Deck(3, verbose=False, indices=deal[:-1])
+
+    def test_game_deals(self):
+        """Test games given the same deals deal the same cards"""
+        deals = generate_deals(4, 2, 3)
+        hands = []
+        for _ in range(2):
+            players = [Player(f"Player {i + 1}") for i in range(4)]
+            game = Game(players, verbose=False, deals=deals)
+            game.start_round(6)
+            hands.append([list(player.cards) for player in players])
+            self.assertEqual(game.deck.trump_card.index, deals[0][-13])
+        self.assertEqual(hands[0], hands[1])
+
+    def test_game_deals_run_out(self):
+        """Test a game asking for more rounds than it has deals raises a ValueError"""
+        players = [Player(f"Player {i + 1}") for i in range(4)]
+        game = Game(players, verbose=False, deals=generate_deals(4, 1, 3))
+        game.start_round(6)
+        with self.assertRaises(ValueError):
+            game.start_round(7)
+
+
+if __name__ == '__main__':
+    unittest.main()
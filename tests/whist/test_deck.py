@@ -1,4 +1,6 @@
+import io
 import unittest
+from contextlib import redirect_stdout
 from src.whist import Deck, Card
 
 
@@ -45,6 +47,15 @@ class TestDeck(unittest.TestCase):
         deck.set_trump()
         self.assertEqual(expected_trump_card, deck.trump_card)
 
+    def test_quiet_trump(self):
+        """Test that a quiet deck does not print the trump card"""
+        deck = Deck(4, verbose=False)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            deck.set_trump()
+        self.assertEqual(output.getvalue(), "")
+        self.assertIsNotNone(deck.trump)
+
     def test_empty_deck_trump(self):
         """Test setting the trump card for an empty deck raises errors"""
         deck = Deck(4)
@@ -59,6 +70,13 @@ class TestDeck(unittest.TestCase):
         drawn_card = deck.draw()
         self.assertEqual(drawn_card, expected_card)
 
+    def test_draw_interned(self):
+        """Test drawing returns the interned cards"""
+        deck = Deck(6, verbose=False)
+        drawn = [deck.draw() for _ in range(48)]
+        self.assertTrue(all(card is Card(card.value, card.suit) for card in drawn))
+        self.assertEqual(len(set(drawn)), 48)
+
     def test_draw_empty_deck(self):
         """Test drawing a card from an empty deck raises errors"""
         deck = Deck(4)
@@ -0,0 +1,107 @@
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+from src.whist.env import WhistEnv, BID, PLAY, OBSERVATION_SIZE, NUM_ACTIONS, encode_observation, encode_legal_mask
+from src.whist.masks import iter_indices
+from src.whist.pipeline import EventRecorder
+from src.whist.utils import calculate_score
+
+
+class TestWhistEnv(unittest.TestCase):
+
+    def setUp(self):
+        self.env = WhistEnv(4)
+
+    def play_random(self, env, seed=0):
+        rng = random.Random(seed)
+        obs = env.reset()
+        totals = [0] * env.num_players
+        done = False
+        while not done:
+            obs, rewards, done, info = env.step(rng.choice(obs['legal_actions']))
+            totals = [t + r for t, r in zip(totals, rewards)]
+        return totals
+
+    def test_invalid_player_count(self):
+        """Test environment creation with an invalid number of players raises errors"""
+        with self.assertRaises(ValueError):
+            WhistEnv(2)
+
+    def test_reset(self):
+        """Test reset deals the first round and starts the bidding with the lead player"""
+        obs = self.env.reset()
+        self.assertEqual(obs['phase'], BID)
+        self.assertEqual(obs['player'], 0)
+        self.assertEqual(obs['hand_size'], 1)
+        self.assertEqual(len(list(iter_indices(obs['hand']))), 1)
+        self.assertIsNotNone(obs['trump'])
+        self.assertEqual(obs['legal_actions'], [0, 1])
+        self.assertEqual(obs['bids'], [None] * 4)
+
+    def test_last_bidder_restriction(self):
+        """Test the last bidder cannot make the total bids equal to the hand size"""
+        obs = self.env.reset()
+        for i in range(3):
+            obs, _, _, _ = self.env.step(0)
+        self.assertEqual(obs['legal_actions'], [0])
+        obs, _, _, _ = self.env.step(0)
+        self.assertEqual(obs['phase'], PLAY)
+
+    def test_illegal_action(self):
+        """Test illegal actions raise errors"""
+        self.env.reset()
+        with self.assertRaises(ValueError):
+            self.env.step(2)
+
+    def test_round_rewards(self):
+        """Test the rewards at the end of a round are the scores of calculate_score"""
+        env = WhistEnv(3, rounds=[5])
+        obs = env.reset()
+        rng = random.Random(1)
+        done = False
+        while not done:
+            obs, rewards, done, info = env.step(rng.choice(obs['legal_actions']))
+        expected = [calculate_score(bid, won) for bid, won in zip(env.game.current_bids, env.game.current_won_tricks)]
+        self.assertEqual(rewards, expected)
+        self.assertEqual(sum(env.game.current_won_tricks), 3)
+        self.assertIsNone(obs)
+        with self.assertRaises(RuntimeError):
+            env.step(0)
+
+    def test_full_game_is_quiet(self):
+        """Test a full game can be played without printing anything and the rewards add up to the scores"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            totals = self.play_random(self.env)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(totals, self.env.scores())
+        self.assertTrue(self.env.done)
+
+    def test_events_reach_the_sink(self):
+        """Test every bid and card of an episode is reported to the sink, as in a game played by Game"""
+        recorder = EventRecorder()
+        env = WhistEnv(3, rounds=[5], sink=recorder)
+        obs = env.reset()
+        rng = random.Random(2)
+        done = False
+        while not done:
+            obs, rewards, done, info = env.step(rng.choice(obs['legal_actions']))
+        kinds = [event[0] for event in recorder.events]
+        self.assertEqual(kinds.count('bid'), 3)
+        self.assertEqual(kinds.count('move'), 9)
+        self.assertEqual(kinds[-1], 'round_end')
+
+    def test_encode(self):
+        """Test observations and legal actions are encoded as fixed-size vectors"""
+        obs = self.env.reset()
+        encoded = encode_observation(obs)
+        self.assertEqual(len(encoded), OBSERVATION_SIZE)
+        self.assertEqual(sum(encoded[:52]), 1)
+        mask = encode_legal_mask(obs)
+        self.assertEqual(len(mask), NUM_ACTIONS)
+        self.assertEqual([i for i, legal in enumerate(mask) if legal], [52, 53])
+
+
+if __name__ == '__main__':
+    unittest.main()
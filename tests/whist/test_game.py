@@ -1,5 +1,6 @@
 import unittest
 from src.whist import Game, Player, Card
+from src.whist.masks import hand_mask
 from unittest.mock import patch
 
 
@@ -35,4 +36,28 @@ class TestGame(unittest.TestCase):
             self.assertEqual(self.game.player_moves[0][1], expected_first_card,
                              "The first card played was not as expected")
             self.assertEqual(self.game.player_moves[0][0], 0, "The first player did not play the first card")
-            
+
+    def test_make_bids_passes_total_bid(self):
+        """Test make_bids passes the running total of the bids to every player."""
+        with patch.object(Player, 'make_bid', side_effect=[1, 0, 2, 0]) as mock_make_bid:
+            self.game.make_bids(3)
+            self.assertEqual([c.args for c in mock_make_bid.call_args_list],
+                             [(False, 0), (False, 1), (False, 1), (True, 3)])
+            self.assertEqual(self.game.current_bids, [1, 0, 2, 0])
+
+    def test_play_trick_rejects_illegal_card(self):
+        """Test play_trick raises a ValueError when a player does not follow the lead suit."""
+        # Bob holds the 8 of Hearts but plays the 7 of Diamonds
+        cards_to_play = [Card(14, 0), Card(7, 2)]
+        with patch.object(Player, 'play_card', side_effect=cards_to_play):
+            with self.assertRaises(ValueError):
+                self.game.play_trick(trump=None)
+
+    def test_play_trick_tracks_hands(self):
+        """Test play_trick removes the played cards from the hand masks."""
+        cards_to_play = [Card(14, 0), Card(8, 0), Card(12, 3), Card(8, 1)]
+        with patch.object(Player, 'play_card', side_effect=cards_to_play):
+            self.game.play_trick(trump=0)
+        for player, card in zip(self.game.players, cards_to_play):
+            player.cards.remove(card)
+        self.assertEqual(self.game.hands, [hand_mask(player.cards) for player in self.game.players])
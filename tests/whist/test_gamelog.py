@@ -0,0 +1,77 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from src.whist import Game, Card
+from src.whist.gamelog import GameLogWriter, EventSink, read_events
+from tests.whist.helpers import FirstCardPlayer
+
+
+class RecordingSink(EventSink):
+
+    def __init__(self):
+        self.events = []
+
+    def on_bid(self, player_pos, bid):
+        self.events.append(('bid', (player_pos, bid)))
+
+    def on_move(self, player_pos, card):
+        self.events.append(('move', (player_pos, card.index)))
+
+
+class TestGameLog(unittest.TestCase):
+
+    def play(self, sink, rounds=(4, 5)):
+        players = [FirstCardPlayer(f"Player {i + 1}") for i in range(3)]
+        game = Game(players, verbose=False, rng=random.Random(0), sink=sink)
+        for round_number in rounds:
+            game.play_round(round_number)
+        return game
+
+    def test_round_trip(self):
+        """Test the events written by a game are read back in order"""
+        buffer = io.BytesIO()
+        writer = GameLogWriter(buffer, buffer_size=16)
+        self.play(writer)
+        writer.close()
+        buffer.seek(0)
+        events = list(read_events(buffer, chunk_size=7))
+        names = [name for name, _ in events]
+        self.assertEqual(names[0], 'game_start')
+        self.assertEqual(events[0][1], (3,))
+        # Round 4 of a 3 player game has 2 cards each, round 5 has 3 cards each
+        self.assertEqual(names.count('deal'), 2)
+        self.assertEqual(names.count('trump'), 2)
+        self.assertEqual(names.count('bid'), 6)
+        self.assertEqual(names.count('move'), 15)
+        self.assertEqual(names[-1], 'round_end')
+        deal = events[1][1]
+        self.assertEqual(deal[:2], (4, 0))
+        self.assertEqual([hand.bit_count() for hand in deal[2:]], [2, 2, 2])
+
+    def test_moves_match_sink(self):
+        """Test the logged bids and moves match the events seen by another sink"""
+        sink = RecordingSink()
+        self.play(sink)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.log")
+            with GameLogWriter(path) as writer:
+                self.play(writer)
+            events = [event for event in read_events(path) if event[0] in ('bid', 'move')]
+        self.assertEqual(events, sink.events)
+
+    def test_invalid_log(self):
+        """Test invalid and truncated logs are rejected"""
+        with self.assertRaises(ValueError):
+            list(read_events(io.BytesIO(b'not a log')))
+        buffer = io.BytesIO()
+        with GameLogWriter(buffer) as writer:
+            writer.on_move(1, Card(15, 0))
+        truncated = io.BytesIO(buffer.getvalue()[:-1])
+        with self.assertRaises(ValueError):
+            list(read_events(truncated))
+
+
+if __name__ == '__main__':
+    unittest.main()
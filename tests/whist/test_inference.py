@@ -0,0 +1,95 @@
+import asyncio
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.whist import Game
+from src.whist.env import NUM_ACTIONS, OBSERVATION_SIZE
+from src.whist.gamelog import EventSink
+from src.whist.inference import InferenceBroker, MLPPolicy, PolicyPlayer, masked_argmax
+
+
+class MoveSink(EventSink):
+
+    def __init__(self):
+        self.events = []
+
+    def on_bid(self, player_pos, bid):
+        self.events.append(('bid', player_pos, bid))
+
+    def on_move(self, player_pos, card):
+        self.events.append(('move', player_pos, card.index))
+
+
+def make_game(broker, seed):
+    players = [PolicyPlayer(f"Bot {i + 1}", broker) for i in range(4)]
+    return Game(players, verbose=False, rng=random.Random(seed), sink=MoveSink())
+
+
+class TestInference(unittest.TestCase):
+
+    def setUp(self):
+        self.model = MLPPolicy.random(hidden_sizes=(32,), seed=0)
+
+    def test_batched_games_match_sync_games(self):
+        """Test concurrent games share forward passes and play the same moves as synchronous games"""
+        broker = InferenceBroker(self.model, max_batch_size=8, max_delay_ms=50)
+        games = [make_game(broker, seed) for seed in range(8)]
+
+        async def play():
+            for round_number in (1, 6, 8):
+                await asyncio.gather(*(game.play_round_async(round_number) for game in games))
+
+        asyncio.run(play())
+        self.assertEqual(broker.decisions, 8 * (4 + 4 + 4 + 12 + 4 + 20))
+        self.assertLess(broker.batches, broker.decisions / 4)
+
+        sync_broker = InferenceBroker(self.model)
+        for seed, game in enumerate(games):
+            sync_game = make_game(sync_broker, seed)
+            for round_number in (1, 6, 8):
+                sync_game.play_round(round_number)
+            self.assertEqual(sync_game.sink.events, game.sink.events)
+            self.assertEqual(sync_game.current_won_tricks, game.current_won_tricks)
+
+    def test_deadline(self):
+        """Test a lone decision is resolved once the deadline passes"""
+        broker = InferenceBroker(self.model, max_batch_size=64, max_delay_ms=1)
+        game = make_game(broker, 0)
+        asyncio.run(game.play_round_async(1))
+        self.assertEqual(broker.decisions, 8)
+        self.assertEqual(broker.batches, 8)
+
+    def test_model_error(self):
+        """Test an error of the model is raised in the waiting games"""
+        def failing_model(observations):
+            raise RuntimeError("model failed")
+
+        game = make_game(InferenceBroker(failing_model), 0)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(game.play_round_async(1))
+
+    def test_masked_argmax(self):
+        """Test illegal actions are never chosen"""
+        logits = np.array([[3.0, 2.0, 1.0], [3.0, 2.0, 1.0]])
+        masks = np.array([[False, True, True], [True, False, False]])
+        self.assertEqual(masked_argmax(logits, masks).tolist(), [1, 0])
+
+    def test_save_load(self):
+        """Test a saved policy is loaded with the same outputs"""
+        observations = np.random.default_rng(0).random((3, OBSERVATION_SIZE), dtype=np.float32)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "policy.npz")
+            self.model.save(path)
+            loaded = MLPPolicy.load(path)
+        self.assertEqual(loaded(observations).shape, (3, NUM_ACTIONS))
+        np.testing.assert_array_equal(loaded(observations), self.model(observations))
+        with self.assertRaises(ValueError):
+            MLPPolicy([np.zeros((OBSERVATION_SIZE, 4))], [np.zeros(4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
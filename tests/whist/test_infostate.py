@@ -0,0 +1,85 @@
+import random
+import unittest
+from unittest.mock import patch
+from src.whist import Game, Card, Deck, Player
+from src.whist.infostate import InformationState
+from src.whist.masks import card_index, hand_mask, CARD_BITS
+
+
+class TestInformationState(unittest.TestCase):
+
+    def setUp(self):
+        self.info = InformationState(3)
+        self.info.start_round(0)
+        # Spades are trumps
+        self.info.set_trump(Card(9, 1))
+
+    def test_start_round(self):
+        """Test a new round has 6 cards of every suit in a 3 player game and only the trump card seen"""
+        self.assertEqual(self.info.remaining, [6, 5, 6, 6])
+        self.assertEqual(self.info.seen, CARD_BITS[card_index(9, 1)])
+        self.assertEqual(self.info.trump, 1)
+
+    def test_voids(self):
+        """Test voids are inferred from players not following the lead suit"""
+        # Player 2 discards a Diamond on Hearts, so they have neither Hearts nor trumps
+        self.info.play_card(0, Card(9, 0))
+        self.info.play_card(1, Card(10, 0))
+        self.info.play_card(2, Card(12, 2))
+        self.info.finish_trick(1)
+        # Player 0 ruffs a Clubs lead, so they have no Clubs
+        self.info.play_card(1, Card(13, 3))
+        self.info.play_card(2, Card(12, 3))
+        self.info.play_card(0, Card(10, 1))
+        self.assertEqual(self.info.voids, [1 << 3, 0, (1 << 0) | (1 << 1)])
+        self.assertEqual(self.info.remaining, [4, 4, 5, 4])
+
+    def test_tricks_needed(self):
+        """Test the tricks still needed by every player"""
+        self.info.set_bid(0, 2)
+        self.info.play_card(0, Card(15, 0))
+        self.assertEqual(self.info.lead_suit, 0)
+        self.info.finish_trick(0)
+        self.assertEqual(self.info.tricks_needed(0), 1)
+        self.assertIsNone(self.info.tricks_needed(1))
+        self.assertEqual(self.info.leader, 0)
+        self.assertIsNone(self.info.lead_suit)
+
+    def test_copy(self):
+        """Test a copy is not affected by updates of the original"""
+        snapshot = self.info.copy()
+        self.info.play_card(0, Card(15, 0))
+        self.info.finish_trick(0)
+        self.assertEqual(snapshot.won, [0, 0, 0])
+        self.assertEqual(snapshot.trick, [])
+        self.assertEqual(snapshot.remaining, [6, 5, 6, 6])
+        self.assertEqual(snapshot.unseen(), snapshot.deck & ~CARD_BITS[card_index(9, 1)])
+
+    def test_deck_sets_trump(self):
+        """Test the deck tells the information state about the trump card"""
+        info = InformationState(4)
+        deck = Deck(4, verbose=False, info=info)
+        deck.set_trump()
+        self.assertEqual(info.trump, deck.trump)
+        self.assertEqual(info.trump_card, card_index(deck.trump_card.value, deck.trump_card.suit))
+
+    def test_game_updates(self):
+        """Test the game keeps its information state in sync with the played cards"""
+        players = [Player(f"Player {i + 1}") for i in range(3)]
+        game = Game(players, verbose=False, rng=random.Random(0))
+        hand_size = game.start_round(5)
+        for pos in range(3):
+            game.info.set_bid(pos, 0)
+        while players[0].cards:
+            moves = []
+            for i in range(3):
+                pos = (game.lead_player_pos + i) % 3
+                moves.append(players[pos].cards.pop())
+            with patch.object(Player, 'play_card', side_effect=moves):
+                game.play_trick(game.deck.trump)
+        self.assertEqual(sum(game.info.won), hand_size)
+        self.assertEqual(game.info.seen & ~CARD_BITS[game.info.trump_card], hand_mask(game.discard_deck))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import time
+import unittest
+
+from src.whist import Game
+from src.whist.ismcts import ISMCTSPlayer, NodePool, NO_NODE
+
+
+class RecordingPlayer(ISMCTSPlayer):
+    """Records the visits kept from earlier decisions at every search"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reused = []
+
+    def _search(self, hand):
+        super()._search(hand)
+        self.reused.append(self.reused_visits)
+
+
+class TestNodePool(unittest.TestCase):
+
+    def test_allocate_and_keep(self):
+        """Test children are linked, kept subtrees survive and everything else returns to the pool"""
+        pool = NodePool(8)
+        root = pool.allocate(NO_NODE, 0, 0)
+        a = pool.allocate(root, 10, 0)
+        b = pool.allocate(root, 11, 0)
+        a1 = pool.allocate(a, 20, 1)
+        b1 = pool.allocate(b, 21, 1)
+        b2 = pool.allocate(b, 22, 1)
+        self.assertEqual(pool.child(root, 11), b)
+        self.assertEqual(pool.child(root, 12), NO_NODE)
+        self.assertEqual(pool.used, 6)
+
+        pool.keep(root, b)
+        self.assertEqual(pool.used, 3)
+        self.assertEqual(pool.parent[b], NO_NODE)
+        self.assertEqual({pool.child(b, 21), pool.child(b, 22)}, {b1, b2})
+        self.assertNotIn(a1, (b1, b2))
+        for _ in range(5):
+            self.assertNotEqual(pool.allocate(b1, 30, 2), NO_NODE)
+        self.assertEqual(pool.allocate(b1, 31, 2), NO_NODE)
+        pool.free(b)
+        self.assertEqual(pool.used, 0)
+
+
+class TestISMCTSPlayer(unittest.TestCase):
+
+    def test_plays_full_round(self):
+        """Test a table of ISMCTS players completes a round with legal bids and cards"""
+        players = [ISMCTSPlayer(f"Bot {i + 1}", iterations=100, seed=i) for i in range(4)]
+        game = Game(players, verbose=False, rng=random.Random(0))
+        # Round 8 of a 4 player game is played with 5 cards
+        game.play_round(8)
+        self.assertEqual(sum(game.current_won_tricks), 5)
+        self.assertNotEqual(sum(game.current_bids), 5)
+        self.assertTrue(all(player.cards == [] for player in players))
+
+    def test_tree_reuse(self):
+        """Test later decisions start from the subtree reached by the cards played since"""
+        players = [RecordingPlayer(f"Bot {i + 1}", iterations=1500, seed=i) for i in range(3)]
+        game = Game(players, verbose=False, rng=random.Random(1))
+        # Round 6 of a 3 player game is played with 4 cards
+        game.play_round(6)
+        # The first search of every player starts a new tree
+        self.assertEqual([player.reused[0] for player in players], [0, 0, 0])
+        self.assertGreater(max(visits for player in players for visits in player.reused[1:]), 0)
+
+    def test_small_pool(self):
+        """Test a full pool stops the tree from growing without stopping the search"""
+        players = [ISMCTSPlayer("Bot", iterations=200, capacity=8, seed=0)] + \
+                  [ISMCTSPlayer(f"Bot {i}", iterations=20, seed=i) for i in range(2)]
+        game = Game(players, verbose=False, rng=random.Random(2))
+        game.play_round(9)
+        self.assertLessEqual(players[0].pool.used, 8)
+        self.assertEqual(sum(game.current_won_tricks), 7)
+
+    def test_budgets(self):
+        """Test the time budget bounds a decision and a budget is required"""
+        players = [ISMCTSPlayer(f"Bot {i + 1}", iterations=None, budget_ms=20, seed=i) for i in range(3)]
+        game = Game(players, verbose=False, rng=random.Random(3))
+        start = time.time()
+        game.play_round(10)
+        self.assertLess(time.time() - start, 3 * 8 * 0.02 + 2)
+        self.assertTrue(any(player.last_iterations > 0 for player in players))
+        with self.assertRaises(ValueError):
+            ISMCTSPlayer("Bot", iterations=None, budget_ms=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
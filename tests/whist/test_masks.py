@@ -0,0 +1,90 @@
+import unittest
+from src.whist import Card
+from src.whist.masks import card_index, hand_mask, iter_indices, to_cards, mask_has_suit, suit_count, legal_mask, \
+    legal_moves, trick_winner, winning_card, NUM_CARDS
+from src.whist.utils import determine_trick_winner
+
+
+class TestMasks(unittest.TestCase):
+
+    def setUp(self):
+        # Hand: 7 of Hearts, 8 of Spades, 9 of Diamonds
+        self.cards = [Card(7, 0), Card(8, 1), Card(9, 2)]
+        self.hand = hand_mask(self.cards)
+
+    def test_card_index_unique(self):
+        """Test every valid card maps to a distinct index between 0 and 51"""
+        indices = {card_index(v, s) for v in range(2, 16) if v != 11 for s in range(4)}
+        self.assertEqual(indices, set(range(NUM_CARDS)))
+
+    def test_card_index_order(self):
+        """Test that higher cards of a suit get higher indices"""
+        self.assertLess(card_index(10, 1), card_index(12, 1))
+        self.assertLess(card_index(14, 1), card_index(15, 1))
+
+    def test_round_trip(self):
+        """Test converting cards to a mask and back gives the same cards"""
+        self.assertEqual(to_cards(self.hand), self.cards)
+        self.assertEqual(len(list(iter_indices(self.hand))), 3)
+
+    def test_has_suit(self):
+        """Test suit checks on a hand mask"""
+        self.assertTrue(mask_has_suit(self.hand, 0))
+        self.assertFalse(mask_has_suit(self.hand, 3))
+        self.assertEqual(suit_count(self.hand, 1), 1)
+
+    def test_legal_mask_first(self):
+        """Test the first player can play any card"""
+        self.assertEqual(legal_mask(self.hand, None, 1), self.hand)
+
+    def test_legal_mask_follow_suit(self):
+        """Test the player must follow the lead suit"""
+        self.assertEqual(legal_mask(self.hand, 0, 2), hand_mask([Card(7, 0)]))
+
+    def test_legal_mask_must_trump(self):
+        """Test the player must trump when void in the lead suit"""
+        self.assertEqual(legal_mask(self.hand, 3, 1), hand_mask([Card(8, 1)]))
+
+    def test_legal_mask_free(self):
+        """Test the player can play anything when void in both the lead suit and trump"""
+        hand = hand_mask([Card(7, 0), Card(8, 1)])
+        self.assertEqual(legal_mask(hand, 3, 2), hand)
+        self.assertEqual(legal_mask(self.hand, 3, None), self.hand)
+
+    def test_legal_moves(self):
+        """Test legal_moves lists the legal card indices and caches them per hand, lead suit and trump"""
+        self.assertEqual(legal_moves(self.hand, 0, 2), (card_index(7, 0),))
+        self.assertEqual(legal_moves(self.hand, None, 1), tuple(iter_indices(self.hand)))
+        hits = legal_moves.cache_info().hits
+        self.assertIs(legal_moves(self.hand, 0, 2), legal_moves(self.hand, 0, 2))
+        self.assertEqual(legal_moves.cache_info().hits, hits + 2)
+
+    def test_trick_winner_matches_determine_trick_winner(self):
+        """Test that trick_winner agrees with determine_trick_winner"""
+        tricks = [
+            [(0, Card(7, 1)), (1, Card(8, 1)), (2, Card(9, 1))],
+            [(0, Card(7, 1)), (1, Card(10, 2)), (2, Card(12, 2))],
+            [(0, Card(10, 1)), (1, Card(8, 2)), (2, Card(9, 1))],
+            [(0, Card(7, 3)), (1, Card(8, 1)), (2, Card(9, 0))],
+            [(2, Card(15, 3)), (0, Card(2, 2)), (1, Card(14, 3))],
+        ]
+        for trump in [None, 0, 1, 2, 3]:
+            for moves in tricks:
+                indexed = [(pos, card_index(card.value, card.suit)) for pos, card in moves]
+                self.assertEqual(trick_winner(indexed, trump), determine_trick_winner(moves, trump))
+
+    def test_winning_card(self):
+        """Test the highest trump wins, otherwise the highest card of the lead suit"""
+        played = hand_mask([Card(10, 1), Card(8, 2), Card(15, 1), Card(15, 3)])
+        self.assertEqual(winning_card(played, 1, 2), card_index(8, 2))
+        self.assertEqual(winning_card(played, 1, None), card_index(15, 1))
+        self.assertEqual(winning_card(played, 1, 0), card_index(15, 1))
+
+    def test_trick_winner_empty(self):
+        """Test that an empty trick raises errors"""
+        with self.assertRaises(ValueError):
+            trick_winner([], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import random
+import time
+import unittest
+from src.whist import Game, Card, Player
+from src.whist.masks import hand_mask, SUIT_MASKS
+from src.whist.pimc import PIMCPlayer, sample_hands, play_out
+
+
+class TestPIMCHelpers(unittest.TestCase):
+
+    def test_sample_hands(self):
+        """Test sampled hands hold the right number of cards and respect the voids"""
+        rng = random.Random(0)
+        unknown = SUIT_MASKS[0] | SUIT_MASKS[1]
+        for _ in range(20):
+            hands = sample_hands(unknown, [0, 5, 5], [0, 1 << 0, 0], rng)
+            self.assertEqual(hands[0], 0)
+            self.assertEqual([hand.bit_count() for hand in hands[1:]], [5, 5])
+            self.assertEqual(hands[1] & hands[2], 0)
+            self.assertEqual(hands[1] & SUIT_MASKS[0], 0)
+            self.assertEqual((hands[1] | hands[2]) & ~unknown, 0)
+
+    def test_play_out(self):
+        """Test playing out a round gives every trick to a player and empties the hands"""
+        rng = random.Random(0)
+        hands = [hand_mask([Card(3, 0), Card(4, 1)]), hand_mask([Card(5, 0), Card(6, 1)]),
+                 hand_mask([Card(7, 0), Card(8, 1)])]
+        won = play_out(hands, None, 0, [], [0, 0, 0], rng)
+        self.assertEqual(sum(won), 2)
+        self.assertEqual(hands, [0, 0, 0])
+
+
+class TestPIMCPlayer(unittest.TestCase):
+
+    def play_round(self, players, round_number):
+        game = Game(players, verbose=False, rng=random.Random(round_number))
+        game.play_round(round_number)
+        return game
+
+    def test_plays_full_round(self):
+        """Test a table of PIMC players completes a round with legal bids and cards"""
+        players = [PIMCPlayer(f"Bot {i + 1}", budget_ms=10, processes=0, seed=i) for i in range(4)]
+        # Round 6 of a 4 player game is played with 3 cards
+        game = self.play_round(players, 6)
+        self.assertEqual(sum(game.current_won_tricks), 3)
+        self.assertNotEqual(sum(game.current_bids), 3)
+        self.assertTrue(all(len(trick) == 4 for trick in game.tricks))
+        self.assertTrue(all(player.cards == [] for player in players))
+
+    def test_follows_suit(self):
+        """Test the card played is always legal"""
+        players = [PIMCPlayer(f"Bot {i + 1}", budget_ms=5, processes=0, seed=i) for i in range(3)]
+        game = Game(players, verbose=False, rng=random.Random(3))
+        game.start_round(9)
+        hands = [hand_mask(player.cards) for player in players]
+        game.make_bids(len(players[0].cards))
+        game.play_trick(game.deck.trump)
+        lead_suit = game.tricks[0][0][1].suit
+        for pos, card in game.tricks[0][1:]:
+            if hands[pos] & SUIT_MASKS[lead_suit]:
+                self.assertEqual(card.suit, lead_suit)
+
+    def test_keeps_winner_for_bid(self):
+        """Test the bot keeps the card that takes the trick it bid for"""
+        players = [PIMCPlayer("Bot", budget_ms=20, processes=0, seed=0), Player("Alice"), Player("Bob")]
+        game = Game(players, verbose=False)
+        game.info.start_round(1)
+        for pos, bid in enumerate([1, 0, 0]):
+            game.info.set_bid(pos, bid)
+        # The bot cannot follow Clubs: discarding the 3 of Spades keeps the Ace of Hearts for the last trick
+        players[0].cards = [Card(15, 0), Card(3, 1)]
+        players[1].cards = [Card(10, 0)]
+        players[2].cards = [Card(9, 0)]
+        game.hands = [hand_mask(player.cards) for player in players]
+        game.info.play_card(1, Card(12, 3))
+        game.info.play_card(2, Card(13, 3))
+        card = players[0].play_card(False, 3, None)
+        self.assertEqual((card.value, card.suit), (3, 1))
+
+    def test_time_budget(self):
+        """Test decisions with worker processes return close to the budget"""
+        players = [PIMCPlayer(f"Bot {i + 1}", budget_ms=30, processes=2, seed=i) for i in range(3)]
+        try:
+            game = Game(players, verbose=False, rng=random.Random(0))
+            game.start_round(10)
+            start = time.perf_counter()
+            bid = players[0].make_bid(False, 0)
+            elapsed = time.perf_counter() - start
+            self.assertIn(bid, range(len(players[0].cards) + 1))
+            self.assertGreater(players[0].samples, 0)
+            # Starting the worker processes is included in the first decision.
+            self.assertLess(elapsed, 2)
+        finally:
+            for player in players:
+                player.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
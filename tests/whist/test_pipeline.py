@@ -0,0 +1,88 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.whist import Game
+from src.whist.env import NUM_ACTIONS, OBSERVATION_SIZE
+from src.whist.gamelog import GameLogWriter
+from src.whist.masks import NUM_CARDS
+from src.whist.pipeline import EventRecorder, ReplayPipeline, decode_events, log_files
+from tests.whist.helpers import FirstCardPlayer
+
+
+def play(sink, seed=0, rounds=(4, 5)):
+    players = [FirstCardPlayer(f"Player {i + 1}") for i in range(3)]
+    game = Game(players, verbose=False, rng=random.Random(seed), sink=sink)
+    for round_number in rounds:
+        game.play_round(round_number)
+    return game
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_decode_events(self):
+        """Test every bid and card becomes a transition with a legal action and the round score as return"""
+        recorder = EventRecorder()
+        game = play(recorder)
+        observations, legal_masks, actions, returns = decode_events(recorder.events)
+        # Round 4 of a 3 player game has 2 cards each, round 5 has 3 cards each
+        self.assertEqual(observations.shape, (21, OBSERVATION_SIZE))
+        self.assertEqual(legal_masks.shape, (21, NUM_ACTIONS))
+        self.assertTrue(legal_masks[np.arange(21), actions].all())
+        self.assertTrue((actions[:3] >= NUM_CARDS).all())
+        self.assertTrue((actions[3:9] < NUM_CARDS).all())
+        # The first bidder of round 5 sees their 3 cards and no bids yet
+        first = observations[9]
+        self.assertEqual(first[:NUM_CARDS].sum(), 3)
+        self.assertEqual(first[2 * NUM_CARDS + 11], 3)
+        self.assertEqual(first[2 * NUM_CARDS + 12:2 * NUM_CARDS + 15].tolist(), [-1, -1, -1])
+        for player in game.players:
+            details = game.scoreboard.get_round_details(player, 5)
+            self.assertIn(details['score'], returns[9:])
+
+    def test_incomplete_round_dropped(self):
+        """Test transitions of a round without its end event are dropped"""
+        recorder = EventRecorder()
+        play(recorder)
+        self.assertEqual(len(decode_events(recorder.events[:-1])[2]), 9)
+
+    def test_pipeline(self):
+        """Test batches from a log directory have a fixed shape, with or without processes and shuffling"""
+        with tempfile.TemporaryDirectory() as directory:
+            recorders = []
+            for seed in range(3):
+                with GameLogWriter(os.path.join(directory, f"{seed}.log")) as writer:
+                    play(writer, seed)
+                recorders.append(EventRecorder())
+                play(recorders[-1], seed)
+            expected = [np.concatenate(arrays) for arrays in zip(*(decode_events(r.events) for r in recorders))]
+            self.assertEqual(len(log_files(directory)), 3)
+
+            batches = list(ReplayPipeline(directory, 8, processes=2, prefetch=1))
+            self.assertEqual(len(batches), 7)
+            for batch in batches:
+                self.assertEqual([array.shape[0] for array in batch], [8] * 4)
+            actions = np.concatenate([batch[2] for batch in batches])
+            self.assertEqual(actions.tolist(), expected[2][:56].tolist())
+
+            batches = list(ReplayPipeline([r.events for r in recorders], 10, processes=0, shuffle_buffer=16,
+                                          seed=1, drop_last=False))
+            self.assertEqual([len(batch[2]) for batch in batches], [10] * 6 + [3])
+            actions = np.concatenate([batch[2] for batch in batches])
+            self.assertNotEqual(actions.tolist(), expected[2].tolist())
+            self.assertEqual(sorted(actions.tolist()), sorted(expected[2].tolist()))
+
+    def test_early_exit(self):
+        """Test the consumer can stop iterating before the end"""
+        recorder = EventRecorder()
+        play(recorder)
+        for batch in ReplayPipeline([recorder.events] * 20, 4, processes=0, prefetch=1):
+            break
+        self.assertEqual(batch[0].shape, (4, OBSERVATION_SIZE))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import random
+import time
+import unittest
+
+from src.whist import Game
+from src.whist.profiling import GameProfiler, Timing, bucket, NUM_BUCKETS
+from tests.whist.helpers import FirstCardPlayer
+
+
+class SlowPlayer(FirstCardPlayer):
+
+    def make_bid(self, is_last, total_bid):
+        time.sleep(0.002)
+        return super().make_bid(is_last, total_bid)
+
+
+# A 3 player game has 21 rounds: 3 of 1 card, 2 to 7 cards, 3 of 8 cards, 7 to 2 cards and 3 of 1 card.
+NUM_ROUNDS = 21
+NUM_TRICKS = 6 + 2 * sum(range(2, 8)) + 24
+
+
+class TestProfiling(unittest.TestCase):
+
+    def new_game(self, profiler):
+        players = [FirstCardPlayer("Alice"), SlowPlayer("Bob"), FirstCardPlayer("Charlie")]
+        return Game(players, verbose=False, rng=random.Random(0), profiler=profiler)
+
+    def test_play_game(self):
+        """Test play_game plays every round and the profiler times every phase and decision"""
+        profiler = GameProfiler()
+        game = self.new_game(profiler)
+        scores = game.play_game()
+        self.assertEqual(scores, [game.scoreboard.get_score(player) for player in game.players])
+        self.assertIsNotNone(game.scoreboard.get_round_details(game.players[0], NUM_ROUNDS))
+
+        summary = profiler.summary()
+        counts = {phase: s['count'] for phase, s in summary['phases'].items()}
+        self.assertEqual(counts, {'deal': NUM_ROUNDS, 'bid': NUM_ROUNDS, 'trick': NUM_TRICKS, 'score': NUM_ROUNDS})
+        for pos in range(3):
+            self.assertEqual(summary['decisions'][pos]['count'], NUM_ROUNDS + NUM_TRICKS)
+        # Bob sleeps 2 ms on every bid
+        self.assertGreater(summary['decisions'][1]['total_ms'], 2 * NUM_ROUNDS)
+        self.assertGreater(summary['decisions'][1]['p99_us'], 1000)
+        self.assertLess(summary['decisions'][0]['total_ms'], summary['decisions'][1]['total_ms'])
+        self.assertGreater(summary['phases']['bid']['total_ms'], 2 * NUM_ROUNDS)
+        self.assertGreaterEqual(summary['engine_ms'], 0)
+
+        histograms = profiler.histograms()
+        self.assertEqual(len(histograms['bounds_us']), NUM_BUCKETS)
+        self.assertEqual(sum(histograms['trick']), NUM_TRICKS)
+        self.assertEqual(sum(histograms['player 1']), NUM_ROUNDS + NUM_TRICKS)
+        self.assertIn("player 1", profiler.report())
+
+    def test_async_and_merge(self):
+        """Test async games are profiled and profilers merge"""
+        profiler, other = GameProfiler(), GameProfiler()
+        self.new_game(profiler).play_game()
+        asyncio.run(self.new_game(other).play_game_async())
+        profiler.merge(other)
+        summary = profiler.summary()
+        self.assertEqual(summary['phases']['trick']['count'], 2 * NUM_TRICKS)
+        self.assertEqual(summary['decisions'][2]['count'], 2 * (NUM_ROUNDS + NUM_TRICKS))
+
+    def test_no_profiler(self):
+        """Test games without a profiler give the same results"""
+        self.assertEqual(self.new_game(None).play_game(), self.new_game(GameProfiler()).play_game())
+
+    def test_timing(self):
+        """Test the histogram buckets and percentiles"""
+        self.assertEqual(bucket(500), 0)
+        self.assertEqual(bucket(1000), 1)
+        self.assertEqual(bucket(3000), 2)
+        self.assertEqual(bucket(10 ** 12), NUM_BUCKETS - 1)
+        timing = Timing()
+        for duration in [1000] * 99 + [100000]:
+            timing.add(duration)
+        self.assertEqual(timing.percentile(50), 2)
+        self.assertEqual(timing.percentile(100), 100)
+        self.assertEqual(timing.summary()['max_us'], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
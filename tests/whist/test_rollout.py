@@ -0,0 +1,105 @@
+import random
+import unittest
+import numpy as np
+from src.whist.env import WhistEnv, OBSERVATION_SIZE, NUM_ACTIONS
+from src.whist.rollout import RolloutBuffer, RolloutPool, episode_length, play_episode, random_policy
+
+
+class TestRolloutBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = RolloutBuffer(10)
+
+    def tearDown(self):
+        self.buffer.close()
+
+    def write(self, start, count):
+        actions = np.arange(start, start + count, dtype=np.int16)
+        observations = np.repeat(actions[:, None], OBSERVATION_SIZE, axis=1).astype(np.float32)
+        masks = np.ones((count, NUM_ACTIONS), dtype=bool)
+        self.buffer.write(observations, masks, actions, actions.astype(np.float32))
+
+    def test_write(self):
+        """Test writing transitions to the buffer"""
+        self.write(0, 4)
+        self.assertEqual(len(self.buffer), 4)
+        self.assertEqual(self.buffer.actions[:4].tolist(), [0, 1, 2, 3])
+        self.assertTrue((self.buffer.observations[3] == 3).all())
+
+    def test_wrap_around(self):
+        """Test the oldest transitions are overwritten once the buffer is full"""
+        self.write(0, 8)
+        self.write(8, 5)
+        self.assertEqual(len(self.buffer), 10)
+        self.assertEqual(self.buffer.total_written, 13)
+        self.assertEqual(sorted(self.buffer.actions.tolist()), list(range(3, 13)))
+
+    def test_attach(self):
+        """Test a second buffer attached by name sees the same memory"""
+        self.write(0, 3)
+        other = RolloutBuffer(10, name=self.buffer.name, lock=self.buffer.lock)
+        self.assertEqual(len(other), 3)
+        self.assertEqual(other.actions[:3].tolist(), [0, 1, 2])
+        other.close()
+
+    def test_sample(self):
+        """Test sampling returns consistent transitions"""
+        self.write(0, 6)
+        observations, masks, actions, rewards = self.buffer.sample(20, rng=0)
+        self.assertEqual(observations.shape, (20, OBSERVATION_SIZE))
+        self.assertTrue((observations[:, 0] == actions).all())
+        self.assertTrue((rewards == actions).all())
+
+    def test_sample_empty(self):
+        """Test sampling from an empty buffer raises errors"""
+        with self.assertRaises(RuntimeError):
+            self.buffer.sample(1)
+
+
+class TestRollout(unittest.TestCase):
+
+    def test_play_episode(self):
+        """Test an episode yields one legal action and one reward per decision"""
+        env = WhistEnv(3, rounds=[1, 4])
+        observations, masks, actions, rewards = play_episode(env, random_policy, random.Random(0))
+        # 3 bids and 3 cards in the first round, 3 bids and 6 cards in the second.
+        self.assertEqual(len(actions), 15)
+        self.assertEqual(len(rewards), 15)
+        self.assertTrue(masks[np.arange(15), actions].all())
+        # Every player bids exactly once per round, so the bid transitions of the first round carry every score.
+        round_scores = [env.game.scoreboard.get_round_details(player, 1)['score'] for player in env.game.players]
+        self.assertEqual(sorted(rewards[:3].tolist()), sorted(round_scores))
+
+    def test_pool(self):
+        """Test the pool fills the shared buffer in the same order for a given seed"""
+        results = []
+        for i in range(2):
+            with RolloutPool(3, 1000, processes=2, seed=5, rounds=[1, 2, 3]) as pool:
+                written = pool.run(4)
+                # Three single-card rounds of 3 bids and 3 cards each.
+                self.assertEqual(written, 4 * 18)
+                self.assertEqual(len(pool.buffer), written)
+                results.append((pool.buffer.observations[:written].copy(), pool.buffer.actions[:written].copy(),
+                                pool.buffer.rewards[:written].copy()))
+        for first, second in zip(*results):
+            np.testing.assert_array_equal(first, second)
+
+    def test_pool_wrap_around(self):
+        """Test a run overflowing the shared buffer keeps its last transitions, in order"""
+        with RolloutPool(3, 1000, processes=2, seed=5, rounds=[1, 2, 3]) as pool:
+            pool.run(4)
+            expected = pool.buffer.actions[:4 * 18].copy()
+        with RolloutPool(3, 50, processes=2, seed=5, rounds=[1, 2, 3]) as pool:
+            self.assertEqual(pool.run(4), 4 * 18)
+            self.assertEqual(pool.buffer.total_written, 4 * 18)
+            slots = np.arange(4 * 18 - 50, 4 * 18) % 50
+            np.testing.assert_array_equal(pool.buffer.actions[slots], expected[-50:])
+
+    def test_episode_length(self):
+        """Test the episode length counts every bid and card"""
+        self.assertEqual(episode_length(3, [1, 2, 3]), 18)
+        env = WhistEnv(4, rng=random.Random(3))
+        self.assertEqual(episode_length(4), len(play_episode(env, random_policy, random.Random(4))[2]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from src.whist.schedule import RoundSchedule, round_schedule
+
+
+class TestSchedule(unittest.TestCase):
+
+    def test_four_players(self):
+        """Test the hand sizes, trump flags and round count of a 4 player game"""
+        schedule = round_schedule(4)
+        self.assertEqual(schedule.num_rounds, 24)
+        self.assertEqual(schedule.hand_sizes[1:],
+                         (1, 1, 1, 1, 2, 3, 4, 5, 6, 7, 8, 8, 8, 8, 7, 6, 5, 4, 3, 2, 1, 1, 1, 1))
+        self.assertEqual([r for r in schedule.rounds() if not schedule.has_trump[r]], [11, 12, 13, 14])
+        self.assertEqual(schedule.hand_size(6), 3)
+
+    def test_tricks_remaining(self):
+        """Test the prefix sums count the tricks and cards left in the game"""
+        for num_players in range(3, 7):
+            schedule = round_schedule(num_players)
+            sizes = schedule.hand_sizes
+            self.assertEqual(schedule.total_tricks, sum(sizes))
+            for round_number in schedule.rounds():
+                self.assertEqual(schedule.tricks_remaining(round_number), sum(sizes[round_number:]))
+            last = schedule.num_rounds
+            self.assertEqual(schedule.tricks_remaining(last, 1), 0)
+            self.assertEqual(schedule.cards_remaining(1, 1), num_players * (schedule.total_tricks - 1))
+
+    def test_shared(self):
+        """Test the schedule of a player count is built once and invalid rounds are rejected"""
+        self.assertIs(round_schedule(5), round_schedule(5))
+        self.assertIsInstance(round_schedule(5), RoundSchedule)
+        for round_number in (0, -1, 28):
+            with self.assertRaises(ValueError):
+                round_schedule(5).hand_size(round_number)
+
+
+if __name__ == '__main__':
+    unittest.main()
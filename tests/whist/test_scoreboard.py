@@ -1,5 +1,6 @@
+import random
 import unittest
-from src.whist import Scoreboard, Player
+from src.whist import Scoreboard, ColumnarScoreboard, Game, Player
 
 
 class TestScoreBoard(unittest.TestCase):
@@ -54,5 +55,72 @@ class TestScoreBoard(unittest.TestCase):
         self.assertIsNone(details)
 
 
+class TestColumnarScoreboard(unittest.TestCase):
+
+    def setUp(self):
+        self.scoreboard = ColumnarScoreboard(2, capacity=1)
+        self.player1 = Player("Alice")
+        self.player2 = Player("Bob")
+        self.scoreboard.add_player(self.player1)
+        self.scoreboard.add_player(self.player2)
+
+    def test_update_score(self):
+        """Test the round details and totals match the dict based scoreboard"""
+        self.scoreboard.update_score(self.player1, 1, 2, 1, -1)
+        self.scoreboard.update_score(self.player1, 2, 2, 2, 7)
+        self.assertEqual(self.scoreboard.get_score(self.player1), 6)
+        self.assertEqual(self.scoreboard.get_score(self.player2), 0)
+        self.assertEqual(self.scoreboard.get_round_details(self.player1, 2),
+                         {'bid': 2, 'won_tricks': 2, 'score': 7, 'cumulative_score': 6})
+        self.assertIsNone(self.scoreboard.get_round_details(self.player1, 3))
+        self.assertIsNone(self.scoreboard.get_score(Player("Charlie")))
+
+    def test_add_seated_player(self):
+        """Test adding a seated player again keeps their seat and score"""
+        self.scoreboard.update_score(self.player1, 1, 2, 1, 6)
+        self.scoreboard.add_player(self.player1)
+        self.assertEqual(self.scoreboard.get_score(self.player1), 6)
+        self.assertEqual(self.scoreboard.num_games, 1)
+
+    def test_too_many_players(self):
+        """Test a game can't seat more players than the scoreboard has seats"""
+        with self.assertRaises(ValueError):
+            self.scoreboard.add_player(Player("Charlie"))
+
+    def test_new_games(self):
+        """Test adding players to a full game starts a new one and grows the arrays"""
+        self.scoreboard.update_score(self.player1, 1, 0, 0, 5)
+        for _ in range(3):
+            player1, player2 = Player("Alice"), Player("Bob")
+            self.scoreboard.add_player(player1)
+            self.scoreboard.add_player(player2)
+            self.scoreboard.update_score(player2, 1, 0, 0, 5)
+        self.assertEqual(self.scoreboard.num_games, 4)
+        self.assertEqual(self.scoreboard.get_score(player1), 0)
+        self.assertEqual(self.scoreboard.totals[:4].tolist(), [[5, 0], [0, 5], [0, 5], [0, 5]])
+        seats, mean_scores, win_rates = self.scoreboard.leaderboard()
+        self.assertEqual(seats.tolist(), [1, 0])
+        self.assertEqual(mean_scores.tolist(), [3.75, 1.25])
+        self.assertEqual(win_rates.tolist(), [0.75, 0.25])
+        # The players of a finished game are forgotten once the next one starts.
+        self.scoreboard.add_player(Player("Charlie"))
+        self.assertIsNone(self.scoreboard.get_score(player1))
+        self.assertEqual(self.scoreboard.num_games, 5)
+
+    def test_game_compatibility(self):
+        """Test a game records the same scores on both scoreboards"""
+        scoreboard = ColumnarScoreboard(3)
+        boards = []
+        for board in (None, scoreboard):
+            players = [Player(f"Player {i + 1}") for i in range(3)]
+            game = Game(players, verbose=False, rng=random.Random(0), scoreboard=board)
+            game.start_round(1)
+            game.current_bids = [1, 0, 1]
+            game.current_won_tricks = [1, 0, 0]
+            game.score_round(1)
+            boards.append([game.scoreboard.get_round_details(player, 1) for player in players])
+        self.assertEqual(boards[0], boards[1])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import unittest
+
+from src.whist.server import TableServer, legal_bids
+from tests.whist.helpers import FirstCardPlayer
+
+
+async def play_client(server, answer=None, illegal_first=False):
+    """Plays a table with the first legal move, returning the received messages"""
+    reader, writer, task = server.connect_local()
+    writer.write(json.dumps({'name': "Human"}).encode() + b'\n')
+    messages = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        message = json.loads(line)
+        messages.append(message)
+        if message['type'] in ('bid_request', 'play_request'):
+            if answer is not None:
+                await answer(message, writer)
+                continue
+            key = 'bid' if message['type'] == 'bid_request' else 'card'
+            if illegal_first:
+                writer.write(json.dumps({'seq': message['seq'], key: -1}).encode() + b'\n')
+                illegal_first = False
+            writer.write(json.dumps({'seq': message['seq'], key: message['legal'][0]}).encode() + b'\n')
+    await task
+    return messages
+
+
+def bot_factory(pos):
+    return FirstCardPlayer(f"Bot {pos}")
+
+
+class TestServer(unittest.TestCase):
+
+    def test_full_game(self):
+        """Test a human plays a full 3 player game against bots through a local connection"""
+        server = TableServer(bot_factory, num_players=3)
+        messages = asyncio.run(play_client(server))
+        types = [message['type'] for message in messages]
+        self.assertEqual(types.count('round_end'), 21)
+        self.assertEqual(types[-1], 'game_over')
+        self.assertEqual(types.count('bid_request'), 21)
+        # 1 card rounds: 6, then 2..7 and 7..2, then 3 rounds of 8 cards
+        self.assertEqual(types.count('play_request'), 6 + 2 * sum(range(2, 8)) + 24)
+        self.assertEqual(server.finished_tables, 1)
+        self.assertEqual(server.active_tables, 0)
+
+    def test_many_tables(self):
+        """Test many tables are played concurrently in one event loop"""
+        server = TableServer(bot_factory, num_players=4, rounds=[5, 6])
+
+        async def play():
+            return await asyncio.gather(*(play_client(server) for _ in range(200)))
+
+        results = asyncio.run(play())
+        self.assertEqual(server.finished_tables, 200)
+        self.assertTrue(all(messages[-1]['type'] == 'game_over' for messages in results))
+
+    def test_illegal_answer(self):
+        """Test an illegal answer gets an error and the request is answered again"""
+        server = TableServer(bot_factory, num_players=3, rounds=[1])
+        messages = asyncio.run(play_client(server, illegal_first=True))
+        types = [message['type'] for message in messages]
+        self.assertEqual(types.count('error'), 1)
+        self.assertEqual(types[-1], 'game_over')
+
+    def test_boolean_answer(self):
+        """Test JSON booleans are not taken for the integer bids they compare equal to"""
+        server = TableServer(bot_factory, num_players=3, rounds=[1])
+
+        async def answer(message, writer):
+            key = 'bid' if message['type'] == 'bid_request' else 'card'
+            if key == 'bid':
+                writer.write(json.dumps({'seq': message['seq'], key: True}).encode() + b'\n')
+            writer.write(json.dumps({'seq': message['seq'], key: message['legal'][0]}).encode() + b'\n')
+
+        messages = asyncio.run(play_client(server, answer=answer))
+        types = [message['type'] for message in messages]
+        self.assertEqual(types.count('error'), 1)
+        self.assertEqual(types[-1], 'game_over')
+
+    def test_disconnect(self):
+        """Test the table is aborted once the client disconnects, instead of being played out by the bots"""
+        decisions = []
+
+        class CountingPlayer(FirstCardPlayer):
+            def make_bid(self, is_last, total_bid):
+                decisions.append(self.name)
+                return super().make_bid(is_last, total_bid)
+
+        server = TableServer(lambda pos: CountingPlayer(f"Bot {pos}"), num_players=3, rounds=[1, 2, 3])
+
+        async def play():
+            reader, writer, task = server.connect_local()
+            writer.write(json.dumps({'name': "Human"}).encode() + b'\n')
+            while json.loads(await reader.readline())['type'] != 'bid_request':
+                pass
+            writer.close()
+            await task
+
+        asyncio.run(play())
+        self.assertEqual(server.aborted_tables, 1)
+        self.assertEqual(server.finished_tables, 0)
+        self.assertEqual(server.active_tables, 0)
+        self.assertLessEqual(len(decisions), 2)
+
+    def test_timeout(self):
+        """Test a silent human plays the first legal move when the timeout expires"""
+        server = TableServer(bot_factory, num_players=3, rounds=[1], move_timeout=0.01)
+
+        async def silent(message, writer):
+            pass
+
+        messages = asyncio.run(play_client(server, answer=silent))
+        types = [message['type'] for message in messages]
+        self.assertEqual(types.count('timeout'), 2)
+        self.assertEqual(types[-1], 'game_over')
+
+    def test_stale_answer(self):
+        """Test an answer carrying the sequence number of an earlier request is discarded"""
+        server = TableServer(bot_factory, num_players=3, rounds=[2])
+
+        async def answer(message, writer):
+            key = 'bid' if message['type'] == 'bid_request' else 'card'
+            # The illegal late answer would get an error if it was not discarded
+            writer.write(json.dumps({'seq': message['seq'] - 1, key: -1}).encode() + b'\n')
+            writer.write(json.dumps({'seq': message['seq'], key: message['legal'][0]}).encode() + b'\n')
+
+        messages = asyncio.run(play_client(server, answer=answer))
+        types = [message['type'] for message in messages]
+        self.assertEqual(types.count('error'), 0)
+        self.assertEqual(types[-1], 'game_over')
+
+    def test_server_full(self):
+        """Test connections beyond the maximum number of tables are refused"""
+        server = TableServer(bot_factory, num_players=3, rounds=[1], max_tables=0)
+        messages = asyncio.run(play_client(server))
+        self.assertEqual(messages, [{'type': 'error', 'message': "Server full"}])
+
+    def test_tcp(self):
+        """Test a table is played over a TCP connection"""
+        server = TableServer(bot_factory, num_players=3, rounds=[4])
+
+        async def play():
+            listener = await server.start()
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'{"name": "Human"}\n')
+            last = None
+            while line := await reader.readline():
+                last = json.loads(line)
+                if last['type'] in ('bid_request', 'play_request'):
+                    key = 'bid' if last['type'] == 'bid_request' else 'card'
+                    writer.write(json.dumps({'seq': last['seq'], key: last['legal'][0]}).encode() + b'\n')
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return last
+
+        self.assertEqual(asyncio.run(play())['type'], 'game_over')
+
+    def test_legal_bids(self):
+        """Test the last bidder cannot make the bids add up to the hand size"""
+        self.assertEqual(legal_bids(3, False, 2), [0, 1, 2, 3])
+        self.assertEqual(legal_bids(3, True, 2), [0, 2, 3])
+        self.assertEqual(legal_bids(3, True, 4), [0, 1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
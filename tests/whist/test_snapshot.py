@@ -0,0 +1,112 @@
+import random
+import unittest
+
+from src.whist import Game, ColumnarScoreboard
+from src.whist.gamelog import EventSink
+from src.whist.snapshot import snapshot, restore, VERSION
+from tests.whist.helpers import FirstCardPlayer
+
+
+class MoveSink(EventSink):
+
+    def __init__(self):
+        self.moves = []
+
+    def on_move(self, player_pos, card):
+        self.moves.append((player_pos, card.index))
+
+
+def new_players():
+    return [FirstCardPlayer(f"Player {i + 1}") for i in range(4)]
+
+
+def finish_round(game, hand_size, round_number):
+    for _ in range(hand_size - len(game.tricks)):
+        winner = game.play_trick(game.deck.trump)
+        game.current_won_tricks[winner] += 1
+    game.score_round(round_number)
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(new_players(), verbose=False, rng=random.Random(3), sink=MoveSink())
+        for round_number in range(1, 6):
+            self.game.play_round(round_number)
+        self.hand_size = self.game.start_round(6)
+        self.game.make_bids(self.hand_size)
+        winner = self.game.play_trick(self.game.deck.trump)
+        self.game.current_won_tricks[winner] += 1
+
+    def test_round_trip(self):
+        """Test a restored game has the same state and plays out the same way"""
+        data = snapshot(self.game)
+        self.assertLess(len(data), 300)
+        restored = restore(data, new_players(), sink=MoveSink())
+        self.assertEqual(snapshot(restored), data)
+
+        game = self.game
+        self.assertEqual(restored.lead_player_pos, game.lead_player_pos)
+        self.assertEqual(restored.deck.cards, game.deck.cards)
+        self.assertEqual(restored.deck.trump_card, game.deck.trump_card)
+        self.assertEqual(restored.discard_deck, game.discard_deck)
+        self.assertEqual([p.cards for p in restored.players], [p.cards for p in game.players])
+        self.assertEqual(restored.current_bids, game.current_bids)
+        self.assertEqual(restored.current_won_tricks, game.current_won_tricks)
+        for slot in ('trump', 'trump_card', 'seen', 'voids', 'remaining', 'bids', 'won', 'leader', 'trick'):
+            self.assertEqual(getattr(restored.info, slot), getattr(game.info, slot))
+        for player, other in zip(restored.players, game.players):
+            self.assertEqual(restored.scoreboard.get_score(player), game.scoreboard.get_score(other))
+            self.assertEqual(restored.scoreboard.get_round_details(player, 5),
+                             game.scoreboard.get_round_details(other, 5))
+
+        finish_round(game, self.hand_size, 6)
+        finish_round(restored, self.hand_size, 6)
+        self.assertEqual(restored.sink.moves, game.sink.moves[-len(restored.sink.moves):])
+        self.assertEqual([restored.scoreboard.get_score(p) for p in restored.players],
+                         [game.scoreboard.get_score(p) for p in game.players])
+
+    def test_mid_trick(self):
+        """Test the current trick and the voids it reveals are restored"""
+        game = self.game
+        player_pos = game.lead_player_pos
+        game.player_moves.clear()
+        game.record_move(player_pos, game.players[player_pos].play_card(True, None, game.deck.trump))
+        restored = restore(snapshot(game), new_players(), scoreboard=ColumnarScoreboard(4))
+        self.assertEqual(restored.player_moves, game.player_moves)
+        self.assertEqual(restored.info.trick, game.info.trick)
+        self.assertEqual(restored.info.voids, game.info.voids)
+        self.assertEqual(restored.scoreboard.get_score(restored.players[0]),
+                         game.scoreboard.get_score(game.players[0]))
+
+    def test_resume(self):
+        """Test a game restored in the middle of a trick plays the rest of the game like the original"""
+        game = self.game
+        player_pos = game.lead_player_pos
+        game.player_moves.clear()
+        game.record_move(player_pos, game.players[player_pos].play_card(True, None, game.deck.trump))
+        restored = restore(snapshot(game), new_players(), rng=random.Random(), sink=MoveSink())
+        self.assertEqual(restored.round_number, 6)
+        # The random generator is not part of the snapshot: the later rounds are dealt alike from the same state.
+        restored.rng.setstate(game.rng.getstate())
+
+        scores = game.play_game(resume=True)
+        self.assertEqual(restored.play_game(resume=True), scores)
+        self.assertEqual(restored.sink.moves, game.sink.moves[-len(restored.sink.moves):])
+        self.assertEqual(restored.round_number, game.schedule.num_rounds)
+
+    def test_invalid(self):
+        """Test invalid snapshots are rejected"""
+        data = snapshot(self.game)
+        with self.assertRaises(ValueError):
+            restore(b'PICKLE' + data[6:], new_players())
+        with self.assertRaises(ValueError):
+            restore(data[:4] + bytes([VERSION + 1]) + data[5:], new_players())
+        with self.assertRaises(ValueError):
+            restore(data[:-1], new_players())
+        with self.assertRaises(ValueError):
+            restore(data, new_players()[:3])
+
+
+if __name__ == '__main__':
+    unittest.main()
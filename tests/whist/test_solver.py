@@ -0,0 +1,114 @@
+import random
+import time
+import unittest
+from src.whist import Card
+from src.whist.masks import card_index, hand_mask, iter_indices, legal_mask, trick_winner, CARD_BITS, CARD_SUITS
+from src.whist.solver import DoubleDummySolver
+
+
+def brute_force(hands, trump, leader, target):
+    """Plain minimax without any pruning, used as a reference"""
+    hands = list(hands)
+    n = len(hands)
+
+    def search(step, leader, trick):
+        if step == n:
+            winner = trick_winner(trick, trump)
+            won = 1 if winner == target else 0
+            if hands[winner] == 0:
+                return won
+            return won + search(0, winner, [])
+        seat = (leader + step) % n
+        lead_suit = CARD_SUITS[trick[0][1]] if trick else None
+        values = []
+        for card in iter_indices(legal_mask(hands[seat], lead_suit, trump)):
+            hands[seat] ^= CARD_BITS[card]
+            values.append(search(step + 1, leader, trick + [(seat, card)]))
+            hands[seat] ^= CARD_BITS[card]
+        return max(values) if seat == target else min(values)
+
+    return search(0, leader, [])
+
+
+def random_deal(num_players, hand_size, rng):
+    deck = [card_index(v, s) for v in range(3 + (6 - num_players) * 2, 16) if v != 11 for s in range(4)]
+    rng.shuffle(deck)
+    return [sum(CARD_BITS[c] for c in deck[i * hand_size:(i + 1) * hand_size]) for i in range(num_players)]
+
+
+class TestDoubleDummySolver(unittest.TestCase):
+
+    def test_single_card(self):
+        """Test the highest card of the lead suit takes the only trick"""
+        hands = [[Card(9, 0)], [Card(15, 0)], [Card(15, 1)]]
+        self.assertEqual(DoubleDummySolver(hands, None, 0).solve(), [0, 1, 0])
+
+    def test_trump_wins(self):
+        """Test a player void in the lead suit ruffs the trick"""
+        hands = [[Card(15, 0)], [Card(3, 1)], [Card(14, 0)]]
+        self.assertEqual(DoubleDummySolver(hands, 1, 0).solve(), [0, 1, 0])
+
+    def test_matches_brute_force(self):
+        """Test the solver against a plain minimax on random small deals"""
+        rng = random.Random(1)
+        for _ in range(40):
+            num_players = rng.randint(3, 4)
+            hand_size = rng.randint(1, 4)
+            hands = random_deal(num_players, hand_size, rng)
+            trump = rng.choice([None, 0, 1, 2, 3])
+            leader = rng.randrange(num_players)
+            expected = [brute_force(hands, trump, leader, p) for p in range(num_players)]
+            self.assertEqual(DoubleDummySolver(hands, trump, leader).solve(), expected)
+
+    def test_stopped_suit(self):
+        """Test a player whose every card is below the cards of another player in the same suit takes nothing"""
+        hands = [[Card(9, 0), Card(10, 0), Card(3, 2)], [Card(15, 0), Card(14, 0), Card(4, 2)],
+                 [Card(3, 1), Card(4, 1), Card(5, 1)]]
+        masks = [hand_mask(hand) for hand in hands]
+        expected = [brute_force(masks, None, 0, p) for p in range(3)]
+        self.assertEqual(DoubleDummySolver(hands, None, 0).solve(), expected)
+        self.assertEqual(expected[0], 0)
+
+    def test_mid_trick(self):
+        """Test solving a position where the current trick is already started"""
+        # Player 0 led the 9 of Hearts; player 1 can win with the Ace
+        hands = [[Card(3, 1)], [Card(15, 0), Card(4, 1)], [Card(12, 0), Card(13, 1)]]
+        trick = [(0, card_index(9, 0))]
+        solver = DoubleDummySolver(hands, None, 0, trick)
+        self.assertEqual(solver.max_tricks(1), 1)
+
+    def test_evaluate_moves(self):
+        """Test every legal card of the player to move is evaluated"""
+        hands = [[Card(3, 1)], [Card(15, 0), Card(4, 1)], [Card(12, 0), Card(13, 1)]]
+        trick = [(0, card_index(9, 0))]
+        values = DoubleDummySolver(hands, None, 0, trick).evaluate_moves()
+        # Player 1 must follow Hearts with the Ace and wins the trick; the last trick goes to the King of Spades
+        self.assertEqual(values, {card_index(15, 0): 1})
+
+    def test_time_limit(self):
+        """Test the solver stops at the time limit and returns lower bounds of the tricks"""
+        hands = random_deal(6, 8, random.Random(0))
+        solver = DoubleDummySolver(hands, None, 0)
+        expected = solver.solve()
+        self.assertTrue(solver.exact)
+        solver = DoubleDummySolver(hands, None, 0, time_limit=0.01)
+        start = time.perf_counter()
+        values = solver.solve()
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertFalse(solver.exact)
+        self.assertTrue(all(value <= exact for value, exact in zip(values, expected)))
+        self.assertNotEqual(values, expected)
+        solver = DoubleDummySolver(hands, None, 0, time_limit=10)
+        self.assertEqual(solver.solve(), expected)
+        self.assertTrue(solver.exact)
+
+    def test_invalid_positions(self):
+        """Test inconsistent hand sizes and complete tricks are rejected"""
+        with self.assertRaises(ValueError):
+            DoubleDummySolver([[Card(3, 0)], [], [Card(4, 0)]], None, 0)
+        with self.assertRaises(ValueError):
+            DoubleDummySolver([[], [], []], None, 0, [(0, 0), (1, 1), (2, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
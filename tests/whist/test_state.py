@@ -0,0 +1,102 @@
+import random
+import unittest
+from src.whist import Game, Player
+from src.whist.card import CARDS
+from src.whist.env import BID, PLAY
+from src.whist.infostate import InformationState
+from src.whist.masks import hand_mask, card_index
+from src.whist.state import GameState
+
+
+class TestGameState(unittest.TestCase):
+
+    def setUp(self):
+        self.state = GameState(4)
+        self.state.deal_cards(7, random.Random(0))
+
+    def snapshot(self, state):
+        return (state.hands[:], state.bids[:], state.won[:], state.trick[:], state.leader, state.step, state.phase,
+                state.total_bid)
+
+    def play_random(self, state, rng):
+        while not state.is_over:
+            state.apply(rng.choice(state.legal_moves()))
+
+    def test_deal_matches_game(self):
+        """Test dealing with the same random generator state gives the same hands and trump as the game"""
+        players = [Player(f"Player {i + 1}") for i in range(4)]
+        rng = random.Random(0)
+        game = Game(players, verbose=False, rng=rng)
+        state_rng = random.Random()
+        state_rng.setstate(rng.getstate())
+        game.start_round(7)
+        self.state.deal_cards(7, state_rng)
+        self.assertEqual(self.state.hands, [hand_mask(player.cards) for player in players])
+        trump_card = game.deck.trump_card
+        self.assertEqual(self.state.trump_card, card_index(trump_card.value, trump_card.suit))
+        self.assertEqual(self.state.hand_size, 4)
+
+    def test_bidding(self):
+        """Test the bidding phase and the last bidder rule"""
+        for bid in (1, 0, 2):
+            self.state.apply(bid)
+        self.assertNotIn(1, self.state.legal_moves())
+        self.state.apply(0)
+        self.assertEqual(self.state.phase, PLAY)
+        self.assertEqual(self.state.bids, [1, 0, 2, 0])
+
+    def test_undo_round(self):
+        """Test undoing every move of a round restores the dealt state"""
+        initial = self.snapshot(self.state)
+        self.play_random(self.state, random.Random(1))
+        self.assertEqual(sum(self.state.won), 4)
+        self.assertEqual(self.state.hands, [0, 0, 0, 0])
+        while self.state.history:
+            self.state.undo()
+        self.assertEqual(self.snapshot(self.state), initial)
+        self.assertEqual(self.state.phase, BID)
+
+    def test_undo_trick(self):
+        """Test undoing the card that completed a trick restores the trick and the leader"""
+        for bid in (1, 0, 2, 0):
+            self.state.apply(bid)
+        for i in range(3):
+            self.state.apply(self.state.legal_moves()[0])
+        before = self.snapshot(self.state)
+        winner = self.state.apply(self.state.legal_moves()[0])
+        self.assertEqual(self.state.leader, winner)
+        self.state.undo()
+        self.assertEqual(self.snapshot(self.state), before)
+
+    def test_clone(self):
+        """Test a clone is independent of the original"""
+        clone = self.state.clone()
+        before = self.snapshot(self.state)
+        self.play_random(clone, random.Random(2))
+        self.assertEqual(self.snapshot(self.state), before)
+        self.assertEqual(len(clone.round_scores()), 4)
+        self.assertEqual(clone.legal_moves(), [])
+
+    def test_from_info(self):
+        """Test a state rebuilt from the public information and the hands matches the state it was observed from"""
+        rng = random.Random(3)
+        info = InformationState(4)
+        info.start_round(self.state.leader)
+        info.set_trump(CARDS[self.state.trump_card])
+        for _ in range(4 + 6):
+            pos = self.state.current_player
+            move = rng.choice(self.state.legal_moves())
+            winner = self.state.apply(move)
+            if self.state.history[-1][0] == BID:
+                info.set_bid(pos, move)
+            else:
+                info.play_card(pos, CARDS[move])
+                if winner is not None:
+                    info.finish_trick(winner)
+        state = GameState.from_info(info, self.state.hands, self.state.hand_size)
+        self.assertEqual(self.snapshot(state), self.snapshot(self.state))
+        self.assertEqual(state.legal_moves(), self.state.legal_moves())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import random
+import unittest
+
+from src.whist.masks import hand_mask, iter_indices, legal_mask
+from src.whist.tournament import Ratings, Tournament, play_match, round_robin, swiss_round, SWISS
+from tests.whist.helpers import FirstCardPlayer
+
+
+class LowestCardPlayer(FirstCardPlayer):
+    """Bids 0 and plays its lowest legal card to dodge every trick"""
+
+    def play_card(self, is_first, lead_suit, trump):
+        legal = list(iter_indices(legal_mask(hand_mask(self.cards), lead_suit, trump)))
+        card = min((c for c in self.cards if c.index in legal), key=lambda c: c.value)
+        self.cards.remove(card)
+        return card
+
+
+class HighestCardPlayer(FirstCardPlayer):
+    """Bids 0 but plays its highest legal card"""
+
+    def play_card(self, is_first, lead_suit, trump):
+        legal = list(iter_indices(legal_mask(hand_mask(self.cards), lead_suit, trump)))
+        card = max((c for c in self.cards if c.index in legal), key=lambda c: c.value)
+        self.cards.remove(card)
+        return card
+
+
+class OverbidPlayer(LowestCardPlayer):
+    """Bids as many tricks as it can, then dodges them"""
+
+    def make_bid(self, is_last, total_bid):
+        return len(self.cards) - 1 if is_last and total_bid == 0 else len(self.cards)
+
+
+ENTRANTS = {'lowest': LowestCardPlayer, 'highest': HighestCardPlayer, 'overbid': OverbidPlayer}
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_duplicate_match(self):
+        """Test every entrant is dealt every hand of every round once, even when the bots play differently"""
+        hands = {}
+
+        def recording(cls):
+            class RecordingPlayer(cls):
+                def make_bid(self, is_last, total_bid):
+                    rounds = hands.setdefault(self.name, {})
+                    rounds.setdefault(self.game.round_number, []).append(hand_mask(self.cards))
+                    return super().make_bid(is_last, total_bid)
+            return RecordingPlayer
+
+        entrants = {name: recording(factory) for name, factory in ENTRANTS.items()}
+        names, scores = play_match(tuple(ENTRANTS), 7, entrants)
+        self.assertEqual(names, tuple(ENTRANTS))
+        self.assertEqual(set(hands), set(ENTRANTS))
+        dealt = hands['lowest']
+        self.assertEqual(len(dealt), 21)
+        for rounds in hands.values():
+            self.assertEqual(rounds.keys(), dealt.keys())
+            for round_number, round_hands in rounds.items():
+                self.assertEqual(len(round_hands), 3)
+                self.assertEqual(sorted(round_hands), sorted(dealt[round_number]))
+        # The three hands of a round are those of one deal.
+        for round_hands in dealt.values():
+            self.assertEqual(round_hands[0] & round_hands[1] | round_hands[0] & round_hands[2]
+                             | round_hands[1] & round_hands[2], 0)
+        self.assertEqual(play_match(tuple(ENTRANTS), 7, entrants)[1], scores)
+
+    def test_ratings(self):
+        """Test the ratings order the entrants by their results and narrow with more results"""
+        ratings = Ratings(["a", "b", "c"])
+        for _ in range(5):
+            ratings.add_match(("a", "b", "c"), [10, 5, 0])
+        ratings.fit()
+        self.assertGreater(ratings.rating[0], ratings.rating[1])
+        self.assertGreater(ratings.rating[1], ratings.rating[2])
+        wide = ratings.interval()
+        for _ in range(50):
+            ratings.add_match(("a", "b", "c"), [10, 5, 0])
+        ratings.fit()
+        self.assertTrue((ratings.interval() < wide).all())
+        self.assertTrue(ratings.settled())
+
+        even = Ratings(["a", "b"])
+        for _ in range(20):
+            even.add_match(("a", "b"), [1, 0])
+            even.add_match(("a", "b"), [0, 1])
+        even.fit()
+        self.assertAlmostEqual(even.rating[0], 0)
+        self.assertFalse(even.settled())
+
+    def test_interval_coverage(self):
+        """Test the intervals cover the ratings of equally strong entrants despite the correlated results of a match"""
+        rng = random.Random(0)
+        names = list("abcdef")
+        covered = 0
+        for _ in range(50):
+            ratings = Ratings(names)
+            for _ in range(60):
+                match = tuple(rng.sample(names, 4))
+                ratings.add_match(match, [rng.random() for _ in match])
+            ratings.fit()
+            covered += sum(abs(rating) <= width for rating, width in zip(ratings.rating, ratings.interval(0.9)))
+        self.assertGreaterEqual(covered / (50 * len(names)), 0.9)
+
+    def test_schedules(self):
+        """Test round robin covers every group and Swiss groups entrants of similar rating"""
+        rng = random.Random(0)
+        matches = round_robin(list("abcde"), (3, 4), rng)
+        first = {frozenset(next(matches)) for _ in range(15)}
+        self.assertEqual(len(first), 15)
+
+        ratings = Ratings(list("abcdefg"))
+        ratings.rating[:] = [0, 10, 20, 30, 40, 50, 60]
+        ratings.games[0, 1] = ratings.games[1, 0] = 1
+        groups = swiss_round(ratings, 3, rng)
+        # 'a' or 'b' played the most and sits out
+        self.assertEqual(sorted(groups[0]), ["e", "f", "g"])
+        self.assertEqual(sorted(groups[1])[1:], ["c", "d"])
+        self.assertEqual(len(groups), 2)
+
+    def test_early_stop(self):
+        """Test the tournament stops once the ranking is settled"""
+        tournament = Tournament(ENTRANTS, seat_counts=3, processes=0, seed=1, max_matches=200)
+        standings = tournament.run()
+        self.assertLess(tournament.matches, 200)
+        self.assertEqual(standings[0]['name'], 'lowest')
+        self.assertTrue(tournament.ratings.settled())
+
+    def test_parallel_swiss(self):
+        """Test Swiss rounds on a process pool stream every result back"""
+        seen = []
+        tournament = Tournament(ENTRANTS, seat_counts=(3,), pairing=SWISS, processes=2, seed=2, min_matches=100,
+                                max_matches=4)
+        standings = tournament.run(callback=lambda t, names, scores: seen.append(names))
+        self.assertEqual(tournament.matches, 4)
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(sum(entry['comparisons'] for entry in standings), 4 * 3 * 2)
+
+    def test_invalid(self):
+        """Test invalid seat counts and pairings are rejected"""
+        with self.assertRaises(ValueError):
+            Tournament(ENTRANTS, seat_counts=4)
+        with self.assertRaises(ValueError):
+            Tournament(ENTRANTS, seat_counts=3, pairing="knockout")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from src.whist import Player, Card
+from src.whist.masks import hand_mask
 from src.whist.utils import has_suit, determine_trick_winner, determine_hand_size, calculate_score
 
 
@@ -17,6 +18,11 @@ class TestUtils(unittest.TestCase):
         player.cards = [Card(7, 0), Card(8, 1), Card(9, 2)]
         self.assertFalse(has_suit(player, 3))
 
+    def test_determine_trick_winner_with_played_mask(self):
+        """Test determine_trick_winner gives the same winner from a mask of the played cards."""
+        player_moves = [(0, Card(7, 1)), (1, Card(10, 2)), (2, Card(12, 2))]
+        self.assertEqual(determine_trick_winner(player_moves, 2, hand_mask(card for _, card in player_moves)), 2)
+
     def test_determine_trick_winner_with_highest_lead_suit(self):
         """Test that the player with the highest card of the lead suit wins when no trumps are played."""
         player_moves = [(0, Card(7, 1)), (1, Card(8, 1)), (2, Card(9, 1))]